@@ -0,0 +1,267 @@
+import os
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple, Set
+from src.krx_client import KrxStockClient, KRX_RATE_LIMIT_FILE
+from src.cache import KrxNegativeCache
+from src.store import KrxMarketStore
+from src.utils import get_latest_open_date, LOGGER
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description="Historical Backfill for KRX-Stock MCP Server")
+
+    parser.add_argument(
+        "--start",
+        type=str,
+        required=True,
+        help="백필을 시작할 날짜 (YYYYMMDD)"
+    )
+    parser.add_argument(
+        "--end",
+        type=str,
+        default=None,
+        help="백필을 끝낼 날짜 (YYYYMMDD). 주어지지 않을 경우 최근 개장일"
+    )
+    parser.add_argument(
+        "--markets",
+        nargs="+",
+        choices=["stk", "ksq", "knx"],
+        default=["stk", "ksq", "knx"],
+        help="백필할 주식 시장 (stk/ksq/knx)"
+    )
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        choices=["info", "price"],
+        default=["info", "price"],
+        help="백필할 데이터 종류 (info: 종목 기본 정보, price: 주가 정보)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="동시에 진행할 최대 요청 수"
+    )
+    parser.add_argument(
+        "--store_dir",
+        type=str,
+        default="./store",
+        help="시장 데이터를 저장하는 로컬 저장소 경로"
+    )
+    parser.add_argument(
+        "--store_snapshot_interval",
+        type=int,
+        default=20,
+        help="종목 기본 정보를 전체 스냅샷으로 저장하는 주기 (일). 그 사이의 날짜는 이전 날짜와의 차이만 저장"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="진행 상황을 기록하는 체크포인트 파일 경로 (기본값: <store_dir>/backfill_checkpoint.json)"
+    )
+    parser.add_argument(
+        "--krx_rate_limit",
+        type=float,
+        default=5.0,
+        help="KRX API 에 보낼 수 있는 초당 최대 요청 수. 같은 --store_dir 을 쓰는 서버와 함께 따름"
+    )
+    parser.add_argument(
+        "--krx_burst",
+        type=int,
+        default=5,
+        help="KRX API 에 한 번에 보낼 수 있는 최대 요청 수 (token bucket 크기)"
+    )
+    parser.add_argument(
+        "--log_interval",
+        type=float,
+        default=10.0,
+        help="진행 상황을 출력하는 주기 (초)"
+    )
+
+    return parser.parse_args(argv)
+
+
+class BackfillCheckpoint:
+    """Set of finished (endpoint, date, market) jobs persisted to resume after interruption"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.done: Set[str] = set()
+        if self.path.exists():
+            self.done = set(json.loads(self.path.read_text(encoding="utf-8"))["done"])
+            LOGGER.info(f"[Backfill] Resuming from the checkpoint with {len(self.done)} finished jobs")
+
+    @staticmethod
+    def key(endpoint: str, date: str, market: str) -> str:
+        return f"{endpoint}:{market}:{date}"
+
+    def __contains__(self, job: Tuple[str, str, str]) -> bool:
+        return self.key(*job) in self.done
+
+    def add(self, endpoint: str, date: str, market: str) -> None:
+        self.done.add(self.key(endpoint, date, market))
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"done": sorted(self.done)}), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+class KrxBackfiller:
+    """Backfill a date range × market set into the local store through KrxStockClient"""
+
+    def __init__(self, args):
+        # The rate limit is shared with a server using the same store
+        self.client = KrxStockClient(
+            rate_limit=args.krx_rate_limit,
+            burst=args.krx_burst,
+            rate_limit_file=os.path.join(args.store_dir, KRX_RATE_LIMIT_FILE)
+        )
+        self.store = KrxMarketStore(root=args.store_dir, snapshot_interval=args.store_snapshot_interval)
+        self.negative_cache = KrxNegativeCache()
+        self.checkpoint = BackfillCheckpoint(
+            args.checkpoint or os.path.join(args.store_dir, "backfill_checkpoint.json")
+        )
+        self.concurrency = args.concurrency
+        self.log_interval = args.log_interval
+
+        self.total: int = 0
+        self.processed: int = 0
+        self.empty: int = 0
+        self.failed: int = 0
+        self.requeued: int = 0
+        # Jobs failed since the last response of KRX API, as counted by the circuit breaker
+        self._failing: List[Tuple[str, str, str]] = []
+        self.records: int = 0
+
+    def plan(
+            self,
+            start: str,
+            end: str,
+            markets: List[str],
+            endpoints: List[str]
+        ) -> List[Tuple[str, str, str]]:
+        """List jobs which are neither stored, checkpointed nor known to have no data"""
+        jobs = []
+        day = datetime.strptime(start, "%Y%m%d")
+        last = datetime.strptime(end, "%Y%m%d")
+        while day <= last:
+            date = day.strftime("%Y%m%d")
+            for market in markets:
+                if self.negative_cache.get(date, market):
+                    continue
+                for endpoint in endpoints:
+                    job = (endpoint, date, market)
+                    if job in self.checkpoint or self.store.has(*job):
+                        continue
+                    jobs.append(job)
+            day += timedelta(days=1)
+        return jobs
+
+    async def run(self, jobs: List[Tuple[str, str, str]]) -> None:
+        """Run jobs with bounded concurrency"""
+        self.total = len(jobs)
+        LOGGER.info(f"[Backfill] {self.total} market-days to backfill")
+        if not jobs:
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+
+        started = time.monotonic()
+        reporter = asyncio.create_task(self._report(started))
+        try:
+            await asyncio.gather(*(self._worker(queue) for _ in range(self.concurrency)))
+        finally:
+            reporter.cancel()
+            self.checkpoint.save()
+            await self.client.close()
+            self._log_progress(started)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        breaker = self.client.breaker
+        while not queue.empty():
+            # While KRX API is down, every worker waits for the circuit to close instead of failing the queue
+            if wait := breaker.retry_after():
+                await asyncio.sleep(wait)
+                continue
+
+            endpoint, date, market = queue.get_nowait()
+            if endpoint == "info":
+                result = await self.client.fetch_stock_info(date, market)
+            else:
+                result = await self.client.fetch_stock_price(date, market)
+
+            job = (endpoint, date, market)
+            if result.status == "error" and breaker.state != "closed":
+                # The circuit opened: the jobs which failed on the way are retried with this one once it closes
+                self.failed -= len(self._failing)
+                self.processed -= len(self._failing)
+                for failed_job in [*self._failing, job]:
+                    queue.put_nowait(failed_job)
+                self.requeued += len(self._failing) + 1
+                self._failing.clear()
+                continue
+
+            self.processed += 1
+            if result.status != "error":
+                self._failing.clear()
+            if result.ok:
+                # Saving an info day diffs it against its delta chain, which would block the other workers
+                await asyncio.to_thread(self.store.save, endpoint, date, market, result.records)
+                self.records += len(result.records)
+            elif result.status == "empty":
+                self.empty += 1
+                # The latest open date may still be published later
+                if self.negative_cache.push(date, market) != "market holiday":
+                    continue
+            else:
+                # Failed jobs are not checkpointed so that they are retried on the next run
+                self.failed += 1
+                self._failing.append(job)
+                continue
+
+            self.checkpoint.add(*job)
+
+    async def _report(self, started: float) -> None:
+        while True:
+            await asyncio.sleep(self.log_interval)
+            self._log_progress(started)
+            self.checkpoint.save()
+
+    def _log_progress(self, started: float) -> None:
+        elapsed = max(time.monotonic() - started, 1e-9)
+        rate = self.processed / elapsed
+        eta = (self.total - self.processed) / rate if rate else float("inf")
+        LOGGER.info(
+            f"[Backfill] {self.processed}/{self.total} market-days "
+            f"(empty={self.empty}, failed={self.failed}, requeued={self.requeued}) | "
+            f"{rate:.2f} market-days/s, {self.records / elapsed:.0f} records/s | ETA {eta:.0f}s"
+        )
+
+
+async def main(args):
+    end = args.end or get_latest_open_date()
+    for date in (args.start, end):
+        datetime.strptime(date, "%Y%m%d")
+
+    backfiller = KrxBackfiller(args)
+    jobs = backfiller.plan(args.start, end, args.markets, args.endpoints)
+    await backfiller.run(jobs)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,95 @@
+import gc
+import json
+import asyncio
+from typing import Dict, Any
+import pytest
+from fastmcp.exceptions import ToolError
+from benchmarks.payloads import ReplayKrxClient
+
+
+class GatedKrxClient(ReplayKrxClient):
+    """Replayed payloads, held back while the gate is closed so that cold fetches stay in flight"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def make_request(self, url: str, key: str) -> Dict[str, Dict[str, Any]]:
+        await self.gate.wait()
+        return self.make_request_sync(url, key)
+
+
+@pytest.fixture
+def gated_server(make_server):
+    def _gated_server(*argv: str):
+        server = make_server(*argv)
+        server.client = server.registry.client = GatedKrxClient()
+        return server
+    return _gated_server
+
+
+def _price(server, date: str, session: str = "a"):
+    return server.get_stock_price(None, "005930", "코스피", date=date, session=session)
+
+
+async def _in_flight(server, count: int) -> None:
+    while server.admission.in_flight < count:
+        await asyncio.sleep(0)
+
+
+def test_cold_fetches_beyond_the_limit_are_rejected(gated_server):
+    server = gated_server("--cold_fetch_limit", "2", "--cold_queue_size", "0")
+
+    async def run():
+        # A warm day in the cache and a day only in the store
+        await _price(server, "20250108")
+        await server.registry.load("price", "20250107", "stk")
+        gc.collect()
+        assert not server.registry.is_cold("price", "20250107", "stk")
+
+        server.client.gate.clear()
+        cold = [asyncio.create_task(_price(server, date, session)) for date, session in (("20250102", "a"), ("20250103", "b"))]
+        await _in_flight(server, 2)
+
+        with pytest.raises(ToolError) as rejected:
+            await _price(server, "20250106", "c")
+
+        # Warm, stored and already running market-days never wait for a cold fetch slot
+        assert "005930" in await _price(server, "20250108", "c")
+        assert "005930" in await _price(server, "20250107", "c")
+        joined = asyncio.create_task(_price(server, "20250102", "c"))
+        await asyncio.sleep(0)
+
+        server.client.gate.set()
+        results = await asyncio.gather(*cold, joined)
+        return json.loads(str(rejected.value)), results
+
+    rejection, results = asyncio.run(run())
+    assert rejection["message"] == "Server busy" and rejection["retry_after"] >= 1.0
+    assert all("005930" in result for result in results)
+    stats = server.admission.stats()
+    assert stats["rejected"]["queue_full"] == 1 and stats["admitted"] == 3
+
+
+def test_cold_fetches_beyond_the_session_limit_are_rejected(gated_server):
+    server = gated_server("--session_limit", "1", "--cold_fetch_limit", "4")
+
+    async def run():
+        server.client.gate.clear()
+        first = asyncio.create_task(_price(server, "20250102", "a"))
+        await _in_flight(server, 1)
+
+        with pytest.raises(ToolError) as rejected:
+            await _price(server, "20250103", "a")
+        # The limit is per session
+        other = asyncio.create_task(_price(server, "20250103", "b"))
+        await _in_flight(server, 2)
+
+        server.client.gate.set()
+        await asyncio.gather(first, other)
+        return json.loads(str(rejected.value))
+
+    rejection = asyncio.run(run())
+    assert "session" in rejection["reason"] and rejection["retry_after"] >= 1.0
+    assert server.admission.stats()["rejected"]["session_limit"] == 1
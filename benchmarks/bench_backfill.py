@@ -0,0 +1,118 @@
+import json
+import asyncio
+import threading
+from typing import Dict, List, Set, Any
+import pytest
+from backfill import parse_args, KrxBackfiller
+from src.krx_client import KrxApiError
+from src.throttle import CircuitBreaker, CircuitOpenError
+from benchmarks.payloads import ScriptedKrxClient
+
+
+class InterruptedKrxClient(ScriptedKrxClient):
+    """Scripted client recording the requested dates, stalling at the market-days the run is interrupted at"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stalled: Set[str] = set()
+        self.reached = asyncio.Event()
+        self.dates: List[str] = []
+
+    async def make_request(self, url: str, key: str) -> Dict[str, Dict[str, Any]]:
+        date = url.rsplit("=", 1)[1]
+        self.dates.append(date)
+        if date in self.stalled:
+            self.reached.set()
+            await asyncio.Event().wait()
+        return self.make_request_sync(url, key)
+
+
+@pytest.fixture
+def make_backfiller(tmp_path):
+    def _make_backfiller():
+        args = parse_args([
+            "--start", "20250101", "--end", "20250110", "--markets", "stk", "--endpoints", "price",
+            "--concurrency", "1", "--store_dir", str(tmp_path / "store"),
+        ])
+        backfiller = KrxBackfiller(args)
+        backfiller.client = InterruptedKrxClient()
+        backfiller.client.empty.add("20250101")
+        return backfiller
+    return _make_backfiller
+
+
+def test_resume_skips_finished_and_holiday_days(make_backfiller):
+    backfiller = make_backfiller()
+    backfiller.client.failing.add("20250103")
+    backfiller.client.stalled.add("20250107")
+
+    async def interrupt():
+        run = asyncio.create_task(backfiller.run(backfiller.plan("20250101", "20250110", ["stk"], ["price"])))
+        await backfiller.client.reached.wait()
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+    asyncio.run(interrupt())
+    # Weekends are never requested, and neither failed nor interrupted jobs are checkpointed
+    assert backfiller.client.dates == ["20250101", "20250102", "20250103", "20250106", "20250107"]
+    done = json.loads(backfiller.checkpoint.path.read_text(encoding="utf-8"))["done"]
+    assert done == ["price:stk:20250101", "price:stk:20250102", "price:stk:20250106"]
+
+    # A new process resumes from the checkpoint with an empty negative cache
+    resumed = make_backfiller()
+    jobs = resumed.plan("20250101", "20250110", ["stk"], ["price"])
+    assert [date for _, date, _ in jobs] == ["20250103", "20250107", "20250108", "20250109", "20250110"]
+
+    asyncio.run(resumed.run(jobs))
+    assert resumed.client.dates == ["20250103", "20250107", "20250108", "20250109", "20250110"]
+    assert resumed.failed == 0 and not resumed.plan("20250101", "20250110", ["stk"], ["price"])
+    # The holiday stays known to have no data, without being stored as a real market-day
+    assert ("price", "20250101", "stk") in resumed.checkpoint and not resumed.store.has("price", "20250101", "stk")
+
+
+def test_days_are_saved_off_the_event_loop(make_backfiller, monkeypatch):
+    backfiller = make_backfiller()
+    threads = []
+    save = backfiller.store.save
+    monkeypatch.setattr(backfiller.store, "save", lambda *args: threads.append(threading.get_ident()) or save(*args))
+
+    async def run():
+        await backfiller.run(backfiller.plan("20250102", "20250103", ["stk"], ["price"]))
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert len(threads) == 2 and loop_thread not in threads
+
+
+class OutageKrxClient(ScriptedKrxClient):
+    """Scripted client behind a circuit breaker, failing its first 'outage' requests like a short KRX outage"""
+
+    def __init__(self, *args, outage: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.outage = outage
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    async def make_request(self, url: str, key: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            self.breaker.before_request()
+        except CircuitOpenError as e:
+            raise KrxApiError(str(e)) from e
+        if self.outage:
+            self.outage -= 1
+            self.breaker.record_failure()
+            raise KrxApiError("HTTP 503")
+        self.breaker.record_success()
+        return self.make_request_sync(url, key)
+
+
+@pytest.mark.parametrize("outage", [2, 3])
+def test_short_outage_does_not_fail_the_run(make_backfiller, outage):
+    backfiller = make_backfiller()
+    backfiller.concurrency = 3
+    backfiller.client = OutageKrxClient(outage=outage)
+    jobs = backfiller.plan("20250102", "20250110", ["stk"], ["price"])
+
+    asyncio.run(backfiller.run(jobs))
+    assert backfiller.failed == 0 and backfiller.requeued >= outage
+    assert backfiller.processed == len(jobs) and all(backfiller.store.has(*job) for job in jobs)
@@ -0,0 +1,81 @@
+import pytest
+from src.cache import KrxStockPriceCache, KrxNegativeCache
+from benchmarks.payloads import ReplayKrxClient
+
+DATES = [f"202501{day:02d}" for day in range(2, 31)]
+
+
+@pytest.fixture(scope="module")
+def market_day():
+    import asyncio
+    result = asyncio.run(ReplayKrxClient().fetch_stock_price("20250102", "stk"))
+    return result.records
+
+
+@pytest.fixture
+def cache(market_day):
+    cache = KrxStockPriceCache(max_size=10)
+    cache.update_latest("20250131", {("20250131", "stk"): market_day})
+    for date in DATES[:10]:
+        cache.push(date, "stk", market_day)
+    return cache
+
+
+def test_get_latest_hit(benchmark, cache):
+    assert benchmark(cache.get, "20250131", "stk", "005930")
+
+
+def test_get_lru_hit(benchmark, cache):
+    assert benchmark(cache.get, DATES[5], "stk", "005930")
+
+
+def test_get_miss(benchmark, cache):
+    assert not benchmark(cache.get, "20240102", "stk", "005930")
+
+
+def test_push_churn(benchmark, cache, market_day):
+    def churn():
+        for date in DATES:
+            cache.push(date, "stk", market_day)
+    benchmark(churn)
+
+
+def test_move_to_lru(benchmark, cache, market_day):
+    latest = {(date, market): market_day for date in DATES[:3] for market in cache.markets}
+    benchmark(cache._move_to_lru, latest)
+
+
+@pytest.mark.parametrize("size", [100, 1_000, 10_000, 100_000])
+def test_get_lru_hit_by_market_day_size(benchmark, size):
+    """A hit must cost the same regardless of the number of tickers in the market-day"""
+    day = {f"{i:06d}": {"ISU_CD": f"{i:06d}"} for i in range(size)}
+    cache = KrxStockPriceCache(max_size=10)
+    for date in DATES[:10]:
+        cache.push(date, "stk", day)
+    assert benchmark(cache.get, DATES[5], "stk", "000042")
+
+
+def test_get_unknown_market_fallback_hit(benchmark, cache, market_day):
+    cache.push(DATES[5], "knx", {"999999": {"ISU_CD": "999999"}})
+    assert benchmark(cache.get, DATES[5], None, "999999")
+
+
+def test_negative_cache_classifies_without_requests():
+    negative_cache = KrxNegativeCache()
+    assert negative_cache.get("20250104", "stk") == "weekend"
+    assert negative_cache.get("20090105", "stk").startswith("before the first available date")
+    assert negative_cache.get("20990105", "stk") == "not available yet"
+    assert negative_cache.get("20250102", "stk") is None
+
+
+def test_negative_cache_holidays_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.cache.time.monotonic", lambda: now[0])
+    negative_cache = KrxNegativeCache(transient_ttl=10.0, holiday_ttl=100.0)
+
+    assert negative_cache.push("20250101", "stk") == "market holiday"
+    now[0] += 99.0
+    assert negative_cache.get("20250101", "stk") == "market holiday"
+    assert negative_cache.get("20250101", "ksq") is None
+    now[0] += 1.0
+    assert negative_cache.get("20250101", "stk") is None
@@ -0,0 +1,144 @@
+"""
+Hit ratios of the cache policies replayed over a trace of tool requests.
+
+The trace is read from 'benchmarks/traces/requests.jsonl' when present, one request per line
+in the tool input format ({"request": {"ticker": ..., "market": ..., "date": ...}}).
+Otherwise a trace of the same format is synthesized: most requests hit the recent trading days,
+some revisit a working set of historical days, and the rest scan through old history once.
+"""
+import json
+import random
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import List, Tuple
+import pytest
+from src.cache import KrxStockPriceCache
+
+TRACE_PATH = Path(__file__).resolve().parent / "traces" / "requests.jsonl"
+MARKETS = {"코스피": "stk", "코스닥": "ksq", "코넥스": "knx"}
+TICKERS = ["005930", "000660", "035420", "005380", "051910", "068270"]
+CACHE_SIZE = 10
+PREFETCH_THRESHOLD = 2
+
+
+def _trading_days(start: str, end: str) -> List[str]:
+    days, day, last = [], datetime.strptime(start, "%Y%m%d"), datetime.strptime(end, "%Y%m%d")
+    while day <= last:
+        if day.weekday() < 5:
+            days.append(day.strftime("%Y%m%d"))
+        day += timedelta(days=1)
+    return days
+
+
+def _synthesize_trace(size: int = 20_000) -> List[dict]:
+    rng = random.Random(0)
+    days = _trading_days("20120102", "20250131")
+    recent, history = days[-20:], days[:-20]
+    working_set = rng.sample(history, 8)
+    scan: List[str] = []
+    trace = []
+    for _ in range(size):
+        kind = rng.random()
+        if kind < 0.6:
+            # Recent days, the most recent ones being the most popular
+            date = recent[-1 - min(int(rng.expovariate(0.4)), len(recent) - 1)]
+        elif kind < 0.8:
+            # A working set of historical days revisited by analyses
+            date = days[days.index(rng.choice(working_set)) + rng.randint(0, 2)]
+        else:
+            # One-off scans through old history, interleaved with the other requests
+            if not scan:
+                start = rng.randrange(len(history) - 30)
+                scan = history[start:start + rng.randint(10, 30)]
+            date = scan.pop(0)
+        trace.append({"request": {"ticker": rng.choice(TICKERS), "market": "코스피", "date": date}})
+    return trace
+
+
+def load_trace() -> List[Tuple[str, str, str]]:
+    """(date, market, ticker) of each request of the trace"""
+    if TRACE_PATH.exists():
+        lines = TRACE_PATH.read_text(encoding="utf-8").splitlines()
+        requests = [json.loads(line)["request"] for line in lines if line.strip()]
+    else:
+        requests = [line["request"] for line in _synthesize_trace()]
+    return [
+        (request["date"], MARKETS.get(request.get("market"), "stk"), request["ticker"])
+        for request in requests if request.get("date") and request.get("ticker")
+    ]
+
+
+def _adjacent_weekdays(date: str) -> List[str]:
+    day = datetime.strptime(date, "%Y%m%d")
+    adjacent = []
+    for step in (-1, 1):
+        candidate = day + timedelta(days=step)
+        while candidate.weekday() >= 5:
+            candidate += timedelta(days=step)
+        adjacent.append(candidate.strftime("%Y%m%d"))
+    return adjacent
+
+
+def replay(policy: str, prefetch: bool, trace: List[Tuple[str, str, str]]) -> KrxStockPriceCache:
+    """Replay the trace the way the server uses the cache, with market-days loaded for free"""
+    market_day = {ticker: {"ISU_CD": ticker} for ticker in TICKERS}
+    cache = KrxStockPriceCache(max_size=CACHE_SIZE, policy=policy)
+    for date, market, ticker in trace:
+        if not cache.get(date, market, ticker):
+            cache.push(date, market, market_day)
+        if prefetch and cache.frequency(date, market) == PREFETCH_THRESHOLD:
+            for adjacent in _adjacent_weekdays(date):
+                if not cache.contains(adjacent, market):
+                    cache.push(adjacent, market, market_day, prefetched=True)
+    return cache
+
+
+@pytest.fixture(scope="module")
+def trace():
+    return load_trace()
+
+
+@pytest.mark.parametrize("prefetch", [False, True], ids=["no-prefetch", "prefetch"])
+@pytest.mark.parametrize("policy", ["lru", "slru", "tinylfu"])
+def test_replay_hit_ratio(benchmark, trace, policy, prefetch):
+    cache = benchmark.pedantic(replay, args=(policy, prefetch, trace), rounds=3)
+    benchmark.extra_info.update(cache.stats())
+    benchmark.extra_info["prefetch"] = prefetch
+
+
+def test_frequency_aware_policies_keep_hot_days(trace):
+    """Scans of old history must not lower the hit ratio below the plain LRU"""
+    lru = replay("lru", False, trace).stats()["hit_ratio"]
+    for policy in ("slru", "tinylfu"):
+        assert replay(policy, False, trace).stats()["hit_ratio"] >= lru
+
+
+@pytest.mark.parametrize("policy", ["lru", "slru", "tinylfu"])
+def test_rollovers_keep_the_index_bounded(policy):
+    """Previous latest market-days evicted or declined by the policy must leave the index"""
+    market_day = {ticker: {"ISU_CD": ticker} for ticker in TICKERS}
+    cache = KrxStockPriceCache(max_size=3, policy=policy)
+    for date in _trading_days("20250102", "20250131"):
+        cache.update_latest(date, {(date, market): market_day for market in cache.markets})
+        indexed = sum(len(days) for days in cache._index.values())
+        assert indexed == len(cache._policy) + len(cache.latest)
+        assert len(cache._policy) <= 3
+
+
+@pytest.mark.parametrize("policy", ["lru", "slru", "tinylfu"])
+def test_prefetched_days_are_admitted_and_evicted_first(policy):
+    """Prefetched days must not be declined for having no accesses, nor displace requested days"""
+    market_day = {ticker: {"ISU_CD": ticker} for ticker in TICKERS}
+    days = _trading_days("20250102", "20250131")
+    cache = KrxStockPriceCache(max_size=3, policy=policy)
+    for date in days[:3]:
+        cache.get(date, "stk", TICKERS[0])
+        cache.push(date, "stk", market_day)
+
+    cache.push(days[3], "stk", market_day, prefetched=True)
+    assert cache.contains(days[3], "stk")
+    assert sum(cache.contains(date, "stk") for date in days[:3]) == 2
+
+    cache.get(days[4], "stk", TICKERS[0])
+    cache.push(days[4], "stk", market_day)
+    assert not cache.contains(days[3], "stk")
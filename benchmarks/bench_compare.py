@@ -0,0 +1,56 @@
+"""
+Comparison of 20 tickers over a quarter of market-days: assembling the close-price matrix
+and computing returns, performance and correlations over it.
+"""
+import json
+import asyncio
+import numpy as np
+import pytest
+from src.comparison import KrxPriceComparison
+from benchmarks.payloads import ReplayKrxClient
+from benchmarks.bench_cache_policy import _trading_days
+
+TICKERS = 20
+
+
+@pytest.fixture(scope="module")
+def days():
+    client = ReplayKrxClient()
+    dates = _trading_days("20250102", "20250331")
+    return [(date, asyncio.run(client.fetch_stock_price(date, "stk")).records) for date in dates]
+
+
+@pytest.fixture(scope="module")
+def tickers(days):
+    return list(days[0][1])[:TICKERS]
+
+
+def _compare(days, tickers):
+    comparison = KrxPriceComparison(tickers)
+    for date, day in days:
+        comparison.add(date, day)
+    return comparison.compare()
+
+
+def test_compare_quarter(benchmark, days, tickers):
+    output = benchmark(_compare, days, tickers)
+    assert output["days"] == len(days)
+
+
+def test_correlation_matches_numpy(days, tickers):
+    output = _compare(days, tickers)
+    close = np.array([[float(day[ticker]["TDD_CLSPRC"]) for ticker in tickers] for _, day in days])
+    expected = np.corrcoef((close[1:] / close[:-1] - 1).T)
+    assert np.allclose(np.array(output["correlation"], dtype=float), expected, atol=1e-3)
+
+
+def test_compare_without_trading_days(tickers):
+    output = KrxPriceComparison(tickers).compare()
+    assert output["days"] == 0 and output["stocks"][tickers[0]]["start_close"] is None
+
+
+def test_compare_stocks_over_a_weekend(make_server):
+    server = make_server()
+    output = json.loads(asyncio.run(server.compare_stocks(["005930", "000660"], start_date="20250104", date="20250105")))
+    assert output["message"] == "No trading data" and output["reason"] == "weekend"
+    assert server.client.requests == 0
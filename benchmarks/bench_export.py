@@ -0,0 +1,58 @@
+"""
+Export of a month of stored price market-days, and reading it back: a memory-mapped Arrow file
+against loading the same days from the JSON store.
+"""
+import asyncio
+import tracemalloc
+import pytest
+from src.store import KrxMarketStore
+from src.export import KrxArrowExporter
+from benchmarks.payloads import ReplayKrxClient
+from benchmarks.bench_cache_policy import _trading_days
+
+pa = pytest.importorskip("pyarrow")
+
+DATES = _trading_days("20250102", "20250131")
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    store = KrxMarketStore(tmp_path_factory.mktemp("store"))
+    client = ReplayKrxClient()
+    for date in DATES:
+        store.save("price", date, "stk", asyncio.run(client.fetch_stock_price(date, "stk")).records)
+    return store
+
+
+@pytest.mark.parametrize("format", KrxArrowExporter.formats)
+def test_export_month(benchmark, tmp_path, store, format):
+    exporter = KrxArrowExporter(loader=store.load)
+    path = tmp_path / f"price.{format}"
+    result = benchmark.pedantic(exporter.export, args=("price", "stk", DATES[0], DATES[-1], path, format), rounds=3)
+    assert result["days"] == len(DATES)
+
+    tracemalloc.start()
+    exporter.export("price", "stk", DATES[0], DATES[-1], path, format)
+    benchmark.extra_info["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    benchmark.extra_info["bytes"] = result["bytes"]
+
+
+def test_read_memory_mapped(benchmark, tmp_path, store):
+    path = tmp_path / "price.arrow"
+    KrxArrowExporter(loader=store.load).export("price", "stk", DATES[0], DATES[-1], path)
+
+    def read():
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).read_all().column("TDD_CLSPRC").to_numpy().sum()
+
+    benchmark(read)
+
+
+def test_read_json_store(benchmark, store):
+    def read():
+        return sum(
+            int(entry["TDD_CLSPRC"]) for date in DATES for entry in store.load("price", date, "stk").values()
+        )
+
+    benchmark(read)
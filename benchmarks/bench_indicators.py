@@ -0,0 +1,78 @@
+import asyncio
+import json
+import pytest
+from fastmcp.exceptions import ToolError
+from benchmarks.payloads import ScriptedKrxClient
+from benchmarks.bench_admission import GatedKrxClient
+
+
+@pytest.fixture
+def server(make_server, monkeypatch):
+    server = make_server("--prefetch_threshold", "0")
+    server.client = server.registry.client = ScriptedKrxClient()
+    return server
+
+
+def _open_date(monkeypatch, date):
+    for module in ("src.server", "src.cache"):
+        monkeypatch.setattr(f"{module}.get_latest_open_date", lambda: date)
+
+
+def _indicators(server, date=None):
+    return json.loads(asyncio.run(server.get_stock_indicators(None, "005930", "코스피", date=date)))
+
+
+def test_series_restarts_after_a_gap(server, monkeypatch):
+    _open_date(monkeypatch, "20250103")
+    assert _indicators(server)["bas_dd"] == "20250103"
+
+    # The day after the last appended one cannot be loaded: the series must not bridge over it
+    server.client.failing.add("20250107")
+    _open_date(monkeypatch, "20250110")
+    assert _indicators(server)["bas_dd"] == "20250110"
+    assert server.indicators._series["stk"].dates == ["20250108", "20250109", "20250110"]
+
+
+def test_series_fills_missed_days(server, monkeypatch):
+    _open_date(monkeypatch, "20250103")
+    _indicators(server)
+    _open_date(monkeypatch, "20250108")
+    _indicators(server)
+    assert server.indicators._series["stk"].dates[-4:] == ["20250103", "20250106", "20250107", "20250108"]
+
+
+def test_unavailable_latest_day_is_an_error(server, monkeypatch):
+    _open_date(monkeypatch, "20250103")
+    _indicators(server)
+
+    server.client.failing.add("20250106")
+    _open_date(monkeypatch, "20250106")
+    output = _indicators(server, date="20250106")
+    assert output["message"] == "No indicators" and "20250106" in output["reason"]
+
+
+def test_indicator_fetches_go_through_admission(make_server, monkeypatch):
+    server = make_server("--prefetch_threshold", "0", "--session_limit", "1")
+    server.client = server.registry.client = GatedKrxClient()
+    _open_date(monkeypatch, "20250103")
+
+    async def run():
+        server.client.gate.clear()
+        held = asyncio.create_task(server.get_stock_price(None, "005930", "코스피", date="20250102", session="a"))
+        while not server.admission.in_flight:
+            await asyncio.sleep(0)
+        # The session already holds its only cold fetch slot
+        with pytest.raises(ToolError) as rejected:
+            await server.get_stock_indicators(None, "005930", "코스피", session="a")
+        assert server.indicators.last_date("stk") is None
+
+        server.client.gate.set()
+        await held
+        output = json.loads(await server.get_stock_indicators(None, "005930", "코스피", session="a"))
+        return json.loads(str(rejected.value)), output
+
+    rejection, output = asyncio.run(run())
+    assert rejection["message"] == "Server busy" and "session" in rejection["reason"]
+    assert output["bas_dd"] == "20250103"
+    # Every day the indicators fetched from KRX API was admitted
+    assert server.admission.stats()["admitted"] == server.client.requests
@@ -0,0 +1,244 @@
+"""
+KRX client against a local aiohttp server: decoding, error bodies, retries and circuit breaking
+of the real aiohttp and requests code paths.
+"""
+import gzip
+import json
+import time
+import asyncio
+import threading
+from typing import List, Tuple
+import pytest
+import aiohttp
+from aiohttp import web
+from src.krx_client import KrxStockClient
+from src.throttle import CircuitBreaker
+
+RECORDS = [{"ISU_CD": f"{i:06d}", "TDD_CLSPRC": str(i)} for i in range(1000)]
+
+
+def _body(records) -> bytes:
+    return json.dumps({"OutBlock_1": records}).encode("utf-8")
+
+
+class LocalKrxServer:
+    """aiohttp server on its own thread, answering with the scripted responses in order"""
+
+    def __init__(self):
+        self.responses: List[Tuple] = []
+        self.requests: int = 0
+        self.stalled = threading.Event()
+        self.disconnects: int = 0
+        self.loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        app = web.Application()
+        app.router.add_get("/{api}", self._handle)
+        self._runner = web.AppRunner(app)
+        self.loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        self.loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._started.set()
+        self.loop.run_forever()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/stk_bydd_trd?basDd=20250102"
+
+    def script(self, *responses) -> None:
+        """(status, body[, headers[, sent[, stall]]]) of the next requests; later requests get every record.
+        With `sent`, the connection is dropped after that many bytes of the advertised body,
+        or with `stall`, the rest of the body is held back until the client drops the connection."""
+        self.responses = list(responses)
+        self.requests = 0
+        self.stalled.clear()
+        self.disconnects = 0
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        status, body, headers, sent, stall = self._next()
+        if sent is None:
+            return web.Response(status=status, body=body, headers=headers)
+        response = web.StreamResponse(status=status, headers=headers)
+        response.content_length = len(body)
+        await response.prepare(request)
+        await response.write(body[:sent])
+        if not stall:
+            request.transport.close()
+            return response
+
+        self.stalled.set()
+        while request.transport is not None and not request.transport.is_closing():
+            await asyncio.sleep(0.01)
+        self.disconnects += 1
+        return response
+
+    def _next(self) -> Tuple:
+        response = self.responses.pop(0) if self.responses else (200, _body(RECORDS))
+        return response + (None,) * (5 - len(response))
+
+    def close(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = LocalKrxServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr("src.krx_client.backoff_delay", lambda attempt: 0.0)
+
+
+def _fetch(client: KrxStockClient, url: str):
+    async def fetch():
+        try:
+            return await client._fetch_records(url, "ISU_CD", "20250102")
+        finally:
+            await client.close()
+    return asyncio.run(fetch())
+
+
+def _fetch_sync(client: KrxStockClient, url: str):
+    try:
+        return client._fetch_records_sync(url, "ISU_CD", "20250102")
+    finally:
+        client.close_sync()
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+def test_records(server, fetch):
+    server.script((200, _body(RECORDS)))
+    result = fetch(KrxStockClient(rate_limit=1000, burst=1000), server.url)
+    assert result.ok and len(result.records) == len(RECORDS)
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+def test_explicit_empty_block_is_empty(server, fetch):
+    server.script((200, _body([])))
+    assert fetch(KrxStockClient(rate_limit=1000, burst=1000), server.url).status == "empty"
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+def test_error_body_is_an_error(server, fetch):
+    """A 200 response without the record array must never be mistaken for a day without trading data"""
+    server.script((200, json.dumps({"respCode": "401", "respMsg": "Unauthorized API Call"}).encode("utf-8")))
+    result = fetch(KrxStockClient(rate_limit=1000, burst=1000), server.url)
+    assert result.status == "error" and "401" in result.error
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+@pytest.mark.parametrize("status", [429, 503])
+def test_retryable_status_then_success(server, fetch, status):
+    server.script((status, b"busy"), (status, b"busy"), (200, _body(RECORDS)))
+    result = fetch(KrxStockClient(rate_limit=1000, burst=1000, max_retries=3), server.url)
+    assert result.ok and server.requests == 3
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+def test_retries_exhausted(server, fetch):
+    server.script(*[(500, b"down")] * 3)
+    result = fetch(KrxStockClient(rate_limit=1000, burst=1000, max_retries=2), server.url)
+    assert result.status == "error" and "after 3 attempts" in result.error
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+def test_client_errors_are_not_retried(server, fetch):
+    server.script((404, b"not found"))
+    result = fetch(KrxStockClient(rate_limit=1000, burst=1000, max_retries=3), server.url)
+    assert result.status == "error" and "HTTP 404" in result.error and server.requests == 1
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+def test_breaker_opens_then_half_opens(server, fetch):
+    client = KrxStockClient(rate_limit=1000, burst=1000, max_retries=1)
+    client.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+
+    server.script((503, b"down"), (503, b"down"))
+    assert fetch(client, server.url).status == "error"
+    assert client.breaker.state == "open"
+
+    # Open: failing fast without reaching KRX API
+    server.script()
+    result = fetch(client, server.url)
+    assert result.status == "error" and "circuit is open" in result.error and server.requests == 0
+
+    # Half-open: a single trial request closes the circuit again
+    time.sleep(0.2)
+    assert client.breaker.state == "half-open"
+    assert fetch(client, server.url).ok and server.requests == 1
+    assert client.breaker.state == "closed"
+
+
+def test_gzip_stream(server):
+    server.script((200, gzip.compress(_body(RECORDS)), {"Content-Encoding": "gzip", "Content-Type": "application/json"}))
+    result = _fetch(KrxStockClient(rate_limit=1000, burst=1000), server.url)
+    assert result.ok and len(result.records) == len(RECORDS)
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+def test_truncated_gzip_stream_is_retried(server, fetch):
+    compressed = gzip.compress(_body(RECORDS))
+    headers = {"Content-Encoding": "gzip", "Content-Type": "application/json"}
+    server.script((200, compressed, headers, len(compressed) // 2), (200, compressed, headers))
+    result = fetch(KrxStockClient(rate_limit=1000, burst=1000, max_retries=1), server.url)
+    assert result.ok and len(result.records) == len(RECORDS) and server.requests == 2
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+def test_truncated_gzip_streams_exhaust_retries(server, fetch):
+    compressed = gzip.compress(_body(RECORDS))
+    headers = {"Content-Encoding": "gzip", "Content-Type": "application/json"}
+    server.script(*[(200, compressed, headers, len(compressed) // 2)] * 2)
+    result = fetch(KrxStockClient(rate_limit=1000, burst=1000, max_retries=1), server.url)
+    assert result.status == "error" and "after 2 attempts" in result.error and server.requests == 2
+
+
+def test_cancel_mid_stream_drops_the_connection(server, monkeypatch):
+    """Cancelling a transfer must close the response rather than drain the rest of the market-day"""
+    closed = []
+    close = aiohttp.ClientResponse.close
+    monkeypatch.setattr(aiohttp.ClientResponse, "close", lambda response: closed.append(response.status) or close(response))
+    body = _body(RECORDS)
+    server.script((200, body, {"Content-Type": "application/json"}, len(body) // 2, True))
+    client = KrxStockClient(rate_limit=1000, burst=1000)
+
+    async def run():
+        task = asyncio.create_task(client.make_request(server.url, "ISU_CD"))
+        try:
+            assert await asyncio.to_thread(server.stalled.wait, 5.0)
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+    assert closed == [200]
+    for _ in range(100):
+        if server.disconnects:
+            break
+        time.sleep(0.01)
+    assert server.disconnects == 1
+    # A cancelled request is not a failure of KRX API
+    assert client.breaker.state == "closed"
+
+
+@pytest.mark.parametrize("fetch", [_fetch, _fetch_sync], ids=["async", "sync"])
+def test_corrupt_gzip_stream_is_retried(server, fetch):
+    headers = {"Content-Encoding": "gzip", "Content-Type": "application/json"}
+    server.script((200, b"\x1f\x8b\x08\x00corrupt" * 100, headers), (200, gzip.compress(_body(RECORDS)), headers))
+    result = fetch(KrxStockClient(rate_limit=1000, burst=1000, max_retries=1), server.url)
+    assert result.ok and len(result.records) == len(RECORDS) and server.requests == 2
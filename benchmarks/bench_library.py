@@ -0,0 +1,55 @@
+"""
+Synchronous library: loading a month of price market-days of every market from KRX API,
+one by one versus on the thread pool. Each request waits a simulated network latency.
+"""
+import time
+import pytest
+from src.library import KrxStockLibrary
+from benchmarks.payloads import ReplayKrxClient
+from benchmarks.bench_cache_policy import _trading_days
+
+LATENCY = 0.05
+
+
+class LatentReplayKrxClient(ReplayKrxClient):
+    def make_request_sync(self, url, key):
+        time.sleep(LATENCY)
+        return super().make_request_sync(url, key)
+
+
+PAIRS = [(date, market) for date in _trading_days("20250102", "20250131") for market in ("stk", "ksq", "knx")]
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Shared across rounds so that the payloads are synthesized only once"""
+    return LatentReplayKrxClient(rate_limit=1000, burst=1000)
+
+
+def _load_month(client, tmp_path, max_workers):
+    # Every round starts from an empty store so that each market-day is fetched
+    store_dir = tmp_path / f"store-{time.perf_counter_ns()}"
+    with KrxStockLibrary(store_dir=str(store_dir), max_workers=max_workers) as library:
+        library.client = client
+        return library.load_many("price", PAIRS)
+
+
+@pytest.mark.parametrize("max_workers", [1, 8])
+def test_load_many(benchmark, client, tmp_path, max_workers):
+    # Synthesize the payloads outside the measured rounds
+    _load_month(client, tmp_path, max_workers)
+    results = benchmark.pedantic(_load_month, args=(client, tmp_path, max_workers), rounds=3, iterations=1)
+    assert all(result.ok for result in results.values())
+
+
+def test_load_shares_the_store(tmp_path):
+    with KrxStockLibrary(store_dir=str(tmp_path / "store")) as library:
+        library.client = ReplayKrxClient()
+        library.load_many("price", PAIRS[:3])
+        library.load_many("price", PAIRS[:3])
+        assert library.client.requests == 3
+
+    with KrxStockLibrary(store_dir=str(tmp_path / "store")) as library:
+        library.client = ReplayKrxClient()
+        assert library.load("price", *PAIRS[0]).ok
+        assert library.client.requests == 0
@@ -0,0 +1,55 @@
+import json
+import asyncio
+import pytest
+from fastmcp import Client
+from mcp.client.subscriptions import listen
+from src.notifier import LATEST_DAY_URI, LATEST_TICKER_URI
+
+TICKER_URI = LATEST_TICKER_URI.format(market="stk", ticker="005930")
+
+
+def test_publish_reaches_listen_streams(make_server):
+    """A new trading day updates 'krx://latest' and the subscribed tickers of its priced markets"""
+    server = make_server()
+
+    async def run():
+        async with Client(server.mcp) as client:
+            async with listen(client.session, resource_subscriptions=[LATEST_DAY_URI, TICKER_URI]) as events:
+                assert server.notifier.subscribed_tickers("stk") == ["005930"]
+                await server.notifier.publish("20250102", {"stk": {"info": True, "price": True}})
+                return [(await asyncio.wait_for(events.__anext__(), 5)).uri for _ in range(2)]
+
+    assert asyncio.run(run()) == [LATEST_DAY_URI, TICKER_URI]
+    assert server.notifier.event()["date"] == "20250102"
+
+
+def test_unpriced_markets_do_not_update_tickers(make_server):
+    server = make_server()
+    updates = []
+    server.notifier.bus.subscribe(lambda event: updates.append(event.uri))
+    server.notifier.listen_handler.subscriptions[TICKER_URI] += 1
+
+    asyncio.run(server.notifier.publish("20250102", {"stk": {"info": True, "price": False}}))
+    assert updates == [LATEST_DAY_URI]
+
+
+def test_latest_day_is_known_before_the_watcher_runs(make_server, monkeypatch):
+    monkeypatch.setattr("src.server.get_latest_open_date", lambda: "20250110")
+    server = make_server()
+
+    async def run():
+        async with Client(server.mcp) as client:
+            return json.loads((await client.read_resource(LATEST_DAY_URI))[0].text)
+
+    assert asyncio.run(run())["date"] == "20250110"
+
+    # A follower never runs the watcher, and follows the clock instead
+    server.is_leader = False
+    monkeypatch.setattr("src.server.get_latest_open_date", lambda: "20250113")
+    assert asyncio.run(run())["date"] == "20250113"
+
+
+def test_listen_cannot_be_bound_twice(make_server):
+    server = make_server()
+    with pytest.raises(RuntimeError):
+        server.notifier.attach(server.mcp)
@@ -0,0 +1,74 @@
+"""
+Payload size and serialization time of price responses, with and without field projection.
+A batch of 50 tickers stands in for the high-volume calls; the payload bytes are a proxy of the LLM tokens.
+"""
+import json
+import asyncio
+import threading
+import pytest
+from src.schemas.schema import StockPriceOutputModel
+from src.schemas.projection import ProjectedSerializer, get_serializer
+from benchmarks.payloads import ReplayKrxClient
+
+BATCH_SIZE = 50
+PROJECTIONS = {"all": None, "close-change": ["TDD_CLSPRC", "CMPPREVDD_PRC"]}
+
+
+@pytest.fixture(scope="module")
+def rows():
+    result = asyncio.run(ReplayKrxClient().fetch_stock_price("20250102", "stk"))
+    return dict(list(result.records.items())[:BATCH_SIZE])
+
+
+def _dump_per_row(rows):
+    """Serialization before projection and batching: one response per ticker with every field"""
+    return [StockPriceOutputModel.model_validate(entry).model_dump_json(exclude_none=True) for entry in rows.values()]
+
+
+def test_batch_per_row_model(benchmark, rows):
+    payloads = benchmark(_dump_per_row, rows)
+    benchmark.extra_info["payload_bytes"] = sum(len(payload.encode("utf-8")) for payload in payloads)
+
+
+@pytest.mark.parametrize("projection", PROJECTIONS)
+def test_batch_projected(benchmark, rows, projection):
+    serializer = get_serializer(StockPriceOutputModel, PROJECTIONS[projection])
+    payload = benchmark(serializer.dump_rows, rows)
+    benchmark.extra_info["payload_bytes"] = len(payload.encode("utf-8"))
+
+
+@pytest.mark.parametrize("projection", PROJECTIONS)
+def test_single_projected(benchmark, rows, projection):
+    serializer = get_serializer(StockPriceOutputModel, PROJECTIONS[projection])
+    payload = benchmark(serializer.dump, next(iter(rows.values())))
+    benchmark.extra_info["payload_bytes"] = len(payload.encode("utf-8"))
+
+
+def test_projection_shrinks_payload(rows):
+    full = get_serializer(StockPriceOutputModel).dump_rows(rows)
+    projected = get_serializer(StockPriceOutputModel, PROJECTIONS["close-change"]).dump_rows(rows)
+    assert json.loads(projected).keys() == json.loads(full).keys()
+    assert len(projected) * 3 < len(full)
+
+
+def test_large_rows_are_serialized_off_the_event_loop(make_server, monkeypatch):
+    server = make_server()
+    threads = []
+    dump_rows = ProjectedSerializer.dump_rows
+
+    def recording_dump_rows(self, rows):
+        threads.append((len(rows), threading.get_ident()))
+        return dump_rows(self, rows)
+
+    monkeypatch.setattr(ProjectedSerializer, "dump_rows", recording_dump_rows)
+
+    async def run():
+        await server.get_stock_batch("price", ["005930", "000660"], date="20250102")
+        found = json.loads(await server.search_stocks({}, {"LIST_DD": ("19000101", None)}, market="코스피", date="20250102", limit=500))
+        return found, threading.get_ident()
+
+    found, loop_thread = asyncio.run(run())
+    assert len(found["stocks"]) == 500
+    (small, small_thread), (large, large_thread) = threads
+    assert small == 2 and small_thread == loop_thread
+    assert large == 500 and large_thread != loop_thread
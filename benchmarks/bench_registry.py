@@ -0,0 +1,197 @@
+import json
+import asyncio
+import threading
+import contextvars
+from typing import Dict, List, Any
+import pytest
+from src.cache import KrxNegativeCache
+from src.registry import KrxMarketDataRegistry
+from src.store import KrxMarketStore, SharedMarketDay
+from src.tracing import KrxTracer, _CURRENT_SPAN
+from benchmarks.payloads import ScriptedKrxClient
+
+REQUEST_ID: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+
+
+class SlowKrxClient(ScriptedKrxClient):
+    """Scripted client whose requests take a while, recording the context they ran in and their cancellation"""
+
+    def __init__(self, *args, delay: float = 0.2, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.started = asyncio.Event()
+        self.cancelled: int = 0
+        self.contexts: List[Dict[str, Any]] = []
+
+    async def make_request(self, url: str, key: str) -> Dict[str, Dict[str, Any]]:
+        self.contexts.append({"request_id": REQUEST_ID.get(), "span": _CURRENT_SPAN.get()})
+        self.started.set()
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.make_request_sync(url, key)
+
+
+class _Exporter:
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return KrxMarketDataRegistry(ScriptedKrxClient(), KrxMarketStore(root=str(tmp_path / "store")), KrxNegativeCache())
+
+
+def test_failures_are_not_negative_cached(registry):
+    registry.client.failing.add("20250102")
+    assert asyncio.run(registry.load("price", "20250102", "stk")).status == "error"
+    assert registry.negative_cache.get("20250102", "stk") is None
+
+    registry.client.failing.clear()
+    assert asyncio.run(registry.load("price", "20250102", "stk")).ok
+
+
+def test_empty_days_are_negative_cached(registry):
+    registry.client.empty.add("20250101")
+    result = asyncio.run(registry.load("price", "20250101", "stk"))
+    assert (result.status, result.error) == ("empty", "market holiday")
+
+    asyncio.run(registry.load("price", "20250101", "stk"))
+    assert registry.client.requests == 1
+
+
+def test_concurrent_loads_share_one_fetch(registry):
+    """Loads racing through the store read off the event loop must still share a single fetch"""
+    async def run():
+        return await asyncio.gather(*(registry.load("price", "20250102", "stk") for _ in range(5)))
+
+    assert all(result.ok for result in asyncio.run(run()))
+    assert registry.client.requests == 1
+
+
+def test_stored_days_are_loaded_off_the_event_loop(registry, monkeypatch):
+    asyncio.run(registry.load("price", "20250102", "stk"))
+    threads = []
+    load = registry.store.load
+    monkeypatch.setattr(registry.store, "load", lambda *key: threads.append(threading.get_ident()) or load(*key))
+
+    async def run():
+        registry._days.clear()
+        return await registry.load("price", "20250102", "stk"), threading.get_ident()
+
+    result, loop_thread = asyncio.run(run())
+    assert result.ok and threads and loop_thread not in threads
+
+
+@pytest.fixture
+def slow_registry(tmp_path):
+    return KrxMarketDataRegistry(SlowKrxClient(), KrxMarketStore(root=str(tmp_path / "store")), KrxNegativeCache())
+
+
+def test_cancelling_one_waiter_keeps_the_fetch(slow_registry):
+    registry = slow_registry
+
+    async def run():
+        first = asyncio.create_task(registry.load("price", "20250102", "stk"))
+        await registry.client.started.wait()
+        second = asyncio.create_task(registry.load("price", "20250102", "stk"))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()).ok
+    assert registry.client.cancelled == 0 and registry.cancelled_fetches == 0
+    assert registry.stats()["running_fetches"] == 0 and registry.store.has("price", "20250102", "stk")
+
+
+def test_cancelling_the_last_waiter_cancels_the_fetch(slow_registry):
+    registry = slow_registry
+
+    async def run():
+        task = asyncio.create_task(registry.load("price", "20250102", "stk"))
+        await registry.client.started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The cancelled fetch is forgotten at once
+        assert registry.stats()["running_fetches"] == 0
+        await asyncio.sleep(0)
+        assert registry.client.cancelled == 1 and registry.cancelled_fetches == 1
+        return await registry.load("price", "20250102", "stk")
+
+    # A later load starts a new fetch
+    assert asyncio.run(run()).ok and len(registry.client.contexts) == 2
+
+
+def test_shared_fetch_runs_outside_the_requester_context(slow_registry):
+    """The fetch must neither see nor extend the context or the trace of the request which started it"""
+    registry = slow_registry
+    exporter = _Exporter()
+    registry.tracer = KrxTracer(sample_rate=1.0, exporter=exporter)
+
+    async def run():
+        REQUEST_ID.set("first")
+        with registry.tracer.trace("get_stock_price_by_date") as root:
+            result = await registry.load("price", "20250102", "stk")
+        return result, root.trace_id
+
+    result, request_trace = asyncio.run(run())
+    registry.tracer.flush()
+    assert result.ok
+    assert registry.client.contexts[0]["request_id"] is None
+    fetch_span = registry.client.contexts[0]["span"]
+    assert fetch_span is not None and fetch_span.trace_id != request_trace
+
+    spans = {(span["trace_id"], span["name"]): span for span in exporter.spans}
+    wait = spans[(request_trace, "registry.wait")]
+    assert wait["attributes"]["fetch_trace_id"] == fetch_span.trace_id
+    assert (fetch_span.trace_id, "krx.fetch") in spans and (request_trace, "krx.fetch") not in spans
+
+
+def test_workers_share_mapped_market_days(tmp_path):
+    """A market-day fetched by one worker is mapped by the others from the same file, never parsed per worker"""
+    def worker():
+        return KrxMarketDataRegistry(
+            ScriptedKrxClient(), KrxMarketStore(root=str(tmp_path / "store")), KrxNegativeCache(), shared=True
+        )
+
+    first, second = worker(), worker()
+    fetched = asyncio.run(first.load("price", "20250102", "stk"))
+    mapped = asyncio.run(second.load("price", "20250102", "stk"))
+    assert fetched.ok and mapped.ok and second.client.requests == 0
+    assert isinstance(first._days[("price", "20250102", "stk")], SharedMarketDay)
+    assert isinstance(second._days[("price", "20250102", "stk")], SharedMarketDay)
+    assert dict(fetched.records) == dict(mapped.records)
+
+
+def test_tools_answer_from_shared_market_days(make_server):
+    server = make_server("--shared_market_days")
+    price = json.loads(asyncio.run(server.get_stock_price(None, "005930", "코스피", date="20250102")))
+    info = json.loads(asyncio.run(server.get_stock_info(None, "005930", "코스피", date="20250102")))
+    group = {"SECUGRP_NM": [info["secugrp_nm"]]}
+    found = json.loads(asyncio.run(server.search_stocks(group, {}, market="코스피", date="20250102")))
+    assert price["bas_dd"] == "20250102" and info["isu_srt_cd"] == "005930"
+    assert found["total"] > 0 and all(row["secugrp_nm"] == info["secugrp_nm"] for row in found["stocks"].values())
+
+
+def test_new_open_date_warms_each_cache_from_its_own_endpoint(make_server, monkeypatch):
+    """The price cache is filled with price payloads, and each market-day is downloaded once"""
+    monkeypatch.setattr("src.server.get_latest_open_date", lambda: "20250110")
+    server = make_server()
+    server._indicators = None
+
+    asyncio.run(server.on_new_open_date())
+    assert server.client.requests == 2 * len(server.market_code)
+    for market in server.market_code:
+        key = ("20250110", market)
+        info, price = server.si_cache.latest[key], server.sp_cache.latest[key]
+        assert info is not price and set(info) == set(price)
+        ticker = next(iter(price))
+        assert "TDD_CLSPRC" in price[ticker] and "TDD_CLSPRC" not in info[ticker]
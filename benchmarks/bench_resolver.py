@@ -0,0 +1,45 @@
+import pytest
+from src.resolver import KrxStockInfoResolver
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return KrxStockInfoResolver()
+
+
+@pytest.mark.parametrize("stock, market", [
+    ("삼성전자", "코스피"),
+    ("삼성전자", "알수없음"),
+    ("삼성전지", "알수없음"),
+    ("삼성전자우", "알수없음"),
+    ("NH프라임리츠보통주", "알수없음"),
+    ("Samsung Electronics", "알수없음"),
+    ("KR7005930003", "알수없음"),
+    ("맥쿼리한국인프라", "알수없음"),
+    ("Samsng Electronic", "알수없음"),
+    ("존재하지않는종목명", "알수없음"),
+], ids=[
+    "exact-market", "exact-unknown-market", "typo", "preferred", "full-name",
+    "english-name", "isin", "prefix", "english-typo", "unknown",
+])
+def test_resolve_stock(benchmark, resolver, stock, market):
+    ticker, market_code = benchmark(resolver.resolve_stock, stock, market)
+    if stock in ("삼성전자", "Samsung Electronics", "KR7005930003", "Samsng Electronic"):
+        assert (ticker, market_code) == ("005930", "stk")
+    if stock == "NH프라임리츠보통주":
+        assert ticker == "338100"
+
+
+@pytest.mark.parametrize("ticker, market", [
+    ("005930", "코스피"),
+    ("005930", "알수없음"),
+    ("KR8392070007", "알수없음"),
+    ("999999", "알수없음"),
+], ids=["known-market", "unknown-market", "isin", "missing"])
+def test_resolve_ticker(benchmark, resolver, ticker, market):
+    benchmark(resolver.resolve_ticker, ticker, market)
+
+
+def test_resolve_isin_not_sliced(resolver):
+    # The short code of this ISIN is not its 4th to 9th characters
+    assert resolver.resolve_code("KR8392070007") == ("950110", "ksq")
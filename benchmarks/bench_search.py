@@ -0,0 +1,51 @@
+"""
+Attribute search over an info market-day: secondary indexes against a scan of every record.
+"""
+import asyncio
+import pytest
+from src.cache import KrxInfoIndex, as_market_day
+from benchmarks.payloads import ReplayKrxClient
+
+QUERIES = {
+    "reits": ({"SECUGRP_NM": ["부동산투자회사"]}, {}),
+    "preferred": ({"KIND_STKCERT_TP_NM": ["종류주권"]}, {}),
+    "listed-after-2020": ({}, {"LIST_DD": ("20200101", None)}),
+    "reits-listed-after-2020": ({"SECUGRP_NM": ["부동산투자회사"]}, {"LIST_DD": ("20200101", None)}),
+}
+
+
+@pytest.fixture(scope="module")
+def day():
+    result = asyncio.run(ReplayKrxClient().fetch_stock_info("20250102", "stk"))
+    return as_market_day(result.records)
+
+
+def _scan(day, equals, ranges):
+    matched = []
+    for ticker, entry in day.items():
+        if any(entry.get(field) not in values for field, values in equals.items()):
+            continue
+        if any(
+            (low is not None and entry.get(field, "") < low) or (high is not None and entry.get(field, "") > high)
+            for field, (low, high) in ranges.items()
+        ):
+            continue
+        matched.append(ticker)
+    return sorted(matched)
+
+
+def test_build_index(benchmark, day):
+    benchmark(KrxInfoIndex, day)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_index(benchmark, day, query):
+    index = KrxInfoIndex(day)
+    tickers = benchmark(index.search, *QUERIES[query])
+    assert tickers == _scan(day, *QUERIES[query])
+    benchmark.extra_info["matched"] = len(tickers)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_scan(benchmark, day, query):
+    benchmark(_scan, day, *QUERIES[query])
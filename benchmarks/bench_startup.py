@@ -0,0 +1,59 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import subprocess
+from fastmcp import Client
+from fastmcp.client.transports import StdioTransport
+from benchmarks.conftest import ROOT
+
+STARTUP_SCRIPT = """
+import json, time, resource
+start = time.perf_counter()
+from main import parse_args
+from src.server import KrxStockServer
+server = KrxStockServer(parse_args(["--store_dir", {store!r}]))
+server.register_mcp_primitives()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+
+def _start_server(store: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT.format(store=store)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_server_startup(benchmark, tmp_path):
+    """Time and peak RSS of importing and building KrxStockServer in a fresh interpreter"""
+    samples = []
+    benchmark.pedantic(lambda: samples.append(_start_server(str(tmp_path / "store"))), rounds=5)
+    benchmark.extra_info["init_seconds"] = min(sample["seconds"] for sample in samples)
+    benchmark.extra_info["maxrss_kb"] = max(sample["maxrss_kb"] for sample in samples)
+
+
+async def _first_list_tools(store: str) -> float:
+    transport = StdioTransport(
+        command=sys.executable,
+        args=["main.py", "--store_dir", store],
+        env=dict(os.environ),
+        cwd=str(ROOT),
+        keep_alive=False
+    )
+    started = time.perf_counter()
+    async with Client(transport) as client:
+        tools = await client.list_tools()
+        elapsed = time.perf_counter() - started
+    assert tools
+    return elapsed
+
+
+def test_time_to_first_list_tools(benchmark, tmp_path):
+    """Seconds from launching the stdio server process until the first 'list_tools' response"""
+    samples = []
+    benchmark.pedantic(lambda: samples.append(asyncio.run(_first_list_tools(str(tmp_path / "store")))), rounds=5)
+    benchmark.extra_info["best_seconds"] = min(samples)
@@ -0,0 +1,112 @@
+import random
+import tracemalloc
+import asyncio
+import itertools
+import pytest
+from src.store import KrxMarketStore
+from benchmarks.payloads import ReplayKrxClient
+
+DAYS = 60
+INTERVALS = {"full": 1, "delta": 20}
+
+
+@pytest.fixture(scope="module")
+def history():
+    """Info market-days with the day-over-day churn of real listings: share counts, new and delisted tickers"""
+    result = asyncio.run(ReplayKrxClient().fetch_stock_info("20250102", "stk"))
+    entries = dict(result.records)
+    rng = random.Random(0)
+    days = []
+    for offset in range(DAYS):
+        tickers = list(entries)
+        for ticker in rng.sample(tickers, len(tickers) // 100):
+            entries[ticker] = {**entries[ticker], "LIST_SHRS": str(rng.randint(10**6, 10**9))}
+        if offset % 5 == 0:
+            del entries[rng.choice(tickers)]
+            listed = dict(entries[tickers[0]])
+            listed["ISU_SRT_CD"] = f"9{offset:05d}"
+            entries[listed["ISU_SRT_CD"]] = listed
+        days.append((f"2025{offset // 28 + 1:02d}{offset % 28 + 1:02d}", dict(entries)))
+    return days
+
+
+def _disk_bytes(store: KrxMarketStore) -> int:
+    return sum(path.stat().st_size for path in (store.root / "info" / "stk").glob("*.json"))
+
+
+@pytest.mark.parametrize("layout", INTERVALS)
+def test_save_history(benchmark, tmp_path, history, layout):
+    """Save every day of the history into an empty store"""
+    counter = itertools.count()
+
+    def setup():
+        return (KrxMarketStore(tmp_path / str(next(counter)), snapshot_interval=INTERVALS[layout]),), {}
+
+    def save(store):
+        for date, entries in history:
+            store.save("info", date, "stk", entries)
+        return store
+
+    store = benchmark.pedantic(save, setup=setup, rounds=3)
+    benchmark.extra_info["disk_bytes"] = _disk_bytes(store)
+
+
+@pytest.mark.parametrize("layout", INTERVALS)
+def test_load_day(benchmark, tmp_path, history, layout):
+    """Reconstruct the day at the end of the longest delta chain"""
+    store = KrxMarketStore(tmp_path, snapshot_interval=INTERVALS[layout])
+    for date, entries in history:
+        store.save("info", date, "stk", entries)
+
+    date, entries = history[INTERVALS["delta"] - 2]
+    assert benchmark(store.load, "info", date, "stk") == entries
+    benchmark.extra_info["disk_bytes"] = _disk_bytes(store)
+
+
+def _heap_bytes(load) -> int:
+    """Python heap held by the value 'load' returns"""
+    tracemalloc.start()
+    try:
+        value = load()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del value
+    return current
+
+
+@pytest.mark.parametrize("layout", ["parsed", "shared"])
+def test_worker_heap_per_day(benchmark, tmp_path, history, layout):
+    """Heap a worker holds for a cached info market-day: parsed records, or the ticker index of the mapped file"""
+    store = KrxMarketStore(tmp_path)
+    date, entries = history[0]
+    store.save("info", date, "stk", entries)
+    load = store.load_shared if layout == "shared" else store.load
+
+    assert dict(load("info", date, "stk")) == entries
+    benchmark.extra_info["heap_bytes"] = _heap_bytes(lambda: load("info", date, "stk"))
+    benchmark(lambda: load("info", date, "stk")["005930"])
+
+
+def test_shared_days_are_materialized_once(tmp_path, history, monkeypatch):
+    date, entries = history[DAYS // 2]
+    for day, day_entries in history[:DAYS // 2 + 1]:
+        KrxMarketStore(tmp_path).save("info", day, "stk", day_entries)
+
+    store = KrxMarketStore(tmp_path)
+    first = store.load_shared("info", date, "stk")
+    # Another worker maps the file as is, without rebuilding the delta chain
+    worker = KrxMarketStore(tmp_path)
+    monkeypatch.setattr(worker, "_reconstruct", lambda *key: pytest.fail("rebuilt a shared market-day"))
+    second = worker.load_shared("info", date, "stk")
+    assert dict(first) == dict(second) == entries
+    assert _heap_bytes(lambda: worker.load_shared("info", date, "stk")) * 5 < _heap_bytes(lambda: store.load("info", date, "stk"))
+
+
+def test_rewritten_days_are_not_served_from_stale_shared_files(tmp_path):
+    store = KrxMarketStore(tmp_path)
+    store.save("price", "20250102", "stk", {"005930": {"TDD_CLSPRC": "1"}})
+    assert store.load_shared("price", "20250102", "stk")["005930"] == {"TDD_CLSPRC": "1"}
+    store.save("price", "20250102", "stk", {"005930": {"TDD_CLSPRC": "2"}})
+    assert store.load_shared("price", "20250102", "stk")["005930"] == {"TDD_CLSPRC": "2"}
+    assert store.load_shared("price", "20250103", "stk") is None
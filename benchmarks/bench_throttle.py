@@ -0,0 +1,51 @@
+import time
+import asyncio
+import threading
+from src.throttle import TokenBucket, SharedTokenBucket
+from src.workers import worker_args
+
+RATE = 20.0
+REQUESTS = 10
+
+
+def _acquire_from_threads(buckets) -> float:
+    """Seconds taken by REQUESTS acquisitions spread over the buckets, one thread per bucket"""
+    def acquire(bucket):
+        for _ in range(REQUESTS // len(buckets)):
+            bucket.acquire_sync()
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=acquire, args=(bucket,)) for bucket in buckets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.monotonic() - started
+
+
+def test_processes_share_one_rate_limit(tmp_path):
+    """Buckets of one file (each with its own file descriptor, as in separate processes) share the rate"""
+    path = str(tmp_path / "rate_limit")
+    shared = [SharedTokenBucket(path, rate=RATE, capacity=1) for _ in range(2)]
+    assert _acquire_from_threads(shared) >= (REQUESTS - 1) / RATE * 0.95
+
+    # Separate buckets would each allow the whole rate
+    assert _acquire_from_threads([TokenBucket(rate=RATE, capacity=1) for _ in range(2)]) < (REQUESTS - 1) / RATE * 0.75
+
+
+def test_worker_args_split_the_cold_fetch_limits(make_args):
+    args = worker_args(make_args("--workers", "3", "--cold_fetch_limit", "8", "--cold_queue_size", "32"))
+    assert (args.cold_fetch_limit, args.cold_queue_size, args.krx_rate_limit) == (2, 10, 5.0)
+    assert worker_args(make_args("--workers", "8", "--cold_fetch_limit", "4")).cold_fetch_limit == 1
+
+
+def test_shared_bucket_on_the_event_loop(tmp_path):
+    bucket = SharedTokenBucket(str(tmp_path / "rate_limit"), rate=RATE, capacity=1)
+
+    async def acquire():
+        for _ in range(REQUESTS):
+            await bucket.acquire()
+
+    started = time.monotonic()
+    asyncio.run(acquire())
+    assert time.monotonic() - started >= (REQUESTS - 1) / RATE * 0.95
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from fastmcp import Client
+
+REQUEST = {"request": {"stock": "삼성전자", "market": "알수없음", "date": "20250102"}}
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_get_stock_price_cold(benchmark, loop, make_server):
+    """Every round starts from an empty cache and store"""
+    async def call(server):
+        async with Client(server.mcp) as client:
+            return await client.call_tool("get_stock_price_by_date", REQUEST)
+
+    def setup():
+        return (make_server(),), {}
+
+    result = benchmark.pedantic(lambda server: loop.run_until_complete(call(server)), setup=setup, rounds=20)
+    assert "005930" in result.content[0].text
+
+
+def test_get_stock_price_warm(benchmark, loop, make_server):
+    """The market-day is already cached"""
+    # Prefetching the adjacent days would add KRX requests in the background
+    server = make_server("--prefetch_threshold", "0")
+    client = Client(server.mcp)
+    loop.run_until_complete(client.__aenter__())
+    try:
+        call = lambda: loop.run_until_complete(client.call_tool("get_stock_price_by_date", REQUEST))
+        call()
+        requests = server.client.requests
+        result = benchmark(call)
+        assert server.client.requests == requests
+        assert "005930" in result.content[0].text
+    finally:
+        loop.run_until_complete(client.__aexit__(None, None, None))
@@ -0,0 +1,35 @@
+"""
+Overhead of per-request tracing on a warm tool call: tracing off, and every request sampled.
+"""
+import asyncio
+import pytest
+from fastmcp import Client
+
+REQUEST = {"request": {"ticker": "005930", "market": "코스피", "date": "20250102"}}
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.mark.parametrize("sample_rate", ["0", "1"], ids=["off", "sampled"])
+def test_get_stock_price_warm_traced(benchmark, loop, tmp_path, make_server, sample_rate):
+    server = make_server(
+        "--prefetch_threshold", "0",
+        "--trace_sample_rate", sample_rate,
+        "--trace_file", str(tmp_path / "spans.jsonl"),
+    )
+    client = Client(server.mcp)
+    loop.run_until_complete(client.__aenter__())
+    try:
+        call = lambda: loop.run_until_complete(client.call_tool("get_stock_price_by_date", REQUEST))
+        call()
+        result = benchmark(call)
+        assert "005930" in result.content[0].text
+        server.tracer.flush()
+        benchmark.extra_info.update(server.tracer.stats())
+    finally:
+        loop.run_until_complete(client.__aexit__(None, None, None))
@@ -0,0 +1,47 @@
+import os
+import sys
+import logging
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+# The resolvers open 'data/*.json' relative to the working directory
+os.chdir(ROOT)
+
+from main import parse_args
+from benchmarks.payloads import ReplayKrxClient
+
+
+@pytest.fixture(autouse=True, scope="session")
+def quiet_logging():
+    """Per-hit INFO logs would dominate the measured hot paths"""
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+@pytest.fixture
+def make_args(tmp_path):
+    """Build server arguments from the CLI defaults"""
+    def _make_args(*argv: str):
+        return parse_args(["--store_dir", str(tmp_path / "store"), *argv])
+    return _make_args
+
+
+@pytest.fixture
+def make_server(make_args):
+    """Build a KrxStockServer answering from replayed KRX payloads"""
+    from src.server import KrxStockServer
+
+    servers = []
+
+    def _make_server(*argv: str):
+        server = KrxStockServer(make_args(*argv))
+        server.client = server.registry.client = ReplayKrxClient()
+        server.register_mcp_primitives()
+        servers.append(server)
+        return server
+
+    yield _make_server
+    for server in servers:
+        server.executor.shutdown()
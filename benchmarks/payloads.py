@@ -0,0 +1,128 @@
+"""
+KRX API payloads used by the benchmarks.
+
+Recorded responses are read from 'benchmarks/payloads/{endpoint}_{market}_{date}.json'
+when present. Otherwise a response of the same shape is synthesized from the bundled
+'data/*.json' files, so the benchmarks never touch the network.
+"""
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Set, Any
+from src.krx_client import KrxStockClient, KrxApiError
+from src.stream_decoder import OutBlockStreamDecoder
+
+ROOT = Path(__file__).resolve().parent.parent
+RECORDED_DIR = Path(__file__).resolve().parent / "payloads"
+
+MARKET_FILES = {"stk": "kospi", "ksq": "kosdaq", "knx": "konex"}
+MARKET_NAMES = {"stk": "KOSPI", "ksq": "KOSDAQ", "knx": "KONEX"}
+
+
+def _load_data(kind: str, market: str) -> Dict[str, Any]:
+    path = ROOT / "data" / f"stock_{kind}_{MARKET_FILES[market]}.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _info_records(date: str, market: str) -> List[Dict[str, str]]:
+    records = []
+    for info in _load_data("info", market).values():
+        rng = random.Random(f"info{info['short_code']}")
+        records.append({
+            "ISU_CD": info["standard_code"],
+            "ISU_SRT_CD": info["short_code"],
+            "ISU_NM": info["name_kor"],
+            "ISU_ABBRV": info["name_abbr"],
+            "ISU_ENG_NM": info["name_eng"],
+            "LIST_DD": f"{rng.randint(1990, 2024)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+            "MKT_TP_NM": MARKET_NAMES[market],
+            "SECUGRP_NM": rng.choice(["주권", "부동산투자회사", "외국주권"]),
+            "SECT_TP_NM": rng.choice(["-", "중견기업부", "벤처기업부", "우량기업부"]),
+            "KIND_STKCERT_TP_NM": "종류주권" if info["name_abbr"].endswith("우") else "보통주",
+            "PARVAL": rng.choice(["100", "500", "1000", "5000"]),
+            "LIST_SHRS": str(rng.randint(10**6, 10**9)),
+        })
+    return records
+
+
+def _price_records(date: str, market: str) -> List[Dict[str, str]]:
+    records = []
+    for name, ticker in _load_data("price", market).items():
+        rng = random.Random(f"price{ticker}{date}")
+        close = rng.randint(1000, 300000)
+        change = rng.randint(-close // 10, close // 10)
+        volume = rng.randint(0, 10**7)
+        shares = rng.randint(10**6, 10**9)
+        records.append({
+            "BAS_DD": date,
+            "ISU_CD": ticker,
+            "ISU_NM": name,
+            "MKT_NM": MARKET_NAMES[market],
+            "SECT_TP_NM": "-",
+            "TDD_CLSPRC": str(close),
+            "CMPPREVDD_PRC": str(change),
+            "FLUC_RT": f"{change / max(close - change, 1) * 100:.2f}",
+            "TDD_OPNPRC": str(close - change),
+            "TDD_HGPRC": str(close + abs(change)),
+            "TDD_LWPRC": str(close - abs(change)),
+            "ACC_TRDVOL": str(volume),
+            "ACC_TRDVAL": str(volume * close),
+            "MKTCAP": str(shares * close),
+            "LIST_SHRS": str(shares),
+        })
+    return records
+
+
+def load_payload(endpoint: str, date: str, market: str) -> bytes:
+    """Return the raw response body of a market-day"""
+    recorded = RECORDED_DIR / f"{endpoint}_{market}_{date}.json"
+    if recorded.exists():
+        return recorded.read_bytes()
+
+    records = _info_records(date, market) if endpoint == "info" else _price_records(date, market)
+    return json.dumps({"OutBlock_1": records}, ensure_ascii=False).encode("utf-8")
+
+
+class ReplayKrxClient(KrxStockClient):
+    """KRX client answering from recorded or synthesized payloads instead of the network"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests: int = 0
+        self._payloads: Dict[str, bytes] = {}
+
+    async def make_request(self, url: str, key: str) -> Dict[str, Dict[str, Any]]:
+        return self.make_request_sync(url, key)
+
+    def make_request_sync(self, url: str, key: str) -> Dict[str, Dict[str, Any]]:
+        self.requests += 1
+        if url not in self._payloads:
+            path, query = url.rsplit("/", 1)[1].split("?")
+            market, api = path.split("_", 1)
+            endpoint = "info" if api == "isu_base_info" else "price"
+            self._payloads[url] = load_payload(endpoint, query.split("=")[1], market)
+
+        decoder = OutBlockStreamDecoder(key)
+        body = self._payloads[url]
+        for start in range(0, len(body), self.chunk_size):
+            decoder.feed(body[start:start + self.chunk_size])
+        return decoder.close()
+
+
+class ScriptedKrxClient(ReplayKrxClient):
+    """Replayed payloads, except for the market-days answered with an empty block or an error"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.empty: Set[str] = set()
+        self.failing: Set[str] = set()
+
+    def make_request_sync(self, url: str, key: str) -> Dict[str, Dict[str, Any]]:
+        date = url.rsplit("=", 1)[1]
+        if date in self.failing:
+            self.requests += 1
+            raise KrxApiError("Failed to decode the response")
+        if date in self.empty:
+            self.requests += 1
+            return {}
+        return super().make_request_sync(url, key)
@@ -0,0 +1,83 @@
+import argparse
+from datetime import datetime
+from typing import Optional, List
+from src.store import KrxMarketStore
+from src.cache import KrxNegativeCache
+from src.export import KrxArrowExporter
+from src.utils import get_latest_open_date, LOGGER
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description="Arrow/Parquet Export for KRX-Stock MCP Server")
+
+    parser.add_argument(
+        "--start",
+        type=str,
+        required=True,
+        help="내보낼 기간의 시작 날짜 (YYYYMMDD)"
+    )
+    parser.add_argument(
+        "--end",
+        type=str,
+        default=None,
+        help="내보낼 기간의 마지막 날짜 (YYYYMMDD). 주어지지 않을 경우 최근 개장일"
+    )
+    parser.add_argument(
+        "--market",
+        type=str,
+        choices=["stk", "ksq", "knx"],
+        required=True,
+        help="내보낼 주식 시장 (stk/ksq/knx)"
+    )
+    parser.add_argument(
+        "--endpoint",
+        type=str,
+        choices=["info", "price"],
+        required=True,
+        help="내보낼 데이터 종류 (info: 종목 기본 정보, price: 주가 정보)"
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["arrow", "parquet"],
+        default="arrow",
+        help="파일 형식 (arrow: 메모리 맵으로 바로 읽을 수 있는 Arrow IPC, parquet: 압축된 Parquet)"
+    )
+    parser.add_argument(
+        "--store_dir",
+        type=str,
+        default="./store",
+        help="시장 데이터를 저장하는 로컬 저장소 경로"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="출력 파일 경로 (기본값: ./exports/<endpoint>_<market>_<start>_<end>.<format>)"
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(args):
+    end = args.end or get_latest_open_date()
+    for date in (args.start, end):
+        datetime.strptime(date, "%Y%m%d")
+
+    # Only stored market-days are exported; run backfill.py first to fill the range
+    store = KrxMarketStore(root=args.store_dir)
+    negative_cache = KrxNegativeCache()
+    exporter = KrxArrowExporter(
+        loader = store.load,
+        skip = lambda date, market: negative_cache.get(date, market) is not None
+    )
+    output = args.output or f"./exports/{exporter.file_name(args.endpoint, args.market, args.start, end, args.format)}"
+    result = exporter.export(args.endpoint, args.market, args.start, end, output, args.format)
+    if result["missing_dates"]:
+        LOGGER.warning(f"[Export] {len(result['missing_dates'])} market-days are not stored: {result['missing_dates']}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args)
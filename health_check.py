@@ -1,8 +1,10 @@
 import sys
 import json
+import time
 import asyncio
 import argparse
-from typing import List, Dict
+from bisect import bisect_left
+from typing import Optional, List, Dict, Tuple, Any
 from urllib.parse import urlunparse
 from src.schemas.schema import ToolRequestModel
 from src.utils import LOGGER
@@ -10,10 +12,10 @@ from src.utils import LOGGER
 from fastmcp import Client
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
 
     parser = argparse.ArgumentParser(description="Health Checker for KRX-Stock MCP Server")
-    
+
     parser.add_argument(
         "--server_name",
         type=str,
@@ -38,23 +40,116 @@ def parse_args() -> argparse.Namespace:
         default="/",
         help="MCP 서버의 경로"
     )
-    
-    return parser.parse_args()
+    parser.add_argument(
+        "--entries",
+        type=str,
+        default="health_check_entries.json",
+        help="도구별 요청 목록 파일. 요청마다 'expected' 로 응답에 기대하는 항목 값(예: {\"isu_srt_cd\": \"338100\"})을 지정할 수 있음"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="동시에 보낼 최대 요청 수"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="초당 보낼 요청 수. 0 이면 제한 없음"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="요청 목록 전체를 반복해서 보낼 횟수"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="요청 하나의 제한 시간 (초)"
+    )
+    parser.add_argument(
+        "--slo_p95_ms",
+        type=float,
+        default=2000.0,
+        help="도구별 p95 응답 시간 기준 (ms). 넘으면 종료 코드 1"
+    )
+    parser.add_argument(
+        "--slo_p99_ms",
+        type=float,
+        default=5000.0,
+        help="도구별 p99 응답 시간 기준 (ms). 넘으면 종료 코드 1"
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="결과 보고서를 저장할 JSON 파일 경로"
+    )
+
+    return parser.parse_args(argv)
+
+
+class LatencyHistogram:
+    """Latencies of a tool in fixed millisecond buckets. Percentiles are exact over the raw samples."""
+    buckets: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+
+    def record(self, latency_ms: float) -> None:
+        self.samples.append(latency_ms)
+        self.counts[bisect_left(self.buckets, latency_ms)] += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(int(-(-q * len(ordered) // 100)), 1)
+        return ordered[rank - 1]
+
+    def summary(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            "count": len(self.samples),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": max(self.samples) if self.samples else None,
+            "histogram": {label: count for label, count in zip(labels, self.counts) if count},
+        }
 
 
 class KrxStockHealthChecker:
+    """
+    Synthetic prober of a running server.
+    Entries are sent concurrently at a fixed rate, each response is checked against the expected
+    field values of its entry, and per-tool latencies are checked against the p95/p99 SLOs.
+    """
 
     def __init__(self, args):
         server_url = urlunparse((
             "http",
             f"{args.ip}:{args.port}",
-            "",
+            args.path,
             "",
             "",
             ""
         ))
         self.client = Client(server_url)
         self.tools = []
+        self.concurrency = args.concurrency
+        self.rate = args.rate
+        self.timeout = args.timeout
+        self.slo = {"p95_ms": args.slo_p95_ms, "p99_ms": args.slo_p99_ms}
+
+        self.latencies: Dict[str, LatencyHistogram] = {}
+        self.failures: Dict[str, List[Dict[str, Any]]] = {}
+        self.elapsed: float = 0.0
 
 
     async def initialize(self):
@@ -63,49 +158,183 @@ class KrxStockHealthChecker:
         LOGGER.info(f"[Health Checker] Available tools: {[t.name for t in self.tools]}")
 
 
-    async def run_tool_check(self, tool_name: str, entries: List[Dict[str, str]]) -> bool:
-        """"""
-        if not any(tool.name == tool_name for tool in self.tools):
-            LOGGER.error(f"[Health Checker] '{tool_name}' does not exist")
+    async def server_stats(self) -> Optional[Dict[str, Any]]:
+        """Cache and queue metrics of the server (of the worker serving the read on multi-worker servers)"""
+        try:
+            contents = await self.client.read_resource("krx://stats")
+            return json.loads(contents[0].text)
+        except Exception as e:
+            LOGGER.warning(f"[Health Checker] Failed to read the server stats: {e!r}")
+            return None
+
+
+    def _fail(self, tool_name: str, entry: Dict[str, Any], reason: str) -> None:
+        self.failures.setdefault(tool_name, []).append({"entry": entry, "reason": reason})
+        LOGGER.error(f"[Health Checker] Health check failed: {tool_name}, entry={entry}, reason={reason}")
+
+
+    @staticmethod
+    def _mismatches(output: Dict[str, Any], expected: Dict[str, Any]) -> List[str]:
+        return [
+            f"{field}={output.get(field)!r} (expected {value!r})"
+            for field, value in expected.items()
+            if str(output.get(field)) != str(value)
+        ]
+
+
+    async def probe(self, tool_name: str, entry: Dict[str, Any]) -> bool:
+        """Call a tool with an entry and check the response"""
+        request = {key: value for key, value in entry.items() if key != "expected"}
+        try:
+            request = ToolRequestModel(**request).model_dump(exclude_none=True)
+        except ValueError as e:
+            self._fail(tool_name, entry, f"invalid entry: {e}")
+            return False
+
+        started = time.perf_counter()
+        try:
+            result = await self.client.call_tool(
+                tool_name, {"request": request}, timeout=self.timeout, raise_on_error=False
+            )
+        except Exception as e:
+            self._fail(tool_name, entry, repr(e))
             return False
+        self.latencies.setdefault(tool_name, LatencyHistogram()).record((time.perf_counter() - started) * 1000)
 
-        for entry in entries:
-            try:
-                entry_model = ToolRequestModel(
-                    stock = entry['stock'],
-                    ticker = entry['ticker'],
-                    makret = entry['market'],
-                    date = entry['date']
-                )
-                result = await self.client.call_tool(tool_name, {'request':entry_model})
-                if not result:
-                    LOGGER.error(f"[Health Checker] Health check failed: {tool_name}, entry={entry}")
-                    return False
-            except Exception as e:
-                LOGGER.exception(f"[Health Checker] Exception during health check: {entry}")
-                return False
-
-        LOGGER.info(f"[Health Checker] Health check passed for tool '{tool_name}'")
+        if result.is_error:
+            self._fail(tool_name, entry, result.content[0].text if result.content else "tool error")
+            return False
+        try:
+            output = json.loads(result.content[0].text)
+        except (IndexError, AttributeError, ValueError):
+            self._fail(tool_name, entry, "response is not a JSON object")
+            return False
+        if not output:
+            self._fail(tool_name, entry, "empty response")
+            return False
+        if "message" in output:
+            self._fail(tool_name, entry, f"{output['message']} ({output.get('reason')})")
+            return False
+
+        mismatches = self._mismatches(output, entry.get("expected", {}))
+        if mismatches:
+            self._fail(tool_name, entry, f"unexpected values: {', '.join(mismatches)}")
+            return False
         return True
 
 
-async def main(args):
+    async def run(self, jobs: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Send the jobs at 'rate' requests per second with at most 'concurrency' requests in flight"""
+        available = {tool.name for tool in self.tools}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.monotonic()
+
+        async def launch(index: int, tool_name: str, entry: Dict[str, Any]) -> None:
+            if self.rate:
+                await asyncio.sleep(max(started + index / self.rate - time.monotonic(), 0.0))
+            async with semaphore:
+                await self.probe(tool_name, entry)
+
+        for tool_name, entry in jobs:
+            if tool_name not in available:
+                self._fail(tool_name, entry, f"'{tool_name}' does not exist")
+        jobs = [(tool_name, entry) for tool_name, entry in jobs if tool_name in available]
+        await asyncio.gather(*(launch(index, *job) for index, job in enumerate(jobs)))
+        self.elapsed = time.monotonic() - started
+
+
+    def report(
+            self,
+            jobs: List[Tuple[str, Dict[str, Any]]],
+            before: Optional[Dict[str, Any]],
+            after: Optional[Dict[str, Any]]
+        ) -> Dict[str, Any]:
+        """Per-tool latency and failures, SLO violations and cache hits/misses during the run"""
+        requests: Dict[str, int] = {}
+        for tool_name, _ in jobs:
+            requests[tool_name] = requests.get(tool_name, 0) + 1
+
+        tools = {}
+        violations = []
+        for tool_name, count in requests.items():
+            summary = self.latencies.get(tool_name, LatencyHistogram()).summary()
+            for name, threshold in self.slo.items():
+                if summary[name] is not None and summary[name] > threshold:
+                    violations.append(f"{tool_name} {name}={summary[name]:.1f} > {threshold:.1f}")
+            tools[tool_name] = {
+                "requests": count,
+                "failures": len(self.failures.get(tool_name, [])),
+                **summary,
+            }
+
+        cache = {}
+        if before and after:
+            for name in ("info_cache", "price_cache"):
+                if name in before and name in after:
+                    cache[name] = {
+                        key: after[name][key] - before[name][key] for key in ("hits", "misses")
+                    }
+
+        return {
+            "elapsed_s": round(self.elapsed, 3),
+            "slo": self.slo,
+            "tools": tools,
+            "cache": cache,
+            "slo_violations": violations,
+            "failures": self.failures,
+            "passed": not violations and not self.failures,
+        }
+
+
+def log_report(report: Dict[str, Any]) -> None:
+    for tool_name, summary in report["tools"].items():
+        latency = " ".join(
+            f"{name}={summary[name]:.1f}ms" for name in ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+            if summary[name] is not None
+        )
+        LOGGER.info(
+            f"[Health Checker] {tool_name}: {summary['requests']} requests, "
+            f"{summary['failures']} failed | {latency} | {summary['histogram']}"
+        )
+    for name, counts in report["cache"].items():
+        LOGGER.info(f"[Health Checker] {name}: hits={counts['hits']}, misses={counts['misses']}")
+    for violation in report["slo_violations"]:
+        LOGGER.error(f"[Health Checker] SLO violated: {violation}")
+    LOGGER.info(f"[Health Checker] Health check {'passed' if report['passed'] else 'failed'}")
+
+
+async def main(args) -> int:
     checker = KrxStockHealthChecker(args)
     try:
-        with open("health_check_entries.json", "r", encoding="utf-8") as file:
+        with open(args.entries, "r", encoding="utf-8") as file:
             entries = json.load(file)
-    except RuntimeError as e:
+    except (OSError, ValueError) as e:
         LOGGER.exception(f"Failed to load health check entries: {str(e)}")
-        sys.exit(1)
-    
+        return 1
+
+    jobs = [
+        (tool_name, entry)
+        for _ in range(args.repeat)
+        for tool_name, tool_entries in entries.items()
+        for entry in tool_entries
+    ]
+
     async with checker.client:
-        LOGGER.info("[Health Checker] Client Connected")   
+        LOGGER.info("[Health Checker] Client Connected")
         await checker.initialize()
-        
-        for tool in checker.tools:
-            await checker.run_tool_check(tool.name, entries[tool.name])
+
+        before = await checker.server_stats()
+        await checker.run(jobs)
+        after = await checker.server_stats()
+
+    report = checker.report(jobs, before, after)
+    log_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    return 0 if report["passed"] else 1
 
 
 if __name__ == "__main__":
     args = parse_args()
-    asyncio.run(main(args))
\ No newline at end of file
+    sys.exit(asyncio.run(main(args)))
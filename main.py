@@ -1,12 +1,14 @@
 import asyncio
 import argparse
+from typing import Optional, List
 from src.server import KrxStockServer
+from src.workers import run_workers
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
 
     parser = argparse.ArgumentParser(description="KRX-Stock MCP Server")
     
@@ -52,13 +54,175 @@ def parse_args() -> argparse.Namespace:
         default=10,
         help="종목 주가 정보를 담는 캐시의 최대 사이즈"
     )
+    parser.add_argument(
+        "--cache_policy",
+        type=str,
+        choices=["lru", "slru", "tinylfu"],
+        default="tinylfu",
+        help="캐시 교체 정책 (lru: 최근 사용 순, slru: 두 번 이상 조회된 날짜를 보호, tinylfu: 조회 빈도가 더 높은 날짜만 캐시에 추가)"
+    )
+    parser.add_argument(
+        "--prefetch_threshold",
+        type=int,
+        default=0,
+        help="같은 날짜가 이 횟수만큼 조회되면 앞뒤 개장일 데이터를 미리 불러옴 (기본값 0: 사용하지 않음)"
+    )
+    parser.add_argument(
+        "--store_dir",
+        type=str,
+        default="./store",
+        help="시장 데이터를 저장하는 로컬 저장소 경로 (모든 워커가 공유)"
+    )
+    parser.add_argument(
+        "--store_snapshot_interval",
+        type=int,
+        default=20,
+        help="종목 기본 정보를 전체 스냅샷으로 저장하는 주기 (일). 그 사이의 날짜는 이전 날짜와의 차이만 저장"
+    )
+    parser.add_argument(
+        "--export_dir",
+        type=str,
+        default="./exports",
+        help="export_market_days 도구가 Arrow/Parquet 파일을 쓰는 경로"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="MCP 서버 워커 프로세스 수 (streamable-http 전용). 2 이상이면 --shared_market_days 를 항상 사용"
+    )
+    parser.add_argument(
+        "--shared_market_days",
+        action="store_true",
+        help="시장 데이터를 저장소의 메모리 맵 파일로 읽어 워커들이 하나의 사본을 공유 (종목 조회마다 해당 항목만 디코딩)"
+    )
+    parser.add_argument(
+        "--executor",
+        choices=["none", "thread", "process"],
+        default="thread",
+        help="종목명 매칭을 이벤트 루프 밖에서 실행할 방식 (none/thread/process)"
+    )
+    parser.add_argument(
+        "--executor_workers",
+        type=int,
+        default=4,
+        help="executor 의 최대 워커 수"
+    )
+    parser.add_argument(
+        "--executor_queue_size",
+        type=int,
+        default=64,
+        help="executor 에서 대기할 수 있는 최대 작업 수 (초과 시 요청 거절)"
+    )
+    parser.add_argument(
+        "--session_limit",
+        type=int,
+        default=4,
+        help="세션(stateless 방식에서는 클라이언트 주소)마다 동시에 진행할 수 있는 최대 KRX API 조회 수"
+    )
+    parser.add_argument(
+        "--cold_fetch_limit",
+        type=int,
+        default=4,
+        help="서버 전체에서 동시에 진행할 수 있는 최대 KRX API 조회 수. --workers 가 2 이상이면 워커 수로 나눠 워커마다 적용"
+    )
+    parser.add_argument(
+        "--cold_queue_size",
+        type=int,
+        default=32,
+        help="KRX API 조회를 기다릴 수 있는 최대 요청 수. 초과한 요청은 재시도 시간과 함께 즉시 거절. --workers 가 2 이상이면 워커 수로 나눔"
+    )
+    parser.add_argument(
+        "--cold_queue_timeout",
+        type=float,
+        default=5.0,
+        help="KRX API 조회를 기다리는 최대 시간 (초)"
+    )
+    parser.add_argument(
+        "--krx_rate_limit",
+        type=float,
+        default=5.0,
+        help="KRX API 에 보낼 수 있는 초당 최대 요청 수. 같은 --store_dir 을 쓰는 모든 워커와 backfill.py 가 함께 따름"
+    )
+    parser.add_argument(
+        "--krx_burst",
+        type=int,
+        default=5,
+        help="KRX API 에 한 번에 보낼 수 있는 최대 요청 수 (token bucket 크기)"
+    )
+    parser.add_argument(
+        "--krx_max_retries",
+        type=int,
+        default=3,
+        help="KRX API 요청 실패(타임아웃, 5xx) 시 최대 재시도 횟수"
+    )
+    parser.add_argument(
+        "--krx_timeout",
+        type=float,
+        default=5.0,
+        help="KRX API 요청 타임아웃 (초)"
+    )
+    parser.add_argument(
+        "--negative_cache_ttl",
+        type=float,
+        default=600.0,
+        help="최신 개장일의 빈 응답을 다시 조회하기 전까지 기다리는 시간 (초)"
+    )
+    parser.add_argument(
+        "--negative_cache_holiday_ttl",
+        type=float,
+        default=86400.0,
+        help="지난 날짜의 빈 응답(휴장일)을 다시 조회하기 전까지 기다리는 시간 (초)"
+    )
+    parser.add_argument(
+        "--trace_sample_rate",
+        type=float,
+        default=0.0,
+        help="단계별 소요 시간(trace span)을 기록할 요청의 비율 (0~1). 요청이 시작될 때 기록 여부를 정함"
+    )
+    parser.add_argument(
+        "--trace_export",
+        type=str,
+        choices=["file", "otlp"],
+        default="file",
+        help="trace span 을 내보낼 곳 (file: JSON lines 파일, otlp: OTLP/HTTP 수집기)"
+    )
+    parser.add_argument(
+        "--trace_file",
+        type=str,
+        default="./traces/spans.jsonl",
+        help="trace span 을 기록하는 파일 경로 (--trace_export file)"
+    )
+    parser.add_argument(
+        "--trace_otlp_endpoint",
+        type=str,
+        default="http://localhost:4318",
+        help="trace span 을 보낼 OTLP/HTTP 수집기 주소 (--trace_export otlp)"
+    )
+    parser.add_argument(
+        "--admin_token",
+        type=str,
+        default=None,
+        help="관리용 HTTP 경로(/admin/profile, /admin/tracing)의 Bearer 토큰. 주어지지 않으면 관리용 경로를 열지 않음"
+    )
+    parser.add_argument(
+        "--profile_dir",
+        type=str,
+        default="./profiles",
+        help="샘플링 프로파일러의 결과(collapsed stack)를 저장하는 경로"
+    )
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
     args = parse_args()
 
+    if args.workers < 1:
+        raise ValueError("The '--workers' must be larger than 0")
+    if args.workers > 1 and args.transport != "streamable-http":
+        raise ValueError("The '--workers' option is only supported with 'streamable-http' transport")
+
     kwargs = {
         "transport": args.transport,
     }
@@ -69,6 +233,9 @@ if __name__ == "__main__":
             path=args.path,
         )
 
-    server = KrxStockServer(args)
-    server.register_mcp_primitives()
-    asyncio.run(server.run_server(kwargs))
\ No newline at end of file
+    if args.workers > 1:
+        run_workers(args, kwargs)
+    else:
+        server = KrxStockServer(args)
+        server.register_mcp_primitives()
+        asyncio.run(server.run_server(kwargs))
\ No newline at end of file
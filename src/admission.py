@@ -0,0 +1,120 @@
+import time
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, AsyncIterator, Any
+from src.tracing import span
+from src.utils import LOGGER
+
+
+class AdmissionRejectedError(RuntimeError):
+    """Raised when a cold fetch is rejected to keep KRX API available to every client"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"{reason}. Please retry after {retry_after} seconds.")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class KrxAdmissionController:
+    """
+    Admission control of the requests which must fetch a market-day from KRX API (cold fetches).
+    A session runs at most 'session_limit' cold fetches at once, and the server at most 'cold_fetch_limit'.
+    Up to 'queue_size' further cold fetches wait at most 'queue_timeout' seconds for a slot,
+    and the others are rejected at once with a retry-after hint.
+    Cache hits never go through admission, so they are never queued behind cold fetches.
+    """
+    controller_name = "Admission"
+    smoothing = 0.2
+
+    def __init__(
+            self,
+            session_limit: int = 4,
+            cold_fetch_limit: int = 4,
+            queue_size: int = 32,
+            queue_timeout: float = 5.0
+        ) -> None:
+        if session_limit < 1 or cold_fetch_limit < 1:
+            raise ValueError(f"[{self.controller_name}] The concurrency limits must be larger than 0")
+        if queue_size < 0:
+            raise ValueError(f"[{self.controller_name}] The 'queue_size' must not be negative")
+
+        self.session_limit = session_limit
+        self.cold_fetch_limit = cold_fetch_limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(cold_fetch_limit)
+        self._sessions: Dict[str, int] = defaultdict(int)
+
+        self.in_flight: int = 0
+        self.waiting: int = 0
+        self.admitted: int = 0
+        self.rejected: Dict[str, int] = {"session_limit": 0, "queue_full": 0, "queue_timeout": 0}
+        self._wait_seconds: float = 0.0
+        self._fetch_seconds: float = 1.0
+
+    def retry_after(self) -> float:
+        """Seconds until the current backlog of cold fetches is expected to drain"""
+        backlog = (self.in_flight + self.waiting) / self.cold_fetch_limit
+        return round(max(1.0, self._fetch_seconds * backlog), 1)
+
+    def _reject(self, kind: str, reason: str) -> None:
+        self.rejected[kind] += 1
+        retry_after = self.retry_after()
+        LOGGER.warning(f"[{self.controller_name}] Rejected a cold fetch: {reason} (retry after {retry_after}s)")
+        raise AdmissionRejectedError(reason, retry_after)
+
+    def _smooth(self, average: float, sample: float) -> float:
+        return (1 - self.smoothing) * average + self.smoothing * sample
+
+    @asynccontextmanager
+    async def cold_fetch(self, session: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold a cold fetch slot for the session, waiting in the bounded queue if every slot is taken"""
+        if session is not None and self._sessions.get(session, 0) >= self.session_limit:
+            self._reject("session_limit", f"Too many concurrent cold fetches in this session (limit: {self.session_limit})")
+        if self._slots.locked() and self.waiting >= self.queue_size:
+            self._reject("queue_full", f"Too many cold fetches are queued (limit: {self.queue_size})")
+
+        if session is not None:
+            self._sessions[session] += 1
+        try:
+            started = time.monotonic()
+            self.waiting += 1
+            try:
+                with span("admission.wait"):
+                    await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._reject("queue_timeout", f"No cold fetch slot was freed within {self.queue_timeout} seconds")
+            finally:
+                self.waiting -= 1
+
+            admitted = time.monotonic()
+            self._wait_seconds = self._smooth(self._wait_seconds, admitted - started)
+            self.admitted += 1
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+                self._slots.release()
+                self._fetch_seconds = self._smooth(self._fetch_seconds, time.monotonic() - admitted)
+        finally:
+            if session is not None:
+                self._sessions[session] -= 1
+                if not self._sessions[session]:
+                    del self._sessions[session]
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue metrics of the cold fetches"""
+        return {
+            "session_limit": self.session_limit,
+            "cold_fetch_limit": self.cold_fetch_limit,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "active_sessions": len(self._sessions),
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "avg_wait_seconds": round(self._wait_seconds, 3),
+            "avg_fetch_seconds": round(self._fetch_seconds, 3),
+        }
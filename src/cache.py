@@ -1,22 +1,196 @@
+import time
+import bisect
 from abc import ABC
-from typing import Optional, Dict, Tuple
+from types import MappingProxyType
+from datetime import datetime
+from typing import Optional, Literal, Dict, List, Tuple, Mapping, Iterable, FrozenSet, Any
 from collections import OrderedDict
-from src.utils import LOGGER
+from src.utils import get_latest_open_date, LOGGER
+
+MarketDay = Mapping[str, dict]
+
+
+def as_market_day(entries: Mapping[str, dict]) -> MarketDay:
+    """Wrap a market-day into a read-only mapping without copying it"""
+    if isinstance(entries, MappingProxyType):
+        return entries
+    return MappingProxyType(entries)
+
+
+
+CacheKey = Tuple[str, str]
+
+
+class _AccessCounter:
+    """
+    Access frequency of each (date, market) key, including accesses that missed the cache.
+    Every count is halved once 'sample_size' accesses were recorded, so old popularity fades away.
+    """
+
+    def __init__(self, sample_size: int):
+        self.sample_size = sample_size
+        self._counts: Dict[CacheKey, int] = {}
+        self._additions: int = 0
+
+    def record(self, key: CacheKey) -> int:
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._age()
+        return count
+
+    def estimate(self, key: CacheKey) -> int:
+        return self._counts.get(key, 0)
+
+    def _age(self) -> None:
+        self._counts = {key: count // 2 for key, count in self._counts.items() if count > 1}
+        self._additions = 0
+
+
+class _LruPolicy:
+    """Evict the least recently used key"""
+
+    def __init__(self, max_size: int, counter: _AccessCounter):
+        self.max_size = max_size
+        self.counter = counter
+        self._order: OrderedDict[CacheKey, None] = OrderedDict()
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def hit(self, key: CacheKey) -> None:
+        self._order.move_to_end(key)
+
+    def insert(self, key: CacheKey, prefetched: bool = False) -> List[CacheKey]:
+        """
+        Insert a key as the most recently used one and return the evicted keys.
+        A prefetched key goes in as the least recently used one, so it is evicted first unless it is hit.
+        """
+        if prefetched and key in self._order:
+            return []
+        self._order[key] = None
+        self._order.move_to_end(key, last=not prefetched)
+        evicted = []
+        while len(self._order) > self.max_size:
+            victim = next(k for k in self._order if k != key)
+            del self._order[victim]
+            evicted.append(victim)
+        return evicted
+
+
+class _SlruPolicy:
+    """
+    Segmented LRU. New keys enter the probation segment and are promoted to the protected
+    segment on their next hit, so a scan of one-off keys only churns the probation segment.
+    """
+    probation_ratio = 0.2
+
+    def __init__(self, max_size: int, counter: _AccessCounter):
+        self.max_size = max_size
+        self.counter = counter
+        self.protected_size = max_size - max(1, round(max_size * self.probation_ratio))
+        self._probation: OrderedDict[CacheKey, None] = OrderedDict()
+        self._protected: OrderedDict[CacheKey, None] = OrderedDict()
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._probation or key in self._protected
+
+    def __len__(self) -> int:
+        return len(self._probation) + len(self._protected)
+
+    def hit(self, key: CacheKey) -> None:
+        if key in self._protected:
+            self._protected.move_to_end(key)
+            return
+
+        del self._probation[key]
+        self._protected[key] = None
+        while len(self._protected) > self.protected_size:
+            self._probation[self._protected.popitem(last=False)[0]] = None
+
+    def victim(self) -> Optional[CacheKey]:
+        """The key evicted next"""
+        for segment in (self._probation, self._protected):
+            if segment:
+                return next(iter(segment))
+        return None
+
+    def insert(self, key: CacheKey, prefetched: bool = False) -> List[CacheKey]:
+        """
+        Insert a key into the probation segment and return the evicted keys.
+        A prefetched key goes in as the next one to be evicted from the probation segment.
+        """
+        if key in self:
+            if not prefetched:
+                self.hit(key)
+            return []
+
+        self._probation[key] = None
+        if prefetched:
+            self._probation.move_to_end(key, last=False)
+        evicted = []
+        while len(self) > self.max_size:
+            # The new key is never evicted by its own insertion while the protected segment has keys
+            segment = self._probation if len(self._probation) > 1 or not self._protected else self._protected
+            victim = next(k for k in segment if k != key) if len(segment) > 1 else next(iter(segment))
+            del segment[victim]
+            evicted.append(victim)
+        return evicted
+
+
+class _TinyLfuPolicy(_SlruPolicy):
+    """
+    Segmented LRU with frequency-based admission (TinyLFU).
+    When the cache is full, a new key is admitted only if it was accessed more often
+    than the key it would evict; otherwise the new key itself is dropped.
+    """
+
+    def insert(self, key: CacheKey, prefetched: bool = False) -> List[CacheKey]:
+        # A prefetched key has no accesses yet; it skips the admission test and only risks the probation segment
+        if not prefetched and key not in self and len(self) >= self.max_size:
+            victim = self.victim()
+            if victim is not None and self.counter.estimate(key) <= self.counter.estimate(victim):
+                return [key]
+        return super().insert(key, prefetched)
+
+
+CACHE_POLICIES = {
+    "lru": _LruPolicy,
+    "slru": _SlruPolicy,
+    "tinylfu": _TinyLfuPolicy,
+}
 
 
 class BaseCache(ABC):
-    """LRU Cache"""
+    """
+    Cache of market-days with a selectable eviction policy ('lru', 'slru' or 'tinylfu').
+    Market-days are immutable read-only mappings (ticker → entry) shared by reference,
+    and indexed by date then market so that a hit costs two dict lookups.
+    Every access is counted per (date, market) to drive the policy and prefetching.
+    The latest market-days are pinned and never evicted.
+    """
     cache_name = "Base-Cache"
-    markets = ["stk", "ksq", "knx"]
+    markets = ("stk", "ksq", "knx")
     
-    def __init__(self, max_size: int = 10):
+    def __init__(self, max_size: int = 10, policy: Literal["lru", "slru", "tinylfu"] = "lru"):
         if max_size < 1:
             raise ValueError(f"[{self.cache_name}] The 'max_size' must be larger than 0")
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"[{self.cache_name}] The 'policy' must be the one of {list(CACHE_POLICIES)}")
         
         self._latest_date: str | None = None
-        self._latest: Dict[Tuple[str, str], dict] = {}
-        self._lru_cache: OrderedDict[Tuple[str, str], dict] = OrderedDict()
+        self._latest: Dict[CacheKey, MarketDay] = {}
+        self._index: Dict[str, Dict[str, MarketDay]] = {}
+        self._counter = _AccessCounter(sample_size=max(100, 10 * max_size))
+        self._policy = CACHE_POLICIES[policy](max_size, self._counter)
         self._max_size: int = max_size
+        self.policy = policy
+        self.hits: int = 0
+        self.misses: int = 0
         
     @property
     def latest_date(self) -> Optional[str]:
@@ -27,98 +201,316 @@ class BaseCache(ABC):
         self._latest_date = date
 
     @property
-    def latest(self) -> Dict[Tuple[str, str], dict]:
+    def latest(self) -> Dict[CacheKey, MarketDay]:
         return self._latest
 
-    @latest.setter
-    def latest(self, data: Dict[Tuple[str, str], dict]):
-        self._latest = data
+    def contains(self, date: str, market: str) -> bool:
+        """Check if the market-day is cached, without counting it as an access"""
+        return market in self._index.get(date, ())
+
+    def frequency(self, date: str, market: str) -> int:
+        """Recent access count of the market-day"""
+        return self._counter.estimate((date, market))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and occupancy of the cache"""
+        total = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "max_size": self._max_size,
+            "size": len(self._policy),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+        }
 
     def get(self,
             date: str,
-            market: str,
+            market: Optional[str],
             ticker: str
         ) -> dict:
-        """Get data from LRU cache."""
-        markets = [market] if market else self.markets
-
-        if date == self.latest_date:
-            for mkt in markets:
-                if (date, mkt) in self.latest:
-                    LOGGER.info(f"[{self.cache_name}] Hit the latest cache")
-                    return self.latest.get((date, mkt), {}).get(ticker, {})
-
-        for mkt in markets:
-            if (date, mkt) in self._lru_cache:
-                if ticker in set(self._lru_cache[(date, market)].keys()):
-                    LOGGER.info(f"[{self.cache_name}] Hit the LRU cache")
-                    self._lru_cache.move_to_end((date, mkt))
-                    return self._lru_cache.get((date, mkt), {}).get(ticker, {})
+        """Get data from the cache."""
+        if market:
+            self._counter.record((date, market))
+
+        days = self._index.get(date)
+        if days is not None:
+            if market:
+                entry = self._get_entry(date, market, days, ticker)
+                if entry is not None:
+                    self.hits += 1
+                    return entry
+            else:
+                for mkt in self.markets:
+                    entry = self._get_entry(date, mkt, days, ticker)
+                    if entry is not None:
+                        self.hits += 1
+                        return entry
+
+        self.misses += 1
         return {}
 
+    def get_day(self, date: str, market: str) -> Optional[MarketDay]:
+        """Get a whole market-day from the cache, counted as one access. Return None on a miss."""
+        self._counter.record((date, market))
+
+        day = self._index.get(date, {}).get(market)
+        if day is None:
+            self.misses += 1
+            return None
+
+        if (date, market) in self._policy:
+            self._policy.hit((date, market))
+        self.hits += 1
+        return day
+
+    def _get_entry(
+            self,
+            date: str,
+            market: str,
+            days: Dict[str, MarketDay],
+            ticker: str
+        ) -> Optional[dict]:
+        day = days.get(market)
+        if day is None:
+            return None
+        entry = day.get(ticker)
+        if entry is None:
+            return None
+
+        key = (date, market)
+        # Pinned latest market-days are not part of the policy order
+        if key in self._policy:
+            self._policy.hit(key)
+        LOGGER.debug("[%s] Hit the cache (%s, %s)", self.cache_name, date, market)
+        return entry
+
     def push(self,
              date: str,
              market: str,
-             entries: Dict[str, dict]
+             entries: Mapping[str, dict],
+             prefetched: bool = False
         ) -> None:
         """
-        Push data directly into LRU cache. 
+        Push data directly into the cache. The policy may decline to admit it.
+        A 'prefetched' market-day was not requested yet: it is admitted without the frequency test
+        but is the next to be evicted, so it only displaces another day once it is actually hit.
         This method does NOT update latest_date.
         """
         if date is None or market is None or entries is None:
             raise ValueError(f"[{self.cache_name}] The 'date', 'market', and 'entries' must not be None")
 
-        if not isinstance(entries, dict):
+        if not isinstance(entries, Mapping):
             raise TypeError(f"[{self.cache_name}] The 'entries' must be a dictionary type")
 
-        LOGGER.info(f"[{self.cache_name}] Miss the LRU cache and push new data")
-        self._lru_cache[(date, market)] = entries
-        self._lru_cache.move_to_end((date, market))
-
-        if len(self._lru_cache) > self._max_size:
-            self._lru_cache.popitem(last=False)
-            LOGGER.info(f"[{self.cache_name}] Removed the last item from the cache")
+        LOGGER.info(f"[{self.cache_name}] Miss the cache and push new data")
+        self._index.setdefault(date, {})[market] = as_market_day(entries)
+        self._touch((date, market), prefetched)
 
     def update_latest(self,
                       date: str,
-                      entries: Dict[Tuple[str, str], dict]
+                      entries: Dict[CacheKey, Mapping[str, dict]]
         ) -> None:
         """ Update the latest date and data. """
         if not isinstance(entries, dict):
             raise TypeError(f"[{self.cache_name}] The 'data' must be a dictionary type")
         
-        if self.latest_date and self.latest_date != date:
-            self._move_to_lru(self.latest)
-            
+        previous = self.latest if self.latest_date and self.latest_date != date else {}
+        # The new latest market-days are pinned before the previous ones enter the policy,
+        # so that the previous ones can be dropped when the policy evicts or declines them
         self.latest_date = date
-        self.latest = entries
+        self._latest = {key: as_market_day(entry) for key, entry in entries.items()}
+        for (day, market), entry in self._latest.items():
+            self._index.setdefault(day, {})[market] = entry
+        self._move_to_lru(previous)
         LOGGER.info(f"[{self.cache_name}] Updated the latest date and data")
     
     def _move_to_lru(self,
-                     entries: Dict[Tuple[str, str], dict],
+                     entries: Dict[CacheKey, Mapping[str, dict]],
         ) -> None:
-        """Move outdated latest data into LRU cache."""
+        """Move outdated latest data into the cache. Market-days are moved by reference."""
         for (date, market), entry in entries.items():
-            self._lru_cache[(date, market)] = entry
-            self._lru_cache.move_to_end((date, market))
+            self._index.setdefault(date, {})[market] = as_market_day(entry)
+            self._touch((date, market))
             LOGGER.info(f"[{self.cache_name}] Moved the previous latest data into the Cache ({market})")
 
-            if len(self._lru_cache) > self._max_size:
-                self._lru_cache.popitem(last=False)
-                LOGGER.info(f"[{self.cache_name}] Removed the last item from the cache")
+    def _touch(self, key: CacheKey, prefetched: bool = False) -> None:
+        """Insert the key into the policy and drop the market-days it evicts or declines"""
+        for date, market in self._policy.insert(key, prefetched):
+            # The latest market-days stay indexed even after leaving the policy order
+            if (date, market) not in self._latest:
+                self._drop(date, market)
+                LOGGER.info(f"[{self.cache_name}] Removed ({date}, {market}) from the cache")
+
+    def _drop(self, date: str, market: str) -> None:
+        days = self._index[date]
+        del days[market]
+        if not days:
+            del self._index[date]
         
         
+class KrxInfoIndex:
+    """
+    Secondary indexes of an info market-day: inverted indexes of the categorical attributes
+    and sorted indexes of the ordered ones, so that a search never scans the records.
+    Non-numeric par values (e.g. '무액면') are left out of the par value index.
+    """
+    inverted_fields = ("MKT_TP_NM", "SECUGRP_NM", "SECT_TP_NM", "KIND_STKCERT_TP_NM")
+    sorted_fields = ("LIST_DD", "PARVAL")
+
+    def __init__(self, day: MarketDay):
+        self.day = day
+        self._inverted: Dict[str, Dict[str, FrozenSet[str]]] = {}
+        self._sorted: Dict[str, Tuple[List[Any], List[str]]] = {}
+
+        groups: Dict[str, Dict[str, List[str]]] = {field: {} for field in self.inverted_fields}
+        ordered: Dict[str, List[Tuple[Any, str]]] = {field: [] for field in self.sorted_fields}
+        for ticker, entry in day.items():
+            for field in self.inverted_fields:
+                groups[field].setdefault(entry.get(field), []).append(ticker)
+            if entry.get("LIST_DD"):
+                ordered["LIST_DD"].append((entry["LIST_DD"], ticker))
+            parval = self._number(entry.get("PARVAL"))
+            if parval is not None:
+                ordered["PARVAL"].append((parval, ticker))
+
+        for field, values in groups.items():
+            self._inverted[field] = {value: frozenset(tickers) for value, tickers in values.items()}
+        for field, pairs in ordered.items():
+            pairs.sort()
+            self._sorted[field] = ([value for value, _ in pairs], [ticker for _, ticker in pairs])
+
+    @staticmethod
+    def _number(value: Optional[str]) -> Optional[float]:
+        try:
+            return float(value.replace(",", ""))
+        except (AttributeError, ValueError):
+            return None
+
+    def values(self, field: str) -> List[str]:
+        """Distinct values of a categorical attribute"""
+        return sorted(value for value in self._inverted[field] if value is not None)
+
+    def equals(self, field: str, values: Iterable[str]) -> FrozenSet[str]:
+        """Tickers whose attribute is one of the values"""
+        index = self._inverted[field]
+        return frozenset().union(*(index.get(value, frozenset()) for value in values))
+
+    def between(self, field: str, low: Optional[Any] = None, high: Optional[Any] = None) -> FrozenSet[str]:
+        """Tickers whose ordered attribute lies in [low, high]. A missing bound is open."""
+        keys, tickers = self._sorted[field]
+        start = 0 if low is None else bisect.bisect_left(keys, low)
+        end = len(keys) if high is None else bisect.bisect_right(keys, high)
+        return frozenset(tickers[start:end])
+
+    def search(
+            self,
+            equals: Mapping[str, Iterable[str]],
+            ranges: Mapping[str, Tuple[Optional[Any], Optional[Any]]]
+        ) -> List[str]:
+        """Tickers matching every filter, in ascending order"""
+        candidates = [self.equals(field, values) for field, values in equals.items()]
+        candidates += [self.between(field, *bounds) for field, bounds in ranges.items()]
+        if not candidates:
+            return sorted(self.day)
+
+        # Intersect from the most selective filter
+        candidates.sort(key=len)
+        matched = set(candidates[0])
+        for tickers in candidates[1:]:
+            matched.intersection_update(tickers)
+            if not matched:
+                break
+        return sorted(matched)
+
+
 class KrxStockInfoCache(BaseCache):
-    """Cache storing basic stock information"""
+    """
+    Cache storing basic stock information.
+    Each cached market-day gets its secondary indexes on its first search; they live as long as the market-day is cached.
+    """
     cache_name = "Stock-Info-Cache"
     
-    def __init__(self, max_size):
-        super().__init__(max_size)
+    def __init__(self, max_size, policy="lru"):
+        super().__init__(max_size, policy)
+        self._indexes: Dict[CacheKey, KrxInfoIndex] = {}
+
+    def index(self, date: str, market: str, day: MarketDay) -> KrxInfoIndex:
+        """Secondary indexes of a market-day, kept while the market-day is cached"""
+        index = self._indexes.get((date, market))
+        if index is not None and index.day is day:
+            return index
+
+        index = KrxInfoIndex(day)
+        # A market-day declined by the cache policy is indexed for this search only
+        if self._index.get(date, {}).get(market) is day:
+            self._indexes[(date, market)] = index
+            LOGGER.info(f"[{self.cache_name}] Built the secondary indexes of ({date}, {market})")
+        return index
+
+    def _drop(self, date: str, market: str) -> None:
+        super()._drop(date, market)
+        self._indexes.pop((date, market), None)
     
         
 class KrxStockPriceCache(BaseCache):
     """Cache storing stock price"""
     cache_name = "Stock-Price-Cache"
 
-    def __init__(self, max_size):
-        super().__init__(max_size)
\ No newline at end of file
+    def __init__(self, max_size, policy="lru"):
+        super().__init__(max_size, policy)
+
+class KrxNegativeCache:
+    """
+    Cache of (date, market) pairs without trading data.
+    Weekends, dates before the market data begins and dates after the latest open date
+    are rejected without any request. Only explicitly empty responses are pushed, never failures.
+    Empty results of past days (holidays) expire after 'holiday_ttl' seconds, so that a day
+    KRX API answered wrongly is asked again later, and empty results of the latest open date
+    expire after 'transient_ttl' seconds since KRX API may publish them later.
+    """
+    cache_name = "Negative-Cache"
+    first_dates = {"stk": "20100104", "ksq": "20100104", "knx": "20130701"}
+
+    def __init__(self, transient_ttl: float = 600.0, holiday_ttl: float = 86400.0):
+        self._entries: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self.transient_ttl = transient_ttl
+        self.holiday_ttl = holiday_ttl
+
+    def get(self, date: str, market: str) -> Optional[str]:
+        """Return the reason why the market-day has no trading data, if known."""
+        if reason := self._classify(date, market):
+            return reason
+
+        entry = self._entries.get((date, market))
+        if entry is None:
+            return None
+
+        reason, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[(date, market)]
+            return None
+
+        LOGGER.info(f"[{self.cache_name}] Hit the negative cache ({date}, {market})")
+        return reason
+
+    def push(self, date: str, market: str) -> str:
+        """Remember that KRX API returned no trading data for the market-day."""
+        if date < get_latest_open_date():
+            reason, expires_at = "market holiday", time.monotonic() + self.holiday_ttl
+        else:
+            reason, expires_at = "not published yet", time.monotonic() + self.transient_ttl
+
+        self._entries[(date, market)] = (reason, expires_at)
+        LOGGER.info(f"[{self.cache_name}] Pushed ({date}, {market}): {reason}")
+        return reason
+
+    def _classify(self, date: str, market: str) -> Optional[str]:
+        """Reject market-days that can never have trading data"""
+        if date < self.first_dates[market]:
+            return f"before the first available date ({self.first_dates[market]})"
+        if date > get_latest_open_date():
+            return "not available yet"
+        if datetime.strptime(date, "%Y%m%d").weekday() >= 5:
+            return "weekend"
+        return None
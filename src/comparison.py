@@ -0,0 +1,120 @@
+import math
+import numpy as np
+from typing import Optional, Dict, List, Mapping, Any
+from src.indicators import _to_float
+from src.utils import LOGGER
+
+
+def _round(value: float, digits: int) -> Optional[float]:
+    return round(float(value), digits) if math.isfinite(value) else None
+
+
+class KrxPriceComparison:
+    """
+    Dense date × ticker close-price matrix of several tickers.
+    Each market-day is read once for every requested ticker, then returns, cumulative performance
+    and the correlation matrix are computed over the whole matrix with a few vector operations.
+    Days on which a ticker did not trade are NaN, and every statistic skips them pairwise.
+    """
+    comparison_name = "Price-Comparison"
+    trading_days_per_year = 252
+    min_periods = 3
+
+    def __init__(self, tickers: List[str]):
+        self.tickers = list(tickers)
+        self.columns = {ticker: column for column, ticker in enumerate(self.tickers)}
+        self.names: Dict[str, str] = {}
+        self.dates: List[str] = []
+        self._rows: List[np.ndarray] = []
+
+    def add(self, date: str, day: Mapping[str, dict], tickers: Optional[List[str]] = None) -> None:
+        """Fill the close prices of the tickers found in a market-day. Market-days of one date share a row."""
+        if not self.dates or self.dates[-1] != date:
+            self.dates.append(date)
+            self._rows.append(np.full(len(self.tickers), np.nan))
+
+        row = self._rows[-1]
+        for ticker in tickers if tickers is not None else self.tickers:
+            entry = day.get(ticker)
+            if entry is None:
+                continue
+            row[self.columns[ticker]] = _to_float(entry.get("TDD_CLSPRC"))
+            self.names[ticker] = entry.get("ISU_NM")
+
+    def matrix(self) -> np.ndarray:
+        """Close prices as a (dates, tickers) matrix"""
+        if not self._rows:
+            return np.empty((0, len(self.tickers)))
+        close = np.vstack(self._rows)
+        close[close <= 0] = np.nan
+        return close
+
+    def compare(self) -> Dict[str, Any]:
+        """Per-ticker performance and the correlation matrix of daily returns"""
+        close = self.matrix()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = close[1:] / close[:-1] - 1
+
+        valid = np.isfinite(returns)
+        counts = valid.sum(axis=0)
+        values = np.where(valid, returns, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = values.sum(axis=0) / counts
+            variance = ((values - mean) ** 2 * valid).sum(axis=0) / (counts - 1)
+        volatility = np.sqrt(variance * self.trading_days_per_year)
+        volatility[counts < self.min_periods] = np.nan
+
+        # First and last traded close of each ticker
+        traded = np.isfinite(close)
+        if len(close):
+            has_close = traded.any(axis=0)
+            first = np.where(has_close, close[traded.argmax(axis=0), np.arange(len(self.tickers))], np.nan)
+            last_index = len(close) - 1 - traded[::-1].argmax(axis=0)
+            last = np.where(has_close, close[last_index, np.arange(len(self.tickers))], np.nan)
+        else:
+            first = last = np.full(len(self.tickers), np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cumulative = last / first - 1
+
+        stocks = {
+            ticker: {
+                "name": self.names.get(ticker),
+                "trading_days": int(traded[:, column].sum()),
+                "start_close": _round(first[column], 2),
+                "end_close": _round(last[column], 2),
+                "cumulative_return": _round(cumulative[column] * 100, 2),
+                "mean_daily_return": _round(mean[column] * 100, 3),
+                "volatility": _round(volatility[column] * 100, 2),
+            }
+            for column, ticker in enumerate(self.tickers)
+        }
+
+        correlation = self._pairwise_correlation(values, valid)
+        LOGGER.info(
+            f"[{self.comparison_name}] Compared {len(self.tickers)} tickers over {len(self.dates)} days"
+        )
+        return {
+            "start_date": self.dates[0] if self.dates else None,
+            "end_date": self.dates[-1] if self.dates else None,
+            "days": len(self.dates),
+            "stocks": stocks,
+            "tickers": self.tickers,
+            "correlation": [
+                [_round(value, 3) for value in row] for row in correlation
+            ],
+        }
+
+    def _pairwise_correlation(self, values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """Pearson correlation of every pair of tickers over the days both of them traded"""
+        mask = valid.astype(float)
+        pairs = mask.T @ mask
+        sum_x = values.T @ mask
+        sum_xx = (values * values).T @ mask
+        sum_xy = values.T @ values
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = sum_xy - sum_x * sum_x.T / pairs
+            variance_x = sum_xx - sum_x ** 2 / pairs
+            variance_y = variance_x.T
+            correlation = covariance / np.sqrt(variance_x * variance_y)
+        correlation[pairs < self.min_periods] = np.nan
+        return np.clip(correlation, -1.0, 1.0)
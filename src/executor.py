@@ -0,0 +1,101 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Optional, Literal, Callable, Dict, Any
+from src.utils import LOGGER
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when the executor queue stays full longer than the queue timeout"""
+
+
+class BoundedExecutor:
+    """
+    Executor running CPU-bound work (e.g. fuzzy stock name resolution) off the event loop.
+    At most 'max_workers + max_queue' jobs are admitted at once; further jobs wait
+    up to 'queue_timeout' seconds for a slot and are rejected afterwards.
+    """
+    executor_name = "Executor"
+
+    def __init__(
+            self,
+            mode: Literal["none", "thread", "process"] = "thread",
+            max_workers: int = 4,
+            max_queue: int = 64,
+            queue_timeout: float = 1.0,
+            initializer: Optional[Callable[[], None]] = None
+        ) -> None:
+        if max_workers < 1:
+            raise ValueError(f"[{self.executor_name}] The 'max_workers' must be larger than 0")
+        if max_queue < 0:
+            raise ValueError(f"[{self.executor_name}] The 'max_queue' must not be negative")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._pool: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight: int = 0
+        self.rejected: int = 0
+
+        match mode:
+            case "none":
+                pass
+            case "thread":
+                self._pool = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="krx-stock-executor",
+                    initializer=initializer
+                )
+            case "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=initializer
+                )
+            case _:
+                raise ValueError(f"[{self.executor_name}] Mode must be the one of 'none', 'thread', or 'process'.")
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a function in the pool and wait for its result.
+        With 'process' mode, the function and its arguments must be picklable.
+        """
+        if self._pool is None:
+            return func(*args)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            LOGGER.warning(f"[{self.executor_name}] Rejected a job: the queue is full")
+            raise ExecutorBusyError("The server is busy. Please retry later.")
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, functools.partial(func, *args))
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue metrics of the pool"""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Shutdown the pool without waiting for queued jobs"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            LOGGER.info(f"[{self.executor_name}] Executor shut down")
@@ -0,0 +1,192 @@
+import os
+import time
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional, Literal, Callable, Dict, List, Tuple, Mapping, Any
+from src.utils import LOGGER
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Loads a cached or stored market-day without fetching it from KRX API
+MarketDayLoader = Callable[[str, str, str], Optional[Mapping[str, dict]]]
+
+INFO_COLUMNS: List[Tuple[str, str]] = [
+    ("BAS_DD", "string"),
+    ("ISU_CD", "string"),
+    ("ISU_SRT_CD", "string"),
+    ("ISU_NM", "string"),
+    ("ISU_ABBRV", "string"),
+    ("ISU_ENG_NM", "string"),
+    ("LIST_DD", "string"),
+    ("MKT_TP_NM", "string"),
+    ("SECUGRP_NM", "string"),
+    ("SECT_TP_NM", "string"),
+    ("KIND_STKCERT_TP_NM", "string"),
+    ("PARVAL", "float64"),
+    ("LIST_SHRS", "int64"),
+]
+PRICE_COLUMNS: List[Tuple[str, str]] = [
+    ("BAS_DD", "string"),
+    ("ISU_CD", "string"),
+    ("ISU_NM", "string"),
+    ("MKT_NM", "string"),
+    ("SECT_TP_NM", "string"),
+    ("TDD_CLSPRC", "int64"),
+    ("CMPPREVDD_PRC", "int64"),
+    ("FLUC_RT", "float64"),
+    ("TDD_OPNPRC", "int64"),
+    ("TDD_HGPRC", "int64"),
+    ("TDD_LWPRC", "int64"),
+    ("ACC_TRDVOL", "int64"),
+    ("ACC_TRDVAL", "int64"),
+    ("MKTCAP", "int64"),
+    ("LIST_SHRS", "int64"),
+]
+
+
+def _import_pyarrow():
+    """pyarrow is an optional dependency ('export' extra), imported on the first export"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "[Arrow-Exporter] pyarrow is required to export market-days. Install it with 'uv sync --extra export'."
+        ) from e
+    return pyarrow
+
+
+def _to_number(value: Any, kind: str) -> Optional[float]:
+    """KRX numbers are strings with thousands separators, and '-' or '' when missing"""
+    try:
+        number = str(value).replace(",", "")
+        return int(number) if kind == "int64" else float(number)
+    except ValueError:
+        return None
+
+
+class KrxArrowExporter:
+    """
+    Export the market-days of a date range as Arrow IPC (memory-mappable) or Parquet.
+    Each market-day is written as one row batch and released before the next one is loaded,
+    so memory stays bounded by a single market-day whatever the length of the range.
+    Numeric KRX fields are written as int64/float64 columns instead of strings.
+    """
+    exporter_name = "Arrow-Exporter"
+    formats = ("arrow", "parquet")
+    suffixes = {"arrow": ".arrow", "parquet": ".parquet"}
+    columns = {"info": INFO_COLUMNS, "price": PRICE_COLUMNS}
+
+    def __init__(self, loader: MarketDayLoader, skip: Optional[Callable[[str, str], bool]] = None):
+        self.loader = loader
+        self.skip = skip or (lambda date, market: datetime.strptime(date, "%Y%m%d").weekday() >= 5)
+
+    def schema(self, endpoint: Literal["info", "price"]) -> "pa.Schema":
+        pa = _import_pyarrow()
+        return pa.schema([(name, getattr(pa, kind)()) for name, kind in self.columns[endpoint]])
+
+    def batch(
+            self,
+            endpoint: Literal["info", "price"],
+            date: str,
+            day: Mapping[str, dict],
+            schema: Optional["pa.Schema"] = None
+        ) -> "pa.RecordBatch":
+        """Columnar row batch of a market-day"""
+        pa = _import_pyarrow()
+        entries = list(day.values())
+        arrays = []
+        for name, kind in self.columns[endpoint]:
+            if name == "BAS_DD" and endpoint == "info":
+                values = [date] * len(entries)
+            elif kind == "string":
+                values = [entry.get(name) for entry in entries]
+            else:
+                values = [_to_number(entry.get(name), kind) for entry in entries]
+            arrays.append(pa.array(values, type=getattr(pa, kind)()))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema or self.schema(endpoint))
+
+    def export(
+            self,
+            endpoint: Literal["info", "price"],
+            market: str,
+            start: str,
+            end: str,
+            path: str,
+            format: Literal["arrow", "parquet"] = "arrow"
+        ) -> Dict[str, Any]:
+        """
+        Write the cached or stored market-days between 'start' and 'end' into 'path'.
+        Days that are neither cached nor stored are reported as missing; nothing is fetched from KRX API.
+        The file is replaced atomically, so readers never see a partial export.
+        """
+        if format not in self.formats:
+            raise ValueError(f"[{self.exporter_name}] Format must be the one of {self.formats}")
+        if endpoint not in self.columns:
+            raise ValueError(f"[{self.exporter_name}] Endpoint must be the one of {list(self.columns)}")
+        pa = _import_pyarrow()
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        schema = self.schema(endpoint)
+        started = time.monotonic()
+        exported: List[str] = []
+        missing: List[str] = []
+        rows = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            if format == "arrow":
+                writer = pa.ipc.new_file(tmp_path, schema)
+            else:
+                writer = pa.parquet.ParquetWriter(tmp_path, schema)
+            with writer:
+                day = datetime.strptime(start, "%Y%m%d")
+                last = datetime.strptime(end, "%Y%m%d")
+                while day <= last:
+                    date = day.strftime("%Y%m%d")
+                    day += timedelta(days=1)
+                    if self.skip(date, market):
+                        continue
+                    entries = self.loader(endpoint, date, market)
+                    if not entries:
+                        missing.append(date)
+                        continue
+                    batch = self.batch(endpoint, date, entries, schema)
+                    if format == "arrow":
+                        writer.write_batch(batch)
+                    else:
+                        writer.write_batch(batch, row_group_size=batch.num_rows)
+                    exported.append(date)
+                    rows += batch.num_rows
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        elapsed = time.monotonic() - started
+        LOGGER.info(
+            f"[{self.exporter_name}] Exported {len(exported)} market-days ({rows} rows) of "
+            f"({endpoint}, {market}) to {path} in {elapsed:.2f}s"
+        )
+        return {
+            "path": str(path.resolve()),
+            "format": format,
+            "endpoint": endpoint,
+            "market": market,
+            "start_date": start,
+            "end_date": end,
+            "days": len(exported),
+            "rows": rows,
+            "bytes": path.stat().st_size,
+            "missing_dates": missing,
+        }
+
+    @classmethod
+    def file_name(cls, endpoint: str, market: str, start: str, end: str, format: str) -> str:
+        return f"{endpoint}_{market}_{start}_{end}{cls.suffixes[format]}"
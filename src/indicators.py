@@ -0,0 +1,198 @@
+import math
+import numpy as np
+from typing import Optional, Dict, List, Tuple, Any
+from src.utils import LOGGER
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return math.nan
+
+
+class _RollingSum:
+    """Rolling sum and count of valid values over the last 'window' rows of a ring buffer"""
+
+    def __init__(self, window: int, capacity: int):
+        self.window = window
+        self.sum = np.zeros(capacity)
+        self.sumsq = np.zeros(capacity)
+        self.count = np.zeros(capacity, dtype=np.int32)
+
+    def grow(self, capacity: int) -> None:
+        extra = capacity - len(self.sum)
+        self.sum = np.concatenate([self.sum, np.zeros(extra)])
+        self.sumsq = np.concatenate([self.sumsq, np.zeros(extra)])
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int32)])
+
+    def update(self, new: np.ndarray, old: Optional[np.ndarray]) -> None:
+        valid = np.isfinite(new)
+        values = np.where(valid, new, 0.0)
+        self.sum += values
+        self.sumsq += values * values
+        self.count += valid
+        if old is not None:
+            valid = np.isfinite(old)
+            values = np.where(valid, old, 0.0)
+            self.sum -= values
+            self.sumsq -= values * values
+            self.count -= valid
+
+
+class _MarketSeries:
+    """Ring buffers of close, volume and log return over the last 'history' days of a market"""
+
+    def __init__(self, history: int, windows: Tuple[int, ...], vol_windows: Tuple[int, ...]):
+        self.history = history
+        self.capacity = 0
+        self.tickers: Dict[str, int] = {}
+        self.dates: List[str] = []
+        self.pos = 0
+        self.close = np.full((history, 0), np.nan)
+        self.volume = np.full((history, 0), np.nan)
+        self.returns = np.full((history, 0), np.nan)
+        self.close_sums = {w: _RollingSum(w, 0) for w in windows}
+        self.volume_sums = {w: _RollingSum(w, 0) for w in windows}
+        self.return_sums = {w: _RollingSum(w, 0) for w in vol_windows}
+
+    @property
+    def last_date(self) -> Optional[str]:
+        return self.dates[-1] if self.dates else None
+
+    def row(self, days_ago: int) -> Optional[int]:
+        """Ring buffer row of the day 'days_ago' trading days before the last day"""
+        if days_ago >= len(self.dates):
+            return None
+        return (self.pos - 1 - days_ago) % self.history
+
+    def columns(self, tickers: List[str]) -> np.ndarray:
+        """Column index of each ticker, adding columns for new tickers"""
+        for ticker in tickers:
+            if ticker not in self.tickers:
+                self.tickers[ticker] = len(self.tickers)
+
+        if len(self.tickers) > self.capacity:
+            capacity = max(len(self.tickers), self.capacity * 2, 64)
+            extra = capacity - self.capacity
+            for name in ("close", "volume", "returns"):
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.full((self.history, extra), np.nan)], axis=1))
+            for sums in (*self.close_sums.values(), *self.volume_sums.values(), *self.return_sums.values()):
+                sums.grow(capacity)
+            self.capacity = capacity
+
+        return np.fromiter((self.tickers[ticker] for ticker in tickers), dtype=np.int64, count=len(tickers))
+
+
+class KrxIndicatorEngine:
+    """
+    Technical indicators of every ticker, kept incrementally over the daily price series.
+    Appending a day updates the rolling state of a whole market with a few vector operations,
+    instead of recomputing the history of each ticker.
+    """
+    engine_name = "Indicator-Engine"
+    markets = ["stk", "ksq", "knx"]
+    windows = (5, 20, 60, 120)
+    vol_windows = (20, 60)
+    history = 252
+    trading_days_per_year = 252
+
+    def __init__(self):
+        self._series: Dict[str, _MarketSeries] = {
+            market: _MarketSeries(self.history, self.windows, self.vol_windows)
+            for market in self.markets
+        }
+
+    def last_date(self, market: str) -> Optional[str]:
+        """The latest trading day appended to the market"""
+        return self._series[market].last_date
+
+    def reset(self, market: str) -> None:
+        """Drop the series of a market, e.g. before appending days which do not follow its last day"""
+        self._series[market] = _MarketSeries(self.history, self.windows, self.vol_windows)
+
+    def append(self, date: str, market: str, records: Dict[str, Dict[str, Any]]) -> None:
+        """Append a price market-day. Days not newer than the last appended day are ignored."""
+        series = self._series[market]
+        if series.last_date is not None and date <= series.last_date:
+            return
+
+        tickers = list(records.keys())
+        columns = series.columns(tickers)
+        close = np.full(series.capacity, np.nan)
+        volume = np.full(series.capacity, np.nan)
+        close[columns] = [_to_float(records[t].get("TDD_CLSPRC")) for t in tickers]
+        volume[columns] = [_to_float(records[t].get("ACC_TRDVOL")) for t in tickers]
+        close[close <= 0] = np.nan
+
+        previous = series.row(0)
+        if previous is None:
+            returns = np.full(series.capacity, np.nan)
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                returns = np.log(close / series.close[previous])
+
+        # Values leaving each window are read before the ring buffer row is overwritten
+        for name, sums_by_window, new in (
+            ("close", series.close_sums, close),
+            ("volume", series.volume_sums, volume),
+            ("returns", series.return_sums, returns),
+        ):
+            array = getattr(series, name)
+            for window, sums in sums_by_window.items():
+                old_row = series.row(window - 1)
+                sums.update(new, array[old_row] if old_row is not None else None)
+
+        series.close[series.pos] = close
+        series.volume[series.pos] = volume
+        series.returns[series.pos] = returns
+        series.pos = (series.pos + 1) % self.history
+        series.dates.append(date)
+        if len(series.dates) > self.history:
+            series.dates.pop(0)
+
+        LOGGER.info(f"[{self.engine_name}] Appended ({date}, {market}) for {len(tickers)} tickers")
+
+    def get(self, market: str, ticker: str) -> Dict[str, Any]:
+        """Indicators of a ticker as of the last appended day of its market"""
+        series = self._series[market]
+        column = series.tickers.get(ticker)
+        if column is None or series.last_date is None:
+            return {}
+
+        last_row = series.row(0)
+        close = series.close[last_row, column]
+        if not np.isfinite(close):
+            return {}
+
+        output: Dict[str, Any] = {
+            "ISU_CD": ticker,
+            "BAS_DD": series.last_date,
+            "TDD_CLSPRC": float(close),
+        }
+
+        for window in self.windows:
+            sums = series.close_sums[window]
+            if sums.count[column] == window:
+                output[f"MA_{window}"] = round(float(sums.sum[column]) / window, 2)
+            volumes = series.volume_sums[window]
+            if volumes.count[column] == window:
+                output[f"AVG_VOL_{window}"] = round(float(volumes.sum[column]) / window, 2)
+            past_row = series.row(window)
+            if past_row is not None and np.isfinite(series.close[past_row, column]):
+                output[f"RET_{window}"] = round(float(close / series.close[past_row, column] - 1) * 100, 2)
+
+        for window in self.vol_windows:
+            sums = series.return_sums[window]
+            count = sums.count[column]
+            if count == window:
+                variance = float(sums.sumsq[column] - sums.sum[column] ** 2 / count) / (count - 1)
+                volatility = math.sqrt(max(variance, 0.0) * self.trading_days_per_year)
+                output[f"VOL_{window}"] = round(volatility * 100, 2)
+
+        closes = series.close[:, column]
+        if np.isfinite(closes).any():
+            output["HIGH_52W"] = float(np.nanmax(closes))
+            output["LOW_52W"] = float(np.nanmin(closes))
+        return output
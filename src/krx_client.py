@@ -1,105 +1,318 @@
 import os
-import aiohttp
-import requests
-from typing import Dict, Any
+import time
+import asyncio
+import threading
+from importlib.util import find_spec
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional, Literal, Dict, List, Any
+from src.stream_decoder import OutBlockStreamDecoder
+from src.throttle import TokenBucket, SharedTokenBucket, CircuitBreaker, CircuitOpenError, backoff_delay
+from src.tracing import span
 from src.utils import LOGGER
 
+# aiohttp and requests are imported on first use to keep the stdio startup fast
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
+
+# aiohttp decodes brotli only when one of the brotli packages is installed
+if find_spec("brotli") or find_spec("brotlicffi"):
+    ACCEPT_ENCODING = "gzip, deflate, br"
+else:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# Rate limit state shared by every process using the same store directory
+KRX_RATE_LIMIT_FILE = ".krx_rate_limit"
+
+
+class KrxApiError(RuntimeError):
+    """Raised when a request to KRX API finally fails"""
+
+
+class _RetryableStatusError(RuntimeError):
+    """Raised for HTTP status codes worth retrying"""
+
+
+@dataclass(frozen=True)
+class KrxFetchResult:
+    """
+    Typed result of a market-day fetch. Only 'ok' results may be cached.
+    'error' holds the failure message, or the reason of an 'empty' result.
+    """
+    status: Literal["ok", "empty", "error"]
+    records: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
 class KrxStockClient:
 
-    async def make_request(self, url: str) -> Dict[str, Any]:
-        headers = {}
+    retryable_status = {429, 500, 502, 503, 504}
+    chunk_size = 64 * 1024
+
+    def __init__(
+            self,
+            rate_limit: float = 5.0,
+            burst: int = 5,
+            max_retries: int = 3,
+            timeout: float = 5.0,
+            rate_limit_file: Optional[str] = None
+        ):
+        self._session: Optional["aiohttp.ClientSession"] = None
+        # With 'rate_limit_file', the rate limit is shared with every process limited by the same file
+        self.limiter = (
+            SharedTokenBucket(rate_limit_file, rate=rate_limit, capacity=burst)
+            if rate_limit_file else TokenBucket(rate=rate_limit, capacity=burst)
+        )
+        self.breaker = CircuitBreaker()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._local = threading.local()
+        self._sync_sessions: List["requests.Session"] = []
+        self._sync_sessions_lock = threading.Lock()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return a pooled session, created lazily inside the running event loop"""
+        if self._session is None or self._session.closed:
+            import aiohttp
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    def _get_sync_session(self) -> "requests.Session":
+        """Return the pooled session of the calling thread. requests sessions are not shared across threads."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            session = requests.Session()
+            self._local.session = session
+            with self._sync_sessions_lock:
+                self._sync_sessions.append(session)
+        return session
+
+    async def close(self) -> None:
+        """Close the pooled session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def close_sync(self) -> None:
+        """Close the pooled sessions of every thread"""
+        with self._sync_sessions_lock:
+            sessions, self._sync_sessions = self._sync_sessions, []
+        for session in sessions:
+            session.close()
+
+    async def make_request(self, url: str, key: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Request KRX API with rate limiting, retries and circuit breaking.
+        Records of 'OutBlock_1' are decoded from the compressed response stream
+        and indexed by 'key' as they arrive.
+        Timeouts, connection errors, truncated or corrupt compressed streams and
+        429/5xx responses are retried with exponential backoff. Raise KrxApiError when the request finally fails.
+        Cancelling the call aborts the transfer and the decoding at the next chunk.
+        """
+        import aiohttp
+
+        headers = {"Accept-Encoding": ACCEPT_ENCODING}
         if api_key := os.environ.get("KRX_API_KEY"):
             headers["AUTH_KEY"] = api_key
 
-        async with aiohttp.ClientSession() as client:
+        last_error: Exception | None = None
+        for attempt in range(self.max_retries + 1):
             try:
-                async with client.get(url, headers=headers, timeout=5.0) as response:
-                    response.raise_for_status()
-                    return await response.json()
-            except Exception as e:
-                LOGGER.exception(f"[KRX API] API request failed.Check if the url is valid: {url}")
-                return {}
+                self.breaker.before_request()
+            except CircuitOpenError as e:
+                raise KrxApiError(str(e)) from e
+
+            try:
+                with span("krx.rate_limit"):
+                    await self.limiter.acquire()
+                with span("krx.http", attempt=attempt) as stage:
+                    timeout = aiohttp.ClientTimeout(total=self.timeout)
+                    async with self._get_session().get(url, headers=headers, timeout=timeout) as response:
+                        if stage is not None:
+                            stage.set(status=response.status)
+                        if response.status in self.retryable_status:
+                            raise _RetryableStatusError(f"HTTP {response.status}")
+                        response.raise_for_status()
+                        # Decoding is interleaved with the network reads, so its share is measured separately
+                        decoder = OutBlockStreamDecoder(key)
+                        decode_seconds, received = 0.0, 0
+                        try:
+                            async for chunk in response.content.iter_chunked(self.chunk_size):
+                                started = time.perf_counter()
+                                decoder.feed(chunk)
+                                decode_seconds += time.perf_counter() - started
+                                received += len(chunk)
+                        except asyncio.CancelledError:
+                            # Drop the connection instead of draining the rest of the market-day into the pool
+                            response.close()
+                            raise
+                        started = time.perf_counter()
+                        records = decoder.close()
+                        decode_seconds += time.perf_counter() - started
+                        if stage is not None:
+                            stage.set(bytes=received, records=len(records), decode_ms=round(decode_seconds * 1000, 3))
+            except asyncio.CancelledError:
+                self.breaker.record_cancelled()
+                raise
+            except (
+                asyncio.TimeoutError,
+                aiohttp.ClientConnectionError,
+                aiohttp.ClientPayloadError,
+                _RetryableStatusError
+            ) as e:
+                self.breaker.record_failure()
+                last_error = e
+                if attempt < self.max_retries:
+                    delay = backoff_delay(attempt)
+                    LOGGER.warning(f"[KRX API] API request failed ({e!r}). Retrying in {delay:.2f}s: {url}")
+                    await asyncio.sleep(delay)
+                continue
+            except aiohttp.ClientResponseError as e:
+                # KRX API is reachable; the request itself is invalid
+                self.breaker.record_success()
+                raise KrxApiError(f"API request failed with HTTP {e.status}. Check if the url is valid: {url}") from e
+            except ValueError as e:
+                self.breaker.record_success()
+                raise KrxApiError(f"Failed to decode the response ({e}): {url}") from e
+
+            self.breaker.record_success()
+            return records
+
+        raise KrxApiError(f"API request failed after {self.max_retries + 1} attempts ({last_error!r}): {url}")
+
+    async def _fetch_records(self, url: str, key: str, date: str) -> KrxFetchResult:
+        """Request a market-day and index its records by 'key'"""
+        try:
+            records = await self.make_request(url, key)
+        except KrxApiError as e:
+            LOGGER.error(f"[KRX API] {e}")
+            return KrxFetchResult(status="error", error=str(e))
+
+        if not records:
+            LOGGER.error(f"[KRX API] No market data found from API. Check if the date ({date}) is valid.")
+            return KrxFetchResult(status="empty")
+
+        return KrxFetchResult(status="ok", records=records)
         
-    def make_request_sync(self, url: str) -> Dict[str, Any]:
-        headers = {}
+    def make_request_sync(self, url: str, key: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Blocking counterpart of 'make_request' for worker threads, with the same rate limiting,
+        retries, circuit breaking and streaming decoding over a pooled requests session.
+        """
+        import requests
+
+        headers = {"Accept-Encoding": ACCEPT_ENCODING}
         if api_key := os.environ.get("KRX_API_KEY"):
             headers["AUTH_KEY"] = api_key
+
+        last_error: Exception | None = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.breaker.before_request()
+            except CircuitOpenError as e:
+                raise KrxApiError(str(e)) from e
+
+            self.limiter.acquire_sync()
+            try:
+                with self._get_sync_session().get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                    if response.status_code in self.retryable_status:
+                        raise _RetryableStatusError(f"HTTP {response.status_code}")
+                    response.raise_for_status()
+                    decoder = OutBlockStreamDecoder(key)
+                    for chunk in response.iter_content(self.chunk_size):
+                        decoder.feed(chunk)
+                    records = decoder.close()
+            except (
+                requests.Timeout,
+                requests.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ContentDecodingError,
+                _RetryableStatusError
+            ) as e:
+                self.breaker.record_failure()
+                last_error = e
+                if attempt < self.max_retries:
+                    delay = backoff_delay(attempt)
+                    LOGGER.warning(f"[KRX API] API request failed ({e!r}). Retrying in {delay:.2f}s: {url}")
+                    time.sleep(delay)
+                continue
+            except requests.HTTPError as e:
+                # KRX API is reachable; the request itself is invalid
+                self.breaker.record_success()
+                raise KrxApiError(
+                    f"API request failed with HTTP {e.response.status_code}. Check if the url is valid: {url}"
+                ) from e
+            except ValueError as e:
+                self.breaker.record_success()
+                raise KrxApiError(f"Failed to decode the response ({e}): {url}") from e
+
+            self.breaker.record_success()
+            return records
+
+        raise KrxApiError(f"API request failed after {self.max_retries + 1} attempts ({last_error!r}): {url}")
+
+    def _fetch_records_sync(self, url: str, key: str, date: str) -> KrxFetchResult:
+        """Blocking counterpart of '_fetch_records'"""
         try:
-            response = requests.get(url, headers=headers, timeout=5.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            LOGGER.exception(f"[KRX API] API request failed. Check if the url is valid: {url}")
-            return {}
+            records = self.make_request_sync(url, key)
+        except KrxApiError as e:
+            LOGGER.error(f"[KRX API] {e}")
+            return KrxFetchResult(status="error", error=str(e))
+
+        if not records:
+            LOGGER.error(f"[KRX API] No market data found from API. Check if the date ({date}) is valid.")
+            return KrxFetchResult(status="empty")
+
+        return KrxFetchResult(status="ok", records=records)
 
     async def fetch_stock_info(
         self,
         date: str,
         market: str
-    ) -> Dict[str, Dict[str, Any]]:
+    ) -> KrxFetchResult:
         """Request stock inofrmation from API"""
         if market not in ["stk", "ksq", "knx"]:
             raise ValueError("Market must be the one of 'stk', 'ksq', or 'knx'.")
         
         url = f"http://data-dbg.krx.co.kr/svc/apis/sto/{market}_isu_base_info?basDd={date}"
-        data = await self.make_request(url)
-        
-        records = data.get("OutBlock_1", [])
-        if not records:
-            LOGGER.error(f"[KRX API] No market data found from API. Check if the date ({date}) is valid.")
-
-        return {record['ISU_SRT_CD']:record for record in records}
+        return await self._fetch_records(url, "ISU_SRT_CD", date)
         
-    async def fetch_stock_info_sync(
+    def fetch_stock_info_sync(
         self,
         date: str,
         market: str
-    ) -> Dict[str, Dict[str, Any]]:
+    ) -> KrxFetchResult:
         """Request stock inofrmation from API"""
         if market not in ["stk", "ksq", "knx"]:
             raise ValueError("Market must be the one of 'stk', 'ksq', or 'knx'.")
         
         url = f"http://data-dbg.krx.co.kr/svc/apis/sto/{market}_isu_base_info?basDd={date}"
-        data = await self.make_request_sync(url)
-        
-        records = data.get("OutBlock_1", [])
-        if not records:
-            LOGGER.error(f"[KRX API] No market data found from API. Check if the date ({date}) is valid.")
-                    
-        return {record['ISU_SRT_CD']:record for record in records}
+        return self._fetch_records_sync(url, "ISU_SRT_CD", date)
 
     async def fetch_stock_price(
         self,
         date: str,
         market: str
-    ) -> Dict[str, Dict[str, Any]]:
+    ) -> KrxFetchResult:
         """Request stock price from API"""
         if market not in ["stk", "ksq", "knx"]:
             raise ValueError("Market must be the one of 'stk', 'ksq', or 'knx'.")
         
         url = f"http://data-dbg.krx.co.kr/svc/apis/sto/{market}_bydd_trd?basDd={date}"
-        data = await self.make_request(url)
-        
-        records = data.get("OutBlock_1", [])
-        if not records:
-            LOGGER.error(f"[KRX API] No market data found from API. Check if the date ({date}) is valid.")
-        
-        return {record['ISU_CD']:record for record in records}
+        return await self._fetch_records(url, "ISU_CD", date)
 
-    async def fetch_stock_price_sync(
+    def fetch_stock_price_sync(
         self,
         date: str,
         market: str
-    ) -> Dict[str, Dict[str, Any]]:
+    ) -> KrxFetchResult:
         """Request stock price from API"""
         if market not in ["stk", "ksq", "knx"]:
             raise ValueError("Market must be the one of 'stk', 'ksq', or 'knx'.")
         
         url = f"http://data-dbg.krx.co.kr/svc/apis/sto/{market}_bydd_trd?basDd={date}"
-        data = await self.make_request_sync(url)
-        
-        records = data.get("OutBlock_1", [])
-        if not records:
-            LOGGER.error(f"[KRX API] No market data found from API. Check if the date ({date}) is valid.")
-        
-        return {record['ISU_CD']:record for record in records}  
\ No newline at end of file
+        return self._fetch_records_sync(url, "ISU_CD", date)
@@ -0,0 +1,222 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Literal, Iterable, Dict, Tuple, Any
+from src.krx_client import KrxStockClient, KrxFetchResult, KrxApiError, KRX_RATE_LIMIT_FILE
+from src.cache import BaseCache, KrxStockInfoCache, KrxStockPriceCache, KrxNegativeCache
+from src.store import KrxMarketStore
+from src.resolver import BaseResolver, get_default_resolver
+from src.schemas.schema import ToolRequestModel
+from src.utils import get_latest_open_date, LOGGER
+
+
+class KrxStockLibrary:
+    """
+    Synchronous facade of the resolver, the caches, the on-disk store and the KRX client
+    for batch jobs running without an MCP server.
+    Market-days are read from the cache, then the store, then KRX API, and fetched ones are saved
+    into the same store as the server. Many (date, market) pairs are fetched in parallel on a thread pool,
+    each thread with its own pooled requests session, while the rate limit stays shared.
+    """
+    library_name = "Library"
+    market_code = ["stk", "ksq", "knx"]
+
+    def __init__(
+            self,
+            store_dir: str = "./store",
+            snapshot_interval: int = 20,
+            si_cache_size: int = 10,
+            sp_cache_size: int = 10,
+            cache_policy: Literal["lru", "slru", "tinylfu"] = "lru",
+            max_workers: int = 8,
+            rate_limit: float = 5.0,
+            burst: int = 5,
+            max_retries: int = 3,
+            timeout: float = 5.0,
+            negative_cache_ttl: float = 600.0,
+            negative_cache_holiday_ttl: float = 86400.0
+        ):
+        if max_workers < 1:
+            raise ValueError(f"[{self.library_name}] The 'max_workers' must be larger than 0")
+
+        self.client = KrxStockClient(
+            rate_limit=rate_limit,
+            burst=burst,
+            max_retries=max_retries,
+            timeout=timeout,
+            rate_limit_file=os.path.join(store_dir, KRX_RATE_LIMIT_FILE)
+        )
+        self.store = KrxMarketStore(root=store_dir, snapshot_interval=snapshot_interval)
+        self.si_cache = KrxStockInfoCache(max_size=si_cache_size, policy=cache_policy)
+        self.sp_cache = KrxStockPriceCache(max_size=sp_cache_size, policy=cache_policy)
+        self.negative_cache = KrxNegativeCache(
+            transient_ttl=negative_cache_ttl, holiday_ttl=negative_cache_holiday_ttl
+        )
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="krx-stock-library")
+        # The caches are not thread-safe; the lock also guards the loads in progress
+        self._lock = threading.Lock()
+        self._loading: Dict[Tuple[str, str, str], Future] = {}
+
+    @classmethod
+    def from_args(cls, args, max_workers: int = 8) -> "KrxStockLibrary":
+        """Build a library with the store and cache settings of the server arguments ('main.parse_args')"""
+        return cls(
+            store_dir=args.store_dir,
+            snapshot_interval=args.store_snapshot_interval,
+            si_cache_size=args.si_cache_size,
+            sp_cache_size=args.sp_cache_size,
+            cache_policy=args.cache_policy,
+            max_workers=max_workers,
+            rate_limit=args.krx_rate_limit,
+            burst=args.krx_burst,
+            max_retries=args.krx_max_retries,
+            timeout=args.krx_timeout,
+            negative_cache_ttl=args.negative_cache_ttl,
+            negative_cache_holiday_ttl=args.negative_cache_holiday_ttl,
+        )
+
+    def __enter__(self) -> "KrxStockLibrary":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the thread pool and close the pooled sessions"""
+        self._pool.shutdown(wait=True)
+        self.client.close_sync()
+
+    @property
+    def resolver(self) -> BaseResolver:
+        """Resolver shared with the server code running in this process, built on first use"""
+        return get_default_resolver()
+
+    def _cache(self, endpoint: Literal["info", "price"]) -> BaseCache:
+        if endpoint == "info":
+            return self.si_cache
+        if endpoint == "price":
+            return self.sp_cache
+        raise ValueError(f"[{self.library_name}] Endpoint must be the one of 'info' or 'price'")
+
+    def resolve(
+            self,
+            stock: Optional[str] = None,
+            ticker: Optional[str] = None,
+            market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = "알수없음"
+        ) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve a stock name or a ticker into (ticker, market code)"""
+        return self._resolve(ToolRequestModel(stock=stock, ticker=ticker, market=market))
+
+    def _resolve(self, request: ToolRequestModel) -> Tuple[Optional[str], Optional[str]]:
+        if request.ticker:
+            return self.resolver.resolve_code(request.ticker, request.market)
+        return self.resolver.resolve_stock(request.stock, request.market)
+
+    def load(self, endpoint: Literal["info", "price"], date: str, market: str) -> KrxFetchResult:
+        """
+        Load a market-day from the cache, the store or KRX API, in that order.
+        Threads loading the same market-day at once share a single load.
+        """
+        cache = self._cache(endpoint)
+        if market not in self.market_code:
+            raise ValueError(f"[{self.library_name}] Market must be the one of {self.market_code}")
+
+        key = (endpoint, date, market)
+        with self._lock:
+            if reason := self.negative_cache.get(date, market):
+                return KrxFetchResult(status="empty", error=reason)
+            day = cache.get_day(date, market)
+            if day is not None:
+                return KrxFetchResult(status="ok", records=day)
+            future = self._loading.get(key)
+            if future is None:
+                future = self._loading[key] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return future.result()
+        try:
+            result = self._load_uncached(endpoint, date, market, cache)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._loading[key]
+
+    def _load_uncached(
+            self,
+            endpoint: Literal["info", "price"],
+            date: str,
+            market: str,
+            cache: BaseCache
+        ) -> KrxFetchResult:
+        entries = self.store.load(endpoint, date, market)
+        if entries is None:
+            if endpoint == "info":
+                result = self.client.fetch_stock_info_sync(date, market)
+            else:
+                result = self.client.fetch_stock_price_sync(date, market)
+            if result.status == "empty":
+                with self._lock:
+                    reason = self.negative_cache.push(date, market)
+                return KrxFetchResult(status="empty", error=reason)
+            if not result.ok:
+                return result
+            # Failures and empty days must never be stored as real data
+            self.store.save(endpoint, date, market, result.records)
+            entries = result.records
+
+        with self._lock:
+            cache.push(date, market, entries)
+        return KrxFetchResult(status="ok", records=entries)
+
+    def load_many(
+            self,
+            endpoint: Literal["info", "price"],
+            pairs: Iterable[Tuple[str, str]]
+        ) -> Dict[Tuple[str, str], KrxFetchResult]:
+        """Load many (date, market) pairs in parallel on the thread pool"""
+        futures = {pair: self._pool.submit(self.load, endpoint, *pair) for pair in dict.fromkeys(pairs)}
+        results = {pair: future.result() for pair, future in futures.items()}
+        LOGGER.info(
+            f"[{self.library_name}] Loaded {sum(result.ok for result in results.values())}/{len(results)} "
+            f"{endpoint} market-days"
+        )
+        return results
+
+    def _get_entry(self, endpoint: Literal["info", "price"], request: ToolRequestModel) -> Optional[Dict[str, Any]]:
+        ticker, mkt_code = self._resolve(request)
+        if not mkt_code:
+            return None
+
+        result = self.load(endpoint, request.date or get_latest_open_date(), mkt_code)
+        if result.status == "error":
+            raise KrxApiError(result.error)
+        entry = result.records.get(ticker)
+        return dict(entry) if entry is not None else None
+
+    def get_stock_info(
+            self,
+            stock: Optional[str] = None,
+            ticker: Optional[str] = None,
+            market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = "알수없음",
+            date: Optional[str] = None
+        ) -> Optional[Dict[str, Any]]:
+        """Basic stock information of a day. Return None if the stock or its trading data is not found."""
+        return self._get_entry("info", ToolRequestModel(stock=stock, ticker=ticker, market=market, date=date))
+
+    def get_stock_price(
+            self,
+            stock: Optional[str] = None,
+            ticker: Optional[str] = None,
+            market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = "알수없음",
+            date: Optional[str] = None
+        ) -> Optional[Dict[str, Any]]:
+        """Stock price of a day. Return None if the stock or its trading data is not found."""
+        return self._get_entry("price", ToolRequestModel(stock=stock, ticker=ticker, market=market, date=date))
@@ -0,0 +1,96 @@
+import time
+from collections import Counter
+from typing import Optional, Dict, List, Any
+from src.utils import LOGGER
+
+from fastmcp import FastMCP
+from mcp.types import SubscriptionsListenRequestParams
+from mcp.server.subscriptions import InMemorySubscriptionBus, ListenHandler, ResourceUpdated
+
+
+LATEST_DAY_URI = "krx://latest"
+LATEST_TICKER_URI = "krx://latest/{market}/{ticker}"
+
+
+class _CountingListenHandler(ListenHandler):
+    """ListenHandler which counts the resource URIs of the open listen streams"""
+
+    def __init__(self, bus: InMemorySubscriptionBus):
+        super().__init__(bus)
+        self.subscriptions: Counter = Counter()
+
+    async def __call__(self, ctx, params: SubscriptionsListenRequestParams):
+        uris = list(params.notifications.resource_subscriptions or ())
+        self.subscriptions.update(uris)
+        try:
+            return await super().__call__(ctx, params)
+        finally:
+            self.subscriptions.subtract(uris)
+            self.subscriptions += Counter()
+
+
+class KrxLatestDayNotifier:
+    """
+    Push 'new trading day available' events to MCP clients instead of having them poll the tools.
+    Clients listen to 'krx://latest' and optionally to 'krx://latest/{market}/{ticker}'
+    through 'subscriptions/listen', and read the resource again when it is updated.
+    """
+    notifier_name = "Latest-Day-Notifier"
+
+    def __init__(self, latest_date: Optional[str] = None):
+        self.bus = InMemorySubscriptionBus()
+        self.listen_handler = _CountingListenHandler(self.bus)
+        self.latest_date = latest_date
+        self.markets: Dict[str, Dict[str, bool]] = {}
+        self.published_at: Optional[float] = None
+
+    def attach(self, mcp: FastMCP) -> None:
+        """Serve 'subscriptions/listen' on the MCP server"""
+        # FastMCP has no public hook for 'subscriptions/listen': it is a spec method, which
+        # 'ServerExtension' method bindings refuse, and FastMCP builds the low-level server
+        # without 'on_subscriptions_listen'. Hence the low-level server is reached directly,
+        # with fastmcp and mcp pinned to the exact versions this was tested against (pyproject.toml):
+        # '_mcp_server' is private and may change in any release, even a minor one.
+        server = getattr(mcp, "_mcp_server", None)
+        if server is None or server.get_request_handler("subscriptions/listen") is not None:
+            raise RuntimeError(f"[{self.notifier_name}] Cannot serve 'subscriptions/listen' on this FastMCP version")
+        server.add_request_handler(
+            "subscriptions/listen", SubscriptionsListenRequestParams, self.listen_handler
+        )
+
+    def close(self) -> None:
+        """End every open listen stream gracefully"""
+        self.listen_handler.close()
+
+    def event(self) -> Dict[str, Any]:
+        """Compact event of the latest trading day"""
+        return {
+            "date": self.latest_date,
+            "markets": self.markets,
+            "published_at": self.published_at,
+        }
+
+    def subscribed_tickers(self, market: str) -> List[str]:
+        """Tickers of a market which at least one open listen stream subscribed to"""
+        prefix = LATEST_TICKER_URI.format(market=market, ticker="")
+        return [
+            uri[len(prefix):] for uri in self.listen_handler.subscriptions
+            if uri.startswith(prefix)
+        ]
+
+    async def publish(self, date: str, markets: Dict[str, Dict[str, bool]]) -> None:
+        """Publish a new trading day, then the deltas of the subscribed tickers of its priced markets"""
+        self.latest_date = date
+        self.markets = markets
+        self.published_at = time.time()
+        await self.bus.publish(ResourceUpdated(uri=LATEST_DAY_URI))
+
+        updated = 0
+        for market, endpoints in markets.items():
+            if not endpoints.get("price"):
+                continue
+            for ticker in self.subscribed_tickers(market):
+                await self.bus.publish(ResourceUpdated(uri=LATEST_TICKER_URI.format(market=market, ticker=ticker)))
+                updated += 1
+
+        LOGGER.info(f"[{self.notifier_name}] Published {date} with {updated} ticker updates")
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+from datetime import datetime
+from collections import Counter
+from typing import Dict, Any
+from src.utils import LOGGER
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+class KrxSamplingProfiler:
+    """
+    Sampling profiler of the live server.
+    A background thread samples the stack of every other thread each 'interval' seconds
+    and the samples are dumped in the collapsed stack format ('frame;frame;frame count'),
+    which flamegraph.pl, speedscope and inferno read as is.
+    """
+    profiler_name = "Profiler"
+    max_seconds = 300.0
+
+    def __init__(self, profile_dir: str = "./profiles", interval: float = 0.005):
+        self.profile_dir = Path(profile_dir)
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def sample(self, seconds: float) -> Counter:
+        """Sample the stacks of every other thread for 'seconds' seconds"""
+        stacks: Counter = Counter()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        sampler = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == sampler:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(self._frame_name(frame))
+                    frame = frame.f_back
+                frames.append(names.get(ident, f"thread-{ident}"))
+                stacks[";".join(reversed(frames))] += 1
+            time.sleep(self.interval)
+        return stacks
+
+    def _run(self, seconds: float) -> Dict[str, Any]:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError(f"[{self.profiler_name}] Another profile is running")
+        try:
+            LOGGER.info(f"[{self.profiler_name}] Profiling for {seconds}s")
+            stacks = self.sample(seconds)
+        finally:
+            self._lock.release()
+
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        path = self.profile_dir / f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.folded"
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()), encoding="utf-8")
+        LOGGER.info(f"[{self.profiler_name}] Dumped {sum(stacks.values())} samples to {path}")
+        return {
+            "path": str(path.resolve()),
+            "seconds": seconds,
+            "samples": sum(stacks.values()),
+            "stacks": len(stacks),
+        }
+
+    async def profile(self, seconds: float) -> Dict[str, Any]:
+        """Profile the server for 'seconds' seconds from a background thread and dump the collapsed stacks"""
+        if not 0 < seconds <= self.max_seconds:
+            raise ValueError(f"[{self.profiler_name}] 'seconds' must be in (0, {self.max_seconds}]")
+        return await asyncio.to_thread(self._run, seconds)
@@ -0,0 +1,234 @@
+import sys
+import asyncio
+import contextvars
+from contextlib import nullcontext
+from weakref import WeakValueDictionary
+from typing import Optional, Literal, Union, Dict, Tuple, Any
+from src.krx_client import KrxStockClient, KrxFetchResult
+from src.cache import KrxNegativeCache, MarketDay, as_market_day
+from src.store import KrxMarketStore, SharedMarketDay
+from src.tracing import KrxTracer, span
+from src.utils import LOGGER
+
+
+class _Records(dict):
+    """Records of a market-day. A dict subclass so that the registry can reference it weakly."""
+    __slots__ = ("__weakref__",)
+
+
+class _SharedFetch:
+    """A KRX API fetch of a market-day shared by every request waiting for it"""
+    __slots__ = ("task", "waiters", "trace_id")
+
+    def __init__(self):
+        self.task: Optional["asyncio.Task[KrxFetchResult]"] = None
+        self.waiters: int = 0
+        self.trace_id: Optional[str] = None
+
+
+class KrxMarketDataRegistry:
+    """
+    Single source of market-day payloads for every tool.
+    Each (endpoint, date, market) payload is held once and shared by reference with the caches;
+    it is dropped from the registry when no cache references it anymore.
+    String fields repeated across days and endpoints are interned on ingest.
+    Concurrent loads of a market-day missing from the store share a single KRX API fetch,
+    which is cancelled as soon as the last request waiting for it is cancelled.
+    A shared fetch runs in a context of its own and is traced as its own request ('krx.fetch'),
+    linked from the 'registry.wait' span of every request waiting for it.
+    With 'shared', market-days are held as SharedMarketDay memory-mapped from the store,
+    so that worker processes share a single copy of the records.
+    """
+    registry_name = "Market-Data-Registry"
+    interned_fields = frozenset({
+        "BAS_DD", "ISU_CD", "ISU_SRT_CD", "ISU_NM", "ISU_ABBRV", "ISU_ENG_NM", "LIST_DD",
+        "MKT_NM", "MKT_TP_NM", "SECUGRP_NM", "SECT_TP_NM", "KIND_STKCERT_TP_NM", "PARVAL",
+    })
+
+    def __init__(
+            self,
+            client: KrxStockClient,
+            store: KrxMarketStore,
+            negative_cache: KrxNegativeCache,
+            tracer: Optional[KrxTracer] = None,
+            shared: bool = False
+        ):
+        self.client = client
+        self.store = store
+        self.negative_cache = negative_cache
+        self.tracer = tracer
+        self.shared = shared
+        self._days: WeakValueDictionary[Tuple[str, str, str], Union[_Records, SharedMarketDay]] = WeakValueDictionary()
+        self._fetches: Dict[Tuple[str, str, str], _SharedFetch] = {}
+        self.shared_fetches: int = 0
+        self.cancelled_fetches: int = 0
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def is_cold(self, endpoint: Literal["info", "price"], date: str, market: str) -> bool:
+        """Check if loading the market-day has to fetch it from KRX API"""
+        return (
+            self.negative_cache.get(date, market) is None
+            and (endpoint, date, market) not in self._days
+            and (endpoint, date, market) not in self._fetches
+            and not self.store.has(endpoint, date, market)
+        )
+
+    def _load_stored(
+            self,
+            endpoint: Literal["info", "price"],
+            date: str,
+            market: str
+        ) -> Optional[Union[Dict[str, Dict[str, Any]], SharedMarketDay]]:
+        if self.shared:
+            return self.store.load_shared(endpoint, date, market)
+        return self.store.load(endpoint, date, market)
+
+    def peek(
+            self,
+            endpoint: Literal["info", "price"],
+            date: str,
+            market: str
+        ) -> Optional[MarketDay]:
+        """
+        Return a market-day held by the registry or stored on disk, without fetching it from KRX API.
+        A stored market-day is returned as is, without being registered.
+        """
+        if self.negative_cache.get(date, market):
+            return None
+        if (records := self._days.get((endpoint, date, market))) is not None:
+            return as_market_day(records)
+        entries = self._load_stored(endpoint, date, market)
+        return as_market_day(entries) if entries is not None else None
+
+    async def load(
+            self,
+            endpoint: Literal["info", "price"],
+            date: str,
+            market: str
+        ) -> KrxFetchResult:
+        """Load a market-day from the registry, the shared store or KRX API, in that order"""
+        if reason := self.negative_cache.get(date, market):
+            return KrxFetchResult(status="empty", error=reason)
+
+        key = (endpoint, date, market)
+        if (records := self._days.get(key)) is not None:
+            LOGGER.info(f"[{self.registry_name}] Shared {key} from the registry")
+            return KrxFetchResult(status="ok", records=as_market_day(records))
+
+        if (shared := self._fetches.get(key)) is not None:
+            self.shared_fetches += 1
+            LOGGER.info(f"[{self.registry_name}] Joined the running fetch of {key}")
+            return await self._wait(key, shared)
+
+        # Reading and decoding a stored market-day takes milliseconds, so it runs off the event loop
+        with span("store.load", endpoint=endpoint, date=date, market=market) as stage:
+            entries = await asyncio.to_thread(self._load_stored, endpoint, date, market)
+            if stage is not None:
+                stage.set(hit=entries is not None)
+        if entries is not None:
+            with span("registry.register", records=len(entries)):
+                return KrxFetchResult(status="ok", records=await self._register(key, entries))
+
+        # Another request may have started the fetch or registered the day while the store was read
+        if (records := self._days.get(key)) is not None:
+            return KrxFetchResult(status="ok", records=as_market_day(records))
+        if (shared := self._fetches.get(key)) is not None:
+            self.shared_fetches += 1
+            return await self._wait(key, shared)
+
+        # A fresh context, so that the fetch never runs as part of the request which happened to start it
+        shared = _SharedFetch()
+        shared.task = asyncio.create_task(self._fetch(key, shared), context=contextvars.Context())
+        shared.task.add_done_callback(lambda _: self._forget(key, shared))
+        self._fetches[key] = shared
+        return await self._wait(key, shared)
+
+    async def _wait(self, key: Tuple[str, str, str], shared: _SharedFetch) -> KrxFetchResult:
+        """
+        Wait for a shared fetch. Cancelling a waiter never cancels the fetch for the others,
+        but the last waiter to be cancelled aborts the transfer and decoding nobody would read.
+        """
+        shared.waiters += 1
+        try:
+            with span("registry.wait", shared=shared.waiters > 1) as stage:
+                try:
+                    return await asyncio.shield(shared.task)
+                finally:
+                    if stage is not None:
+                        stage.set(fetch_trace_id=shared.trace_id)
+        except asyncio.CancelledError:
+            if shared.waiters == 1 and not shared.task.done():
+                shared.task.cancel()
+                self._forget(key, shared)
+                self.cancelled_fetches += 1
+                LOGGER.info(f"[{self.registry_name}] Cancelled the fetch of {key}: no request is waiting for it")
+            raise
+        finally:
+            shared.waiters -= 1
+
+    def _forget(self, key: Tuple[str, str, str], shared: _SharedFetch) -> None:
+        # A cancelled fetch is forgotten at once, so that a later load starts a new one
+        if self._fetches.get(key) is shared:
+            del self._fetches[key]
+
+    async def _fetch(self, key: Tuple[str, str, str], shared: _SharedFetch) -> KrxFetchResult:
+        """Fetch a market-day from KRX API, then store and register it"""
+        endpoint, date, market = key
+        trace = self.tracer.trace("krx.fetch", endpoint=endpoint, date=date, market=market) if self.tracer else nullcontext()
+        with trace as root:
+            if root is not None:
+                shared.trace_id = root.trace_id
+            if endpoint == "info":
+                result = await self.client.fetch_stock_info(date, market)
+            else:
+                result = await self.client.fetch_stock_price(date, market)
+
+            # Failures and empty days must never be stored as real data
+            if result.ok:
+                with span("store.save", endpoint=endpoint, date=date, market=market):
+                    await asyncio.to_thread(self.store.save, endpoint, date, market, result.records)
+                    # The fetched records are dropped for the copy every worker maps
+                    entries = await asyncio.to_thread(self.store.load_shared, *key) if self.shared else None
+                with span("registry.register", records=len(result.records)):
+                    return KrxFetchResult(status="ok", records=await self._register(key, entries or result.records))
+            if result.status == "empty":
+                reason = self.negative_cache.push(date, market)
+                return KrxFetchResult(status="empty", error=reason)
+            return result
+
+    def stats(self) -> Dict[str, int]:
+        """Registered market-days and the KRX API fetches shared or cancelled"""
+        return {
+            "market_days": len(self._days),
+            "running_fetches": len(self._fetches),
+            "shared_fetches": self.shared_fetches,
+            "cancelled_fetches": self.cancelled_fetches,
+        }
+
+    async def _register(
+            self,
+            key: Tuple[str, str, str],
+            entries: Union[Dict[str, Dict[str, Any]], SharedMarketDay]
+        ) -> MarketDay:
+        """Intern shared strings of a payload off the event loop and hold it as the single copy of the market-day"""
+        if isinstance(entries, SharedMarketDay):
+            records = entries
+        else:
+            records = await asyncio.to_thread(self._intern, entries)
+        # Another request may have registered the same market-day while this one was loading
+        records = self._days.setdefault(key, records)
+        LOGGER.info(f"[{self.registry_name}] Registered {key} ({len(records)} records)")
+        return as_market_day(records)
+
+    def _intern(self, entries: Dict[str, Dict[str, Any]]) -> _Records:
+        intern = sys.intern
+        fields = self.interned_fields
+        records = _Records()
+        for ticker, entry in entries.items():
+            records[intern(ticker)] = {
+                intern(field): intern(value) if field in fields and isinstance(value, str) else value
+                for field, value in entry.items()
+            }
+        return records
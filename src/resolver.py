@@ -1,49 +1,168 @@
 import re
 import json
+import bisect
+import threading
 from typing import (
-    Optional, Literal,Tuple, List, Dict, Set
+    Optional, Literal, Tuple, List, Dict, Set, Iterable
 )
 from abc import ABC, abstractmethod
-from rapidfuzz import process, fuzz
 
 from src.utils import LOGGER
 
+_CORPORATE_MARKERS = re.compile(r"\(주\)|㈜|주식회사")
+_NON_WORD = re.compile(r"[\W_]+")
+_ENGLISH_WORD = re.compile(r"[a-z0-9]+")
+_ENGLISH_SUFFIXES = frozenset({
+    "co", "company", "corp", "corporation", "inc", "incorporated", "incorporation", "ltd", "limited", "plc",
+})
+
+
+def _normalize_code(value: str) -> str:
+    """Codes (ISU_SRT_CD, ISU_CD) are compared upper-cased, without spaces"""
+    return "".join(value.split()).upper()
+
+
+def _normalize_name(value: str) -> str:
+    """Korean names (ISU_ABBRV, ISU_NM) are compared lower-cased, without spaces, punctuation and corporate markers"""
+    return _NON_WORD.sub("", _CORPORATE_MARKERS.sub("", value).lower())
+
+
+def _normalize_english(value: str) -> str:
+    """English names (ISU_ENG_NM) are compared lower-cased, without spaces, punctuation and trailing corporate suffixes"""
+    words = _ENGLISH_WORD.findall(value.lower())
+    while len(words) > 1 and words[-1] in _ENGLISH_SUFFIXES:
+        words.pop()
+    return "".join(words)
+
+
+def _is_preferred(stock: str) -> bool:
+    """Check if the stock is a preferred stock"""
+    if "우선주" in stock or stock[-1] == "우":
+        return True
+    if re.search(r"우[A-Z]$", stock):
+        return True
+    return False
+
+
+class KrxStockIndex:
+    """
+    Combined lookup index of the stocks of a market over ISU_SRT_CD, ISU_CD, ISU_ABBRV, ISU_NM and ISU_ENG_NM.
+    Each field is normalized on its own, and a key matching several fields resolves to the field listed first.
+    Names are also kept sorted, so that the names starting with a query form one contiguous range
+    (a flattened prefix trie searched by bisection).
+    """
+    # Field: (key in the data files, normalizer), in the order of priority
+    fields = {
+        "ISU_SRT_CD": ("short_code", _normalize_code),
+        "ISU_CD": ("standard_code", _normalize_code),
+        "ISU_ABBRV": ("name_abbr", _normalize_name),
+        "ISU_NM": ("name_kor", _normalize_name),
+        "ISU_ENG_NM": ("name_eng", _normalize_english),
+    }
+    code_fields = 2
+    max_completions = 256
+
+    def __init__(self, data: Dict[str, Dict[str, str]]):
+        self._exact: Dict[str, Tuple[int, str]] = {}
+        self.names: Dict[str, Tuple[str, ...]] = {}
+        self.preferred: Set[str] = set()
+        # Fuzzy pools of abbreviated names and English names, split into ordinary and preferred stocks
+        self._fuzzy: Dict[bool, Tuple[List[str], List[str]]] = {False: ([], []), True: ([], [])}
+        self._fuzzy_english: Dict[bool, Tuple[List[str], List[str]]] = {False: ([], []), True: ([], [])}
+
+        prefix: Dict[str, Tuple[int, str]] = {}
+        for stock, info in data.items():
+            ticker = info["short_code"]
+            preferred = _is_preferred(stock)
+            if preferred:
+                self.preferred.add(ticker)
+            self.names[ticker] = self.names.get(ticker, ()) + (info["name_abbr"].lower(),)
+
+            for rank, (source, normalize) in enumerate(self.fields.values()):
+                key = normalize(info.get(source) or "")
+                if not key:
+                    continue
+                if key not in self._exact or rank < self._exact[key][0]:
+                    self._exact[key] = (rank, ticker)
+                if rank >= self.code_fields and (key not in prefix or rank < prefix[key][0]):
+                    prefix[key] = (rank, ticker)
+
+            self._fuzzy[preferred][0].append(stock.lower())
+            self._fuzzy[preferred][1].append(ticker)
+            if english := _normalize_english(info.get("name_eng") or ""):
+                self._fuzzy_english[preferred][0].append(english)
+                self._fuzzy_english[preferred][1].append(ticker)
+
+        self._prefix_keys = sorted(prefix)
+        self._prefix_values = [prefix[key] for key in self._prefix_keys]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, code: Optional[str], names: Iterable[str]) -> Optional[Tuple[int, str]]:
+        """Exact match of a normalized code or names. Return the field rank and the ticker."""
+        hits = []
+        if code and (hit := self._exact.get(code)) is not None and hit[0] < self.code_fields:
+            hits.append(hit)
+        for name in names:
+            if (hit := self._exact.get(name)) is not None and hit[0] >= self.code_fields:
+                hits.append(hit)
+        return min(hits) if hits else None
+
+    def complete(self, names: Iterable[str], preferred: bool) -> List[Tuple[int, int, str]]:
+        """
+        Names starting with the normalized names, as (name length, field rank, ticker).
+        Only ordinary or only preferred stocks are completed, and none if a prefix is too common.
+        """
+        completions = []
+        for name in names:
+            start = bisect.bisect_left(self._prefix_keys, name)
+            end = start
+            while end < len(self._prefix_keys) and self._prefix_keys[end].startswith(name):
+                end += 1
+                if end - start > self.max_completions:
+                    return []
+            for key, (rank, ticker) in zip(self._prefix_keys[start:end], self._prefix_values[start:end]):
+                if (ticker in self.preferred) == preferred:
+                    completions.append((len(key), rank, ticker))
+        return completions
+
+    def fuzzy(
+            self,
+            stock: str,
+            preferred: bool,
+            english: Optional[str],
+            scorer
+        ) -> Tuple[Optional[str], float]:
+        """Most similar abbreviated name, or English name for English queries. Return the ticker and the score."""
+        ticker, best = None, -1.0
+        pools = [(stock.lower(), self._fuzzy[preferred])]
+        if english:
+            pools.append((english, self._fuzzy_english[preferred]))
+        for query, (names, tickers) in pools:
+            _, score, index = scorer(query, names)
+            if score > best:
+                ticker, best = tickers[index], score
+        return ticker, best
+
+
 class BaseResolver(ABC):
 
     market_name = ["코스피", "코스닥", "코넥스"]
+    market_code = {"코스피": "stk", "코스닥": "ksq", "코넥스": "knx"}
 
     def __init__(self):
-        self.stk_stock_to_ticker = {}
-        self.ksq_stock_to_ticker = {}
-        self.knx_stock_to_ticker = {}
-
-        self.stk_ticker_to_stock = {}
-        self.ksq_ticker_to_stock = {}
-        self.knx_ticker_to_stock = {}
-
-        self.stk_ord_stocks, self.stk_pre_stocks = [], []
-        self.ksq_ord_stocks, self.ksq_pre_stocks = [], []
-        self.knx_ord_stocks, self.knx_pre_stocks = [], []
+        self.indexes: Dict[str, KrxStockIndex] = self._set_indexes()
+        self.lookups: Dict[str, int] = {"exact": 0, "prefix": 0, "fuzzy": 0, "miss": 0}
 
     @abstractmethod
-    def _set_stock_list(self, file: str):
-        pass
-
-    @abstractmethod
-    def _set_stock_to_ticker(self, file: str):
-        pass
-
-    @abstractmethod
-    def _set_ticker_to_stock(self, file: str):
+    def _set_indexes(self) -> Dict[str, KrxStockIndex]:
+        """Build the lookup index of each market code"""
         pass
 
     def _check_preferred_stocks(self, stock: str) -> bool:
         """ Check if the stock is a preferred stock"""
-        if "우선주" in stock or stock[-1] == "우":
-            return True
-        if re.search(r"우[A-Z]$", stock):
-            return True
-        return False
+        return _is_preferred(stock)
 
     def _get_most_similar_stock(
             self,
@@ -51,68 +170,81 @@ class BaseResolver(ABC):
             stocks: List[str]
         ) -> Tuple[str, float, int]:
         """ Get the most similar stock with RapidFuzz """
+        from rapidfuzz import process, fuzz
+
         if not stocks:
             return ("", -1, -1)
-        candidates = process.extract(target.lower(), stocks, scorer=fuzz.ratio)
-        return candidates[0]
+        return process.extractOne(target, stocks, scorer=fuzz.ratio)
+
+    def _market_indexes(
+            self,
+            market: Literal["코스피", "코스닥", "코넥스", "알수없음"]
+        ) -> List[Tuple[str, KrxStockIndex]]:
+        markets = [market] if market != "알수없음" else self.market_name
+        return [
+            (self.market_code[name], self.indexes[self.market_code[name]])
+            for name in markets if self.market_code[name] in self.indexes
+        ]
+
+    def _resolved(self, stock: str, how: str, ticker: Optional[str], market: Optional[str]) -> Tuple[str, str]:
+        self.lookups[how] += 1
+        LOGGER.info(f"[Resolver] Resolved '{stock}' to '{ticker}' in {market} ({how} match).")
+        return ticker, market
 
     def resolve_stock(
             self,
             stock: str,
             market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = "알수없음"
         ) -> Tuple[str, str]:
-        """ Resolve stock by stock name and return a ticker """
+        """
+        Resolve stock by its abbreviated, full or English name, or by its code, and return a ticker.
+        Exact matches are tried first, then unambiguous prefixes of names, and fuzzy matching only after both.
+        """
         LOGGER.info(f"[Resolver] Resolving by stock name: {stock}")
-        markets = [market] if market != "알수없음" else self.market_name
+        indexes = self._market_indexes(market)
+        code = _normalize_code(stock)
+        english = _normalize_english(stock) if stock.isascii() else None
+        names = [name for name in dict.fromkeys((_normalize_name(stock), english)) if name]
+
+        # Lower field rank first; markets keep their order on ties
+        hits = [(hit, mkt_code) for mkt_code, index in indexes if (hit := index.lookup(code, names))]
+        if hits:
+            (_, ticker), mkt_code = min(hits, key=lambda hit: hit[0][0])
+            return self._resolved(stock, "exact", ticker, mkt_code)
+
+        preferred = self._check_preferred_stocks(stock)
+        completions = [
+            (length, ticker, mkt_code)
+            for mkt_code, index in indexes
+            for length, _, ticker in index.complete([name for name in names if len(name) > 1], preferred)
+        ]
+        if completions:
+            shortest = min(length for length, _, _ in completions)
+            candidates = {(ticker, mkt_code) for length, ticker, mkt_code in completions if length == shortest}
+            if len(candidates) == 1:
+                return self._resolved(stock, "prefix", *candidates.pop())
+
+        max_score, resolved = 0, (None, None)
+        for mkt_code, index in indexes:
+            ticker, score = index.fuzzy(stock, preferred, english, self._get_most_similar_stock)
+            if score > max_score:
+                max_score, resolved = score, (ticker, mkt_code)
+        return self._resolved(stock, "fuzzy" if resolved[0] else "miss", *resolved)
+
+    def resolve_code(
+            self,
+            ticker: str,
+            market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = "알수없음"
+        ) -> Tuple[Optional[str], Optional[str]]:
+        """ Resolve a short code (ISU_SRT_CD) or an ISIN (ISU_CD) and return the short code and the market code """
+        code = _normalize_code(ticker)
+        for mkt_code, index in self._market_indexes(market):
+            hit = index.lookup(code, ())
+            if hit is not None:
+                return hit[1], mkt_code
 
-        max_score = 0
-        resolved_stock: str = None
-        resolved_market: tuple = (None, None)
-        resolved_ticker: str = None
-
-        for market in markets:
-            match market:
-                case "코스피":
-                    if self._check_preferred_stocks(stock):
-                        pool = self.stk_pre_stocks
-                    else:
-                        pool = self.stk_ord_stocks
-                    name, score, _ = self._get_most_similar_stock(stock, pool)
-
-                    if score > max_score:
-                        max_score = score
-                        resolved_stock = name
-                        resolved_market = ("stk","KOSPI")
-                        resolved_ticker = self.stk_stock_to_ticker[resolved_stock]
-
-                case "코스닥":
-                    if self._check_preferred_stocks(stock):
-                        pool = self.ksq_pre_stocks
-                    else:
-                        pool = self.ksq_ord_stocks
-                    name, score, _ = self._get_most_similar_stock(stock, pool)
-
-                    if score > max_score:
-                        max_score = score
-                        resolved_stock = name
-                        resolved_market = ("ksq","KOSDAQ")
-                        resolved_ticker = self.ksq_stock_to_ticker[resolved_stock]
-
-                case "코넥스":
-                    if self._check_preferred_stocks(stock):
-                        pool = self.knx_pre_stocks
-                    else:
-                        pool = self.knx_ord_stocks
-                    name, score, _ = self._get_most_similar_stock(stock, pool)
-
-                    if score > max_score:
-                        max_score = score
-                        resolved_stock = name
-                        resolved_market = ("knx","KONEX")
-                        resolved_ticker = self.knx_stock_to_ticker[resolved_stock]
-
-        LOGGER.info(f"[Resolver] Resolved '{stock}' to '{resolved_stock}' in {resolved_market[1]}.")
-        return resolved_ticker, resolved_market[0]
+        LOGGER.info(f"[Resolver] Failed to resolve a ticker '{ticker}'.")
+        return None, None
 
     def resolve_ticker(
             self,
@@ -120,52 +252,26 @@ class BaseResolver(ABC):
             market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = "알수없음"
         ) -> Tuple[Optional[Tuple[str, ...]], Optional[str]]:
         """ Resolve stock by ticker """
-        markets = [market] if market != "알수없음" else self.market_name
-
-        for market in markets:
-            match market:
-                case "코스피":
-                    stocks: tuple = self.stk_ticker_to_stock.get(ticker)
-                    if stocks:
-                        return (stocks, "stk")
-
-                case "코스닥":
-                    stocks: tuple = self.ksq_ticker_to_stock.get(ticker)
-                    if stocks:
-                        return (stocks, "ksq")
-
-                case "코넥스":
-                    stocks: tuple = self.knx_ticker_to_stock.get(ticker)
-                    if stocks:
-                        return (stocks, "knx")
-
-        LOGGER.info(f"[Resolver] Failed to resolve a ticker '{ticker}'.")
-        return None, None
+        code, mkt_code = self.resolve_code(ticker, market)
+        if mkt_code is None:
+            return None, None
+        return self.indexes[mkt_code].names.get(code), mkt_code
 
 
 class KrxStockInfoResolver(BaseResolver):
 
     resolver_name = "Stock-Info-Resolver"
+    files = {
+        "stk": "./data/stock_info_kospi.json",
+        "ksq": "./data/stock_info_kosdaq.json",
+        "knx": "./data/stock_info_konex.json",
+    }
 
-    def __init__(self):
-        super().__init__()
-        stk_data = self._load_file('./data/stock_info_kospi.json')
-        ksq_data = self._load_file('./data/stock_info_kosdaq.json')
-        knx_data = self._load_file('./data/stock_info_konex.json')
-
-        self.stk_stock_to_ticker = self._set_stock_to_ticker(stk_data)
-        self.ksq_stock_to_ticker = self._set_stock_to_ticker(ksq_data)
-        self.knx_stock_to_ticker = self._set_stock_to_ticker(knx_data)
-
-        self.stk_ticker_to_stock = self._set_ticker_to_stock(stk_data)
-        self.ksq_ticker_to_stock = self._set_ticker_to_stock(ksq_data)
-        self.knx_ticker_to_stock = self._set_ticker_to_stock(knx_data)
-
-        self.stk_ord_stocks, self.stk_pre_stocks = self._set_stock_list(stk_data)
-        self.ksq_ord_stocks, self.ksq_pre_stocks = self._set_stock_list(ksq_data)
-        self.knx_ord_stocks, self.knx_pre_stocks = self._set_stock_list(knx_data)
+    def _set_indexes(self) -> Dict[str, KrxStockIndex]:
+        """ Build the lookup index of each market from the stock information files """
+        return {market: KrxStockIndex(self._load_file(file)) for market, file in self.files.items()}
 
-    def _load_file(self, file: str) -> Dict[str, str]:
+    def _load_file(self, file: str) -> Dict[str, Dict[str, str]]:
         """ Load a JSON file """
         try:
             with open(file, 'r', encoding='utf-8') as file:
@@ -175,112 +281,29 @@ class KrxStockInfoResolver(BaseResolver):
             LOGGER.error(f"[{self.resolver_name}] Failed to open the JSON file: {file}")
             return {}
 
-    def _set_stock_list(
-            self,
-            data: Dict[str, Dict[str, str]]
-        ) -> Tuple[List[str], List[str]]:
-        """ Set ordinary stock list and preferred stock list """
-        ord_stock_lst = []
-        pre_stock_lst = []
-        for stock, _ in data.items():
-            if stock[-1] == "우" or re.search(r"우[A-Z]$", stock):
-                pre_stock_lst.append(stock.lower())
-            else:
-                ord_stock_lst.append(stock.lower())
-        return ord_stock_lst, pre_stock_lst
-
-    def _set_stock_to_ticker(
-            self,
-            data: Dict[str, Dict[str, str]]
-        ) -> Tuple[Dict[str, str], Dict[str, str]]:
-        """ Set table mapping stock name to ticker """
-        stock_to_ticker = {}
-        for stock, info in data.items():
-            ticker = info['short_code']
-            stock_to_ticker[stock.lower()] = ticker
-        return stock_to_ticker
-
-    def _set_ticker_to_stock(
-        self,
-        data: Dict[str, Dict[str, str]]
-    ) -> Dict[str, Tuple[str, ...]]:
-        """Set table mapping stock name to tuple of tickers"""
-        ticker_to_stock: Dict[str, Tuple[str, ...]] = {}
-        for _, info in data.items():
-            stock = info['name_abbr']
-            ticker = info['short_code']
-            if stock not in ticker_to_stock:
-                ticker_to_stock[ticker] = (stock.lower(),)
-            else:
-                ticker_to_stock[ticker] += (stock.lower(),)
-        return ticker_to_stock
-
-
-class KrxStockPriceResolver(BaseResolver):
-
-    resolver_name = "Stock-Price-Resolver"
-
-    def __init__(self):
-        super().__init__()
-        stk_data = self._load_file('./data/stock_price_kospi.json')
-        ksq_data = self._load_file('./data/stock_price_kosdaq.json')
-        knx_data = self._load_file('./data/stock_price_konex.json')
-
-        self.stk_stock_to_ticker = self._set_stock_to_ticker(stk_data)
-        self.ksq_stock_to_ticker = self._set_stock_to_ticker(ksq_data)
-        self.knx_stock_to_ticker = self._set_stock_to_ticker(knx_data)
-
-        self.stk_ticker_to_stock = self._set_ticker_to_stock(stk_data)
-        self.ksq_ticker_to_stock = self._set_ticker_to_stock(ksq_data)
-        self.knx_ticker_to_stock = self._set_ticker_to_stock(knx_data)
 
-        self.stk_ord_stocks, self.stk_pre_stocks = self._set_stock_list(stk_data)
-        self.ksq_ord_stocks, self.ksq_pre_stocks = self._set_stock_list(ksq_data)
-        self.knx_ord_stocks, self.knx_pre_stocks = self._set_stock_list(knx_data)
-
-    def _load_file(self, file: str) -> Dict[str, str]:
-        """ Load a JSON file """
-        try:
-            with open(file, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                return data
-        except:
-            LOGGER.error(f"[{self.resolver_name}] Failed to open the JSON file: {file}")
-            return {}
-
-    def _set_stock_list(
-            self,
-            data: Dict[str, Dict[str, str]]
-        ) -> Tuple[List[str], List[str]]:
-        """ Set ordinary stock list and preferred stock list """
-        ord_stocks = []
-        pre_stocks = []
-        for stock, _ in data.items():
-            if stock[-1] == "우" or re.search(r"우[A-Z]$", stock):
-                pre_stocks.append(stock.lower())
-            else:
-                ord_stocks.append(stock.lower())
-        return ord_stocks, pre_stocks
-
-    def _set_stock_to_ticker(
-            self,
-            data: Dict[str, str]
-        ) -> Tuple[Dict[str, str], Dict[str, str]]:
-        """ Set table mapping stock name to ticker """
-        stock_to_ticker = {}
-        for stock, ticker in data.items():
-            stock_to_ticker[stock.lower()] = ticker
-        return stock_to_ticker
-
-    def _set_ticker_to_stock(
-            self,
-            data: Dict[str, str]
-    ) -> Tuple[Dict[str, str], Dict[str, str]]:
-        """Set table mapping stock name to tuple of tickers"""
-        ticker_to_stock: Dict[str, Tuple[str, ...]] = {}
-        for stock, ticker in data.items():
-            if stock not in ticker_to_stock:
-                ticker_to_stock[ticker] = (stock.lower(),)
-            else:
-                ticker_to_stock[ticker] += (stock.lower(),)
-        return ticker_to_stock
\ No newline at end of file
+_DEFAULT_RESOLVER: Optional[BaseResolver] = None
+_DEFAULT_RESOLVER_LOCK = threading.Lock()
+
+def set_default_resolver(resolver: Optional[BaseResolver] = None) -> None:
+    """
+    Set the resolver used by 'resolve_stock_task'.
+    A new resolver is built when none is given (e.g. inside a pool process).
+    """
+    global _DEFAULT_RESOLVER
+    _DEFAULT_RESOLVER = resolver or KrxStockInfoResolver()
+
+def get_default_resolver() -> BaseResolver:
+    """ Return the resolver used by 'resolve_stock_task', building it once on first use """
+    if _DEFAULT_RESOLVER is None:
+        with _DEFAULT_RESOLVER_LOCK:
+            if _DEFAULT_RESOLVER is None:
+                set_default_resolver()
+    return _DEFAULT_RESOLVER
+
+def resolve_stock_task(
+        stock: str,
+        market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = "알수없음"
+    ) -> Tuple[str, str]:
+    """ Picklable entry point resolving a stock name inside an executor """
+    return get_default_resolver().resolve_stock(stock, market)
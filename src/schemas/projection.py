@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Optional, Type, Tuple, List, Dict, Mapping
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+
+class ProjectedSerializer:
+    """
+    Serializer of an output model projected onto a subset of its fields.
+    The projected model is built once per projection, so rows are validated and dumped
+    by pydantic-core without ever touching the fields left out.
+    """
+
+    def __init__(self, model: Type[BaseModel], fields: Optional[Tuple[str, ...]] = None):
+        if fields is None:
+            projected = model
+        else:
+            projected = create_model(
+                f"{model.__name__}[{','.join(fields)}]",
+                # Entries carry every field of the KRX payload; the ones left out are skipped, not copied
+                __config__=ConfigDict(extra="ignore"),
+                **{
+                    name: (info.annotation, info)
+                    for name, info in model.model_fields.items() if info.alias in fields
+                }
+            )
+        self.model = projected
+        self.fields = fields
+        self._rows = TypeAdapter(Dict[str, projected])
+
+    def dump(self, entry: Mapping[str, dict]) -> str:
+        """Serialize one entry"""
+        return self.model.model_validate(entry).model_dump_json(exclude_none=True)
+
+    def dump_rows(self, entries: Mapping[str, Mapping[str, dict]]) -> str:
+        """Serialize entries keyed by ticker or date into one JSON object in a single pass"""
+        rows = self._rows.validate_python(entries)
+        return self._rows.dump_json(rows, exclude_none=True).decode("utf-8")
+
+
+def projection_fields(model: Type[BaseModel], fields: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+    """
+    Normalize the requested fields into the aliases of the model, in the order of the model.
+    Return None if every field is requested. Raise ValueError on an unknown field.
+    """
+    if not fields:
+        return None
+
+    aliases = [info.alias for info in model.model_fields.values()]
+    requested = {field.upper() for field in fields}
+    unknown = requested.difference(aliases)
+    if unknown:
+        raise ValueError(f"Unknown fields: {sorted(unknown)} (one of {aliases})")
+    if len(requested) == len(aliases):
+        return None
+    return tuple(alias for alias in aliases if alias in requested)
+
+
+@lru_cache(maxsize=128)
+def _get_serializer(model: Type[BaseModel], fields: Optional[Tuple[str, ...]]) -> ProjectedSerializer:
+    return ProjectedSerializer(model, fields)
+
+
+def get_serializer(model: Type[BaseModel], fields: Optional[List[str]] = None) -> ProjectedSerializer:
+    """Serializer of the model projected onto the requested fields, compiled on first use of the projection"""
+    return _get_serializer(model, projection_fields(model, fields))
@@ -1,18 +1,51 @@
+import re
 from datetime import datetime
-from typing import Optional, Literal
+from typing import Optional, Literal, List
 from pydantic import (
     BaseModel, Field, field_validator, model_validator
 )
 
+
+def _validate_ticker(ticker: Optional[str]) -> Optional[str]:
+    if not ticker:
+        return ticker
+    ticker = ticker.strip().upper()
+    # Short codes (ISU_SRT_CD) may carry letters, e.g. '03473K'
+    if len(ticker) == 6 and ticker.isalnum() and ticker.isascii() and any(c.isdigit() for c in ticker):
+        return ticker
+    # ISINs (ISU_CD) are resolved as a whole; foreign issuers are not 'KR', e.g. 'HK0000040383'
+    elif re.fullmatch(r"[A-Z]{2}[0-9A-Z]{9}[0-9]", ticker):
+        return ticker
+    else:
+        raise ValueError("The variable 'ticker' must be a short code ('000000') or an ISIN ('KR7000000000').")
+
+
+def _validate_date(date: Optional[str]) -> Optional[str]:
+    if date is None:
+        return date
+    try:
+        datetime.strptime(date, "%Y%m%d")
+    except ValueError:
+        raise ValueError("The variable 'date' must be in 'YYYYMMDD' format.")
+    return date
+
+
+FIELDS = Field(
+    default = None,
+    description = "응답에 포함할 항목 (예: 종가와 대비만 필요하면 ['TDD_CLSPRC', 'CMPPREVDD_PRC']). 생략하면 모든 항목을 반환",
+    examples = [["TDD_CLSPRC", "CMPPREVDD_PRC"]]
+)
+
+
 class ToolRequestModel(BaseModel):
     stock: Optional[str] = Field(
         default = None,
-        description = "정보를 조회하고자 하는 종목의 이름",
-        examples = ["삼성전자"]
+        description = "정보를 조회하고자 하는 종목의 이름 (약칭, 정식 명칭, 영문 이름 모두 가능)",
+        examples = ["삼성전자", "Samsung Electronics"]
     )
     ticker: Optional[str] = Field(
         default = None,
-        description = "정보를 조회하고자 하는 종목이 속한 주식 시장",
+        description = "정보를 조회하고자 하는 종목의 단축코드 또는 표준코드(ISIN)",
         examples = ["005930", "KR7338100001"]
     )
     market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = Field(
@@ -25,6 +58,7 @@ class ToolRequestModel(BaseModel):
         description = "정보 조회의 기준이 되는 날짜 (YYYYMMDD)",
         examples = ["20250103"]
     )
+    fields: Optional[List[str]] = FIELDS
 
     @model_validator(mode="after")
     def validate_stock_or_ticker(cls, model):
@@ -34,24 +68,198 @@ class ToolRequestModel(BaseModel):
 
     @field_validator("ticker")
     def validate_ticker(cls, ticker):
-        if not ticker:
-            return ticker
-        if ticker.isdigit() and len(ticker) == 6:
-            return ticker
-        elif ticker.startswith("KR") and len(ticker) == 12 and ticker[2:].isdigit():
-            return ticker[3:9]
-        else:
-            raise ValueError("The variable 'ticker' must be in '000000' format.")
+        return _validate_ticker(ticker)
     
     @field_validator("date")
     def validate_date(cls, date):
-        if date is None:
-            return date
-        try:
-            datetime.strptime(date, "%Y%m%d")
-        except ValueError:
-            raise ValueError("The variable 'date' must be in 'YYYYMMDD' format.")
-        return date
+        return _validate_date(date)
+
+
+class BatchToolRequestModel(BaseModel):
+    tickers: List[str] = Field(
+        min_length = 1,
+        max_length = 50,
+        description = "정보를 조회하고자 하는 종목코드 목록 (최대 50개)",
+        examples = [["005930", "000660"]]
+    )
+    market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = Field(
+        default = "알수없음",
+        description = "정보를 조회하고자 하는 종목들이 속한 주식 시장",
+        examples = ["코스피"]
+    )
+    date: Optional[str] = Field(
+        default = None,
+        description = "정보 조회의 기준이 되는 날짜 (YYYYMMDD)",
+        examples = ["20250103"]
+    )
+    fields: Optional[List[str]] = FIELDS
+
+    @field_validator("tickers")
+    def validate_tickers(cls, tickers):
+        return list(dict.fromkeys(_validate_ticker(ticker) for ticker in tickers))
+
+    @field_validator("date")
+    def validate_date(cls, date):
+        return _validate_date(date)
+
+
+class RangeToolRequestModel(ToolRequestModel):
+    start_date: str = Field(
+        description = "조회 기간의 시작 날짜 (YYYYMMDD)",
+        examples = ["20250102"]
+    )
+
+    @field_validator("start_date")
+    def validate_start_date(cls, start_date):
+        return _validate_date(start_date)
+
+    @model_validator(mode="after")
+    def validate_range(cls, model):
+        if model.date and model.date < model.start_date:
+            raise ValueError("The variable 'start_date' must not be later than 'date'.")
+        return model
+
+
+class CompareToolRequestModel(BaseModel):
+    tickers: List[str] = Field(
+        min_length = 2,
+        max_length = 50,
+        description = "비교할 종목코드 목록 (2개 이상, 최대 50개)",
+        examples = [["005930", "000660", "035420"]]
+    )
+    market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = Field(
+        default = "알수없음",
+        description = "비교할 종목들이 속한 주식 시장",
+        examples = ["코스피"]
+    )
+    start_date: str = Field(
+        description = "비교 기간의 시작 날짜 (YYYYMMDD)",
+        examples = ["20250102"]
+    )
+    date: Optional[str] = Field(
+        default = None,
+        description = "비교 기간의 마지막 날짜 (YYYYMMDD)",
+        examples = ["20250331"]
+    )
+
+    @field_validator("tickers")
+    def validate_tickers(cls, tickers):
+        return list(dict.fromkeys(_validate_ticker(ticker) for ticker in tickers))
+
+    @field_validator("start_date", "date")
+    def validate_date(cls, date):
+        return _validate_date(date)
+
+    @model_validator(mode="after")
+    def validate_range(cls, model):
+        if model.date and model.date < model.start_date:
+            raise ValueError("The variable 'start_date' must not be later than 'date'.")
+        return model
+
+
+class ExportToolRequestModel(BaseModel):
+    endpoint: Literal["info", "price"] = Field(
+        description = "내보낼 데이터 종류 (info: 종목 기본 정보, price: 주가 정보)",
+        examples = ["price"]
+    )
+    market: Literal["코스피", "코스닥", "코넥스"] = Field(
+        description = "내보낼 주식 시장",
+        examples = ["코스피"]
+    )
+    start_date: str = Field(
+        description = "내보낼 기간의 시작 날짜 (YYYYMMDD)",
+        examples = ["20250102"]
+    )
+    date: Optional[str] = Field(
+        default = None,
+        description = "내보낼 기간의 마지막 날짜 (YYYYMMDD)",
+        examples = ["20250331"]
+    )
+    format: Literal["arrow", "parquet"] = Field(
+        default = "arrow",
+        description = "파일 형식 (arrow: 메모리 맵으로 바로 읽을 수 있는 Arrow IPC, parquet: 압축된 Parquet)",
+        examples = ["arrow"]
+    )
+
+    @field_validator("start_date", "date")
+    def validate_date(cls, date):
+        return _validate_date(date)
+
+    @model_validator(mode="after")
+    def validate_range(cls, model):
+        if model.date and model.date < model.start_date:
+            raise ValueError("The variable 'start_date' must not be later than 'date'.")
+        return model
+
+
+class SearchToolRequestModel(BaseModel):
+    market: Literal["코스피", "코스닥", "코넥스", "알수없음"] = Field(
+        default = "알수없음",
+        description = "검색할 주식 시장. '알수없음'이면 모든 시장을 검색",
+        examples = ["코스닥"]
+    )
+    date: Optional[str] = Field(
+        default = None,
+        description = "정보 조회의 기준이 되는 날짜 (YYYYMMDD)",
+        examples = ["20250103"]
+    )
+    secugrp_nm: Optional[List[str]] = Field(
+        default = None,
+        description = "증권구분 중 하나 (예: 주권, 부동산투자회사, 외국주권)",
+        examples = [["부동산투자회사"]]
+    )
+    sect_tp_nm: Optional[List[str]] = Field(
+        default = None,
+        description = "소속부 중 하나 (예: 우량기업부, 벤처기업부, 중견기업부)",
+        examples = [["우량기업부"]]
+    )
+    kind_stkcert_tp_nm: Optional[List[str]] = Field(
+        default = None,
+        description = "주식종류 중 하나 (예: 보통주, 종류주권)",
+        examples = [["종류주권"]]
+    )
+    listed_from: Optional[str] = Field(
+        default = None,
+        description = "이 날짜 이후(포함) 상장된 종목 (YYYYMMDD)",
+        examples = ["20200101"]
+    )
+    listed_to: Optional[str] = Field(
+        default = None,
+        description = "이 날짜 이전(포함) 상장된 종목 (YYYYMMDD)",
+        examples = ["20201231"]
+    )
+    parval_min: Optional[float] = Field(
+        default = None,
+        description = "최소 액면가",
+        examples = [100]
+    )
+    parval_max: Optional[float] = Field(
+        default = None,
+        description = "최대 액면가",
+        examples = [5000]
+    )
+    limit: int = Field(
+        default = 100,
+        ge = 1,
+        le = 500,
+        description = "반환할 최대 종목 수",
+        examples = [100]
+    )
+    fields: Optional[List[str]] = FIELDS
+
+    @model_validator(mode="after")
+    def validate_filters(cls, model):
+        filters = (
+            model.secugrp_nm, model.sect_tp_nm, model.kind_stkcert_tp_nm,
+            model.listed_from, model.listed_to, model.parval_min, model.parval_max,
+        )
+        if all(value is None for value in filters):
+            raise ValueError("At least one filter must be provided.")
+        return model
+
+    @field_validator("date", "listed_from", "listed_to")
+    def validate_date(cls, date):
+        return _validate_date(date)
 
 
 class StockInfoOutputModel(BaseModel):
@@ -227,4 +435,44 @@ class StockPriceOutputModel(BaseModel):
 
     model_config = {
         "extra": "forbid"
-    }
\ No newline at end of file
+    }
+
+class StockIndicatorOutputModel(BaseModel):
+    isu_cd: Optional[str] = Field(
+        default=None,
+        description="종목코드",
+        examples=["338100"],
+        alias="ISU_CD"
+    )
+    bas_dd: Optional[str] = Field(
+        default=None,
+        description="기준일자",
+        examples=["20200414"],
+        alias="BAS_DD"
+    )
+    tdd_clsprc: Optional[float] = Field(
+        default=None,
+        description="종가",
+        examples=[4715],
+        alias="TDD_CLSPRC"
+    )
+    ma_5: Optional[float] = Field(default=None, description="5일 이동평균", alias="MA_5")
+    ma_20: Optional[float] = Field(default=None, description="20일 이동평균", alias="MA_20")
+    ma_60: Optional[float] = Field(default=None, description="60일 이동평균", alias="MA_60")
+    ma_120: Optional[float] = Field(default=None, description="120일 이동평균", alias="MA_120")
+    ret_5: Optional[float] = Field(default=None, description="5일 수익률 (%)", alias="RET_5")
+    ret_20: Optional[float] = Field(default=None, description="20일 수익률 (%)", alias="RET_20")
+    ret_60: Optional[float] = Field(default=None, description="60일 수익률 (%)", alias="RET_60")
+    ret_120: Optional[float] = Field(default=None, description="120일 수익률 (%)", alias="RET_120")
+    avg_vol_5: Optional[float] = Field(default=None, description="5일 평균 거래량", alias="AVG_VOL_5")
+    avg_vol_20: Optional[float] = Field(default=None, description="20일 평균 거래량", alias="AVG_VOL_20")
+    avg_vol_60: Optional[float] = Field(default=None, description="60일 평균 거래량", alias="AVG_VOL_60")
+    avg_vol_120: Optional[float] = Field(default=None, description="120일 평균 거래량", alias="AVG_VOL_120")
+    vol_20: Optional[float] = Field(default=None, description="20일 변동성 (연율화, %)", alias="VOL_20")
+    vol_60: Optional[float] = Field(default=None, description="60일 변동성 (연율화, %)", alias="VOL_60")
+    high_52w: Optional[float] = Field(default=None, description="52주 최고 종가", alias="HIGH_52W")
+    low_52w: Optional[float] = Field(default=None, description="52주 최저 종가", alias="LOW_52W")
+
+    model_config = {
+        "extra": "forbid"
+    }
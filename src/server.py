@@ -1,36 +1,112 @@
+import os
 import sys
 import json
+import socket
 import asyncio
 from collections import defaultdict
-from typing import Optional, Literal
-from src.resolver import KrxStockInfoResolver, KrxStockPriceResolver
-from src.krx_client import KrxStockClient
-from src.cache import KrxStockInfoCache, KrxStockPriceCache
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional, Literal, Dict, List, Tuple, Mapping, Type, Any
+from src.resolver import BaseResolver, set_default_resolver, get_default_resolver, resolve_stock_task
+from src.executor import BoundedExecutor
+from src.krx_client import KrxStockClient, KrxFetchResult, KRX_RATE_LIMIT_FILE
+from src.cache import BaseCache, KrxStockInfoCache, KrxStockPriceCache, KrxNegativeCache
 from src.watcher import AsyncKrxDateWatcher
+from src.store import KrxMarketStore
+from src.registry import KrxMarketDataRegistry
+from src.admission import KrxAdmissionController, AdmissionRejectedError
+from src.notifier import KrxLatestDayNotifier, LATEST_DAY_URI, LATEST_TICKER_URI
+from src.tracing import KrxTracer, FileSpanExporter, OtlpSpanExporter, span, detach
+from src.profiler import KrxSamplingProfiler, ProfilerBusyError
 
 from src.descriptions.loader import load_description 
 from src.schemas.schema import (
     ToolRequestModel,
+    BatchToolRequestModel,
+    RangeToolRequestModel,
+    SearchToolRequestModel,
+    CompareToolRequestModel,
+    ExportToolRequestModel,
     StockInfoOutputModel,
-    StockPriceOutputModel
+    StockPriceOutputModel,
+    StockIndicatorOutputModel
 )
+from src.schemas.projection import ProjectedSerializer, get_serializer
 from src.utils import get_latest_open_date, LOGGER
 
-from fastmcp import FastMCP
+from pydantic import BaseModel
+from fastmcp import FastMCP, Context
+from fastmcp.server.dependencies import get_http_request
+from fastmcp.exceptions import ToolError, ResourceError
+
+if TYPE_CHECKING:
+    from src.indicators import KrxIndicatorEngine
 
 
 class KrxStockServer:
 
     market_code = ["stk", "ksq", "knx"]
     market_name = ["코스피", "코스닥", "코넥스"]
+    stats_uri = "krx://stats"
+    delta_fields = ["ISU_NM", "TDD_CLSPRC", "CMPPREVDD_PRC", "FLUC_RT", "ACC_TRDVOL"]
+    max_range_days = 31
+    offload_rows = 50
+    max_compare_days = 366
+    max_indicator_fetches = 10
     
-    def __init__(self, args):
+    def __init__(self, args, is_leader: bool = True):
         self.mcp = FastMCP(args.server_name)
-        self.client = KrxStockClient()
-        self.si_cache = KrxStockInfoCache(max_size=args.si_cache_size)
-        self.sp_cache = KrxStockPriceCache(max_size=args.sp_cache_size)
-        self.si_resolver = KrxStockInfoResolver()
-        self.sp_resolver = KrxStockPriceResolver()
+        self.executor = BoundedExecutor(
+            mode = args.executor,
+            max_workers = args.executor_workers,
+            max_queue = args.executor_queue_size,
+            initializer = set_default_resolver if args.executor == "process" else None
+        )
+        self.client = KrxStockClient(
+            rate_limit = args.krx_rate_limit,
+            burst = args.krx_burst,
+            max_retries = args.krx_max_retries,
+            timeout = args.krx_timeout,
+            rate_limit_file = os.path.join(args.store_dir, KRX_RATE_LIMIT_FILE)
+        )
+        self.store = KrxMarketStore(
+            root = args.store_dir,
+            snapshot_interval = args.store_snapshot_interval
+        )
+        self.is_leader = is_leader
+        self.si_cache = KrxStockInfoCache(max_size=args.si_cache_size, policy=args.cache_policy)
+        self.sp_cache = KrxStockPriceCache(max_size=args.sp_cache_size, policy=args.cache_policy)
+        self.prefetch_threshold = args.prefetch_threshold
+        self.export_dir = args.export_dir
+        self._prefetch_tasks: set = set()
+        self.negative_cache = KrxNegativeCache(
+            transient_ttl=args.negative_cache_ttl, holiday_ttl=args.negative_cache_holiday_ttl
+        )
+        self._indicators: Optional["KrxIndicatorEngine"] = None
+        self._indicator_locks = {market: asyncio.Lock() for market in self.market_code}
+        self.admission = KrxAdmissionController(
+            session_limit = args.session_limit,
+            cold_fetch_limit = args.cold_fetch_limit,
+            queue_size = args.cold_queue_size,
+            queue_timeout = args.cold_queue_timeout
+        )
+        self.tracer = KrxTracer(
+            sample_rate = args.trace_sample_rate,
+            exporter = (
+                OtlpSpanExporter(args.trace_otlp_endpoint, service_name=args.server_name)
+                if args.trace_export == "otlp" else FileSpanExporter(args.trace_file)
+            )
+        )
+        self.registry = KrxMarketDataRegistry(
+            self.client,
+            self.store,
+            self.negative_cache,
+            tracer = self.tracer,
+            shared = args.shared_market_days or args.workers > 1
+        )
+        # Seeded so that 'krx://latest' has a date before the watcher first runs
+        self.notifier = KrxLatestDayNotifier(latest_date=get_latest_open_date())
+        self.profiler = KrxSamplingProfiler(profile_dir=args.profile_dir)
+        self.admin_token = args.admin_token
         self.watcher = AsyncKrxDateWatcher(
             callback = self.on_new_open_date,
             interval = 30,
@@ -43,29 +119,89 @@ class KrxStockServer:
             )
         
         self.market_mapper = dict(zip(self.market_name, self.market_code))
+
+    @property
+    def resolver(self) -> BaseResolver:
+        """Resolver shared with 'resolve_stock_task', built on first use"""
+        # The info files cover every name and ticker of the price files, so both tools share one resolver
+        return get_default_resolver()
+
+    @property
+    def indicators(self) -> "KrxIndicatorEngine":
+        """Indicator engine, built on first use so that numpy is not imported at startup"""
+        if self._indicators is None:
+            from src.indicators import KrxIndicatorEngine
+            self._indicators = KrxIndicatorEngine()
+        return self._indicators
+
+    async def warm_up(self) -> None:
+        """Build the resolver and import the deferred modules in the background once the server is up"""
+        try:
+            await asyncio.to_thread(get_default_resolver)
+            await asyncio.to_thread(self._import_deferred_modules)
+            LOGGER.info("[Server] Warmed up the resolver and the deferred modules")
+        except Exception:
+            LOGGER.exception("[Server] Failed to warm up; they will be built on first use")
+
+    @staticmethod
+    def _import_deferred_modules() -> None:
+        import aiohttp
+        import numpy
+        import rapidfuzz
         
     def register_mcp_primitives(self) -> None:
         """Register defined MCP primitives"""
         self._register_get_stock_info_by_date()
         self._register_get_stock_price_by_date()
+        self._register_get_stock_indicators_by_date()
+        self._register_get_stocks_by_tickers()
+        self._register_get_stock_price_by_range()
+        self._register_search_stocks()
+        self._register_compare_stocks()
+        self._register_export_market_days()
+        self._register_latest_day_resources()
+        self._register_stats_resource()
+        if self.admin_token:
+            self._register_admin_routes()
+        self.notifier.attach(self.mcp)
 
-    async def run_server(self, kwargs) -> None:
+    async def run_server(self, kwargs, sockets: Optional[List[socket.socket]] = None) -> None:
         """Run MCP Server with scheduler asyncronously"""        
         LOGGER.info("[Server] Server is running...")
+        if sockets:
+            serve = self._serve_on_sockets(kwargs, sockets)
+        else:
+            serve = self.mcp.run_async(**kwargs)
+
+        # Only the leader worker watches the date and refreshes the latest data
+        tasks = [serve, self.warm_up(), self.tracer.run()]
+        if self.is_leader:
+            tasks.append(self.watcher.async_watch_date_change())
+
         try:
-            await asyncio.gather(
-                self.mcp.run_async(**kwargs),
-                self.watcher.async_watch_date_change(),
-            )
+            await asyncio.gather(*tasks)
         except Exception:
             LOGGER.exception("[Server] Fatal error occurred")
         finally:
             LOGGER.info("[Server] Server is shutting down...")
+            self.notifier.close()
+            self.tracer.flush()
+            await self.client.close()
             self.stop_server()
     
+    async def _serve_on_sockets(self, kwargs, sockets: List[socket.socket]) -> None:
+        """Serve streamable-http on sockets shared with the other workers"""
+        import uvicorn
+
+        # Sessions cannot be pinned to a worker, so every request must be stateless
+        app = self.mcp.http_app(path=kwargs.get("path"), stateless_http=True)
+        config = uvicorn.Config(app, log_level="info")
+        await uvicorn.Server(config).serve(sockets=sockets)
+
     def stop_server(self) -> None:
         """Stop MCP Server with scheduler"""
         LOGGER.info("[Server] Stopping server components")
+        self.executor.shutdown()
         sys.exit(1)
 
     async def on_new_open_date(self) -> None:
@@ -76,16 +212,249 @@ class KrxStockServer:
         if self.si_cache.latest_date != latest_date:
             si_latest_dict = defaultdict(dict)
             for market in self.market_code:
-                si_latest = await self.client.fetch_stock_info(latest_date, market)
-                si_latest_dict[(latest_date, market)] = si_latest
+                si_latest = await self.registry.load("info", latest_date, market)
+                if si_latest.ok:
+                    si_latest_dict[(latest_date, market)] = si_latest.records
             self.si_cache.update_latest(latest_date, si_latest_dict)
 
         if self.sp_cache.latest_date != latest_date:
             sp_latest_dict = defaultdict(dict)
             for market in self.market_code:
-                sp_latest = await self.client.fetch_stock_info(latest_date, market)
-                sp_latest_dict[(latest_date, market)] = sp_latest
+                sp_latest = await self.registry.load("price", latest_date, market)
+                if sp_latest.ok:
+                    sp_latest_dict[(latest_date, market)] = sp_latest.records
             self.sp_cache.update_latest(latest_date, sp_latest_dict)
+            # Only extend series already seeded, filling any day missed while the server was down
+            if self._indicators is not None:
+                for market in self.market_code:
+                    if self._indicators.last_date(market) is not None:
+                        try:
+                            await self._sync_indicators(market)
+                        except AdmissionRejectedError:
+                            # The next tool call or watcher run resumes from the days stored so far
+                            LOGGER.warning(f"[Server] Postponed extending the indicator series ({market})")
+
+        markets = {
+            market: {
+                "info": (latest_date, market) in self.si_cache.latest,
+                "price": (latest_date, market) in self.sp_cache.latest,
+            }
+            for market in self.market_code
+        }
+        if (latest_date, markets) != (self.notifier.latest_date, self.notifier.markets):
+            await self.notifier.publish(latest_date, markets)
+
+    async def _load_market_day(
+        self,
+        endpoint: Literal["info", "price"],
+        date: str,
+        market: str,
+        session: Optional[str] = None
+    ) -> KrxFetchResult:
+        """
+        Load a market-day through the registry, failing the tool call if KRX API is unavailable.
+        Only the loads which must fetch from KRX API go through admission control.
+        """
+        try:
+            result = await self._admit_market_day(endpoint, date, market, session)
+        except AdmissionRejectedError as e:
+            raise self._server_busy(e)
+        if result.status == "error":
+            raise ToolError(f"KRX API is unavailable: {result.error}")
+        return result
+
+    async def _admit_market_day(
+        self,
+        endpoint: Literal["info", "price"],
+        date: str,
+        market: str,
+        session: Optional[str] = None
+    ) -> KrxFetchResult:
+        """Load a market-day through the registry, holding a cold fetch slot if it must be fetched from KRX API"""
+        cold = self.registry.is_cold(endpoint, date, market)
+        with span("load_market_day", endpoint=endpoint, date=date, market=market, cold=cold):
+            if not cold:
+                return await self.registry.load(endpoint, date, market)
+            async with self.admission.cold_fetch(session):
+                return await self.registry.load(endpoint, date, market)
+
+    @staticmethod
+    def _server_busy(e: AdmissionRejectedError) -> ToolError:
+        return ToolError(json.dumps({
+            "message": "Server busy",
+            "reason": e.reason,
+            "retry_after": e.retry_after,
+        }))
+
+    def _maybe_prefetch(
+        self,
+        endpoint: Literal["info", "price"],
+        cache: BaseCache,
+        date: str,
+        market: str
+    ) -> None:
+        """Prefetch the trading days around a market-day once it has been requested 'prefetch_threshold' times"""
+        if not self.prefetch_threshold or cache.frequency(date, market) != self.prefetch_threshold:
+            return
+        task = asyncio.create_task(self._prefetch(endpoint, cache, date, market))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+
+    async def _prefetch(
+        self,
+        endpoint: Literal["info", "price"],
+        cache: BaseCache,
+        date: str,
+        market: str
+    ) -> None:
+        """
+        Load the adjacent trading days into the store and admit them to the cache as the next days to be evicted.
+        Prefetching never waits for KRX API while client requests are fetching from it.
+        """
+        # The task inherits the context of the request which triggered it, but is not part of its trace
+        detach()
+        for adjacent in self._adjacent_open_dates(date, market):
+            if cache.contains(adjacent, market):
+                continue
+            try:
+                if not self.registry.is_cold(endpoint, adjacent, market):
+                    result = await self.registry.load(endpoint, adjacent, market)
+                elif self.admission.in_flight or self.admission.waiting:
+                    continue
+                else:
+                    async with self.admission.cold_fetch():
+                        result = await self.registry.load(endpoint, adjacent, market)
+            except AdmissionRejectedError:
+                continue
+
+            if result.ok:
+                cache.push(adjacent, market, result.records, prefetched=True)
+                LOGGER.info(f"[Server] Prefetched ({endpoint}, {adjacent}, {market}) next to {date}")
+
+    def _adjacent_open_dates(self, date: str, market: str) -> List[str]:
+        """The closest earlier and later days of the market which may have trading data"""
+        adjacent = []
+        day = datetime.strptime(date, "%Y%m%d")
+        for step in (-1, 1):
+            for offset in range(1, 8):
+                candidate = (day + timedelta(days=step * offset)).strftime("%Y%m%d")
+                reason = self.negative_cache.get(candidate, market)
+                if reason is None:
+                    adjacent.append(candidate)
+                    break
+                if reason in ("weekend", "market holiday"):
+                    continue
+                break
+        return adjacent
+
+    async def _sync_indicators(self, market: str, session: Optional[str] = None) -> Optional[str]:
+        """
+        Append the trading days after the last day of the indicator series, up to the latest open date.
+        The series never skips a trading day: weekdays missing from the store are loaded through the
+        registry (at most 'max_indicator_fetches' per call) under the admission control of the session,
+        and when a day cannot be loaded the series restarts after it.
+        Return the reason why the series does not reach the latest open date, if any.
+        Raise AdmissionRejectedError, leaving the series as it is, if a cold fetch is rejected.
+        """
+        latest_date = get_latest_open_date()
+        if self.indicators.last_date(market) == latest_date:
+            return None
+
+        async with self._indicator_locks[market]:
+            last_date = self.indicators.last_date(market)
+            if last_date == latest_date:
+                return None
+
+            stored = set(await asyncio.to_thread(self.store.dates, "price", market))
+            # Walk back from the latest open date to the last appended day
+            dates: List[str] = []
+            reason: Optional[str] = None
+            fetches = 0
+            day = datetime.strptime(latest_date, "%Y%m%d")
+            while len(dates) < self.indicators.history:
+                date = day.strftime("%Y%m%d")
+                if last_date is not None and date <= last_date:
+                    break
+                day -= timedelta(days=1)
+
+                skip = self.negative_cache.get(date, market)
+                if skip in ("weekend", "market holiday"):
+                    continue
+                if skip is not None:
+                    break
+                if date in stored:
+                    dates.append(date)
+                    continue
+                if fetches == self.max_indicator_fetches:
+                    reason = f"the price data of {date} is not stored"
+                    break
+                fetches += 1
+                result = await self._admit_market_day("price", date, market, session)
+                if result.status == "empty" and result.error == "market holiday":
+                    continue
+                if not result.ok:
+                    reason = f"the price data of {date} is not available ({result.error})"
+                    break
+                stored.add(date)
+                dates.append(date)
+
+            if not dates:
+                return reason
+            if last_date is not None and (reason is not None or len(dates) == self.indicators.history):
+                LOGGER.warning(f"[Server] Restarting the indicator series after a gap before {dates[-1]} ({market})")
+                self.indicators.reset(market)
+
+            LOGGER.info(f"[Server] Appending {len(dates)} days to the indicator series ({market})")
+            for date in reversed(dates):
+                entries = await asyncio.to_thread(self.store.load, "price", date, market)
+                if not entries:
+                    reason = f"the price data of {date} is not available"
+                    self.indicators.reset(market)
+                    continue
+                self.indicators.append(date, market, entries)
+            return reason
+
+    def _no_trading_data(self, date: str, market: str, reason: Optional[str]) -> str:
+        """Response for a market-day without trading data"""
+        return json.dumps({
+            "message": "No trading data",
+            "date": date,
+            "market": market,
+            "reason": reason,
+        })
+
+    @staticmethod
+    def _serializer(model: Type[BaseModel], fields: Optional[List[str]]) -> ProjectedSerializer:
+        """Serializer projected onto the requested fields, failing the tool call on an unknown field"""
+        try:
+            return get_serializer(model, fields)
+        except ValueError as e:
+            raise ToolError(str(e))
+
+    async def _dump_rows(self, serializer: ProjectedSerializer, rows: Dict[str, dict]) -> str:
+        """Validate and serialize rows, in a thread once there are enough of them to stall the event loop"""
+        if len(rows) < self.offload_rows:
+            return serializer.dump_rows(rows)
+        return await asyncio.to_thread(serializer.dump_rows, rows)
+
+    async def _get_market_day(
+        self,
+        endpoint: Literal["info", "price"],
+        cache: BaseCache,
+        date: str,
+        market: str,
+        session: Optional[str] = None
+    ) -> Tuple[Optional[Mapping[str, dict]], Optional[str]]:
+        """Whole market-day from the cache, or loaded and offered to the cache. Return None and the reason if it has no trading data."""
+        day = cache.get_day(date, market)
+        if day is not None:
+            return day, None
+
+        result = await self._load_market_day(endpoint, date, market, session)
+        if result.status == "empty":
+            return None, result.error
+        cache.push(date, market, result.records)
+        return result.records, None
 
     def _register_get_stock_info_by_date(self) -> str:
         """A wrapper function for a MCP tool defined inside"""
@@ -93,60 +462,292 @@ class KrxStockServer:
                 path="src/descriptions/get_stock_info_by_date.yaml",
                 latest_date=get_latest_open_date()
         ))
-        async def get_stock_info_by_date(request: ToolRequestModel) -> str:
-            return await self.get_stock_info(
+        async def get_stock_info_by_date(request: ToolRequestModel, ctx: Context) -> str:
+            with self.tracer.trace("get_stock_info_by_date", **self._trace_attributes(request, ctx)):
+                return await self.get_stock_info(
+                    stock=request.stock,
+                    ticker=request.ticker,
+                    market=request.market,
+                    date=request.date,
+                    fields=request.fields,
+                    session=self._session_key(ctx),
+                )
+
+    def _register_get_stock_price_by_date(self) -> str: 
+        """A wrapper function for a MCP tool defined inside"""
+        @self.mcp.tool(description=load_description(
+                path="src/descriptions/get_stock_price_by_date.yaml",
+                latest_date=get_latest_open_date()
+        ))
+        async def get_stock_price_by_date(request: ToolRequestModel, ctx: Context) -> str:
+            with self.tracer.trace("get_stock_price_by_date", **self._trace_attributes(request, ctx)):
+                return await self.get_stock_price(
+                    stock=request.stock,
+                    ticker=request.ticker,
+                    market=request.market,
+                    date=request.date,
+                    fields=request.fields,
+                    session=self._session_key(ctx),
+                )
+        
+    def _register_get_stock_indicators_by_date(self) -> str:
+        """A wrapper function for a MCP tool defined inside"""
+        @self.mcp.tool(description=load_description(
+                path="src/descriptions/get_stock_indicators_by_date.yaml",
+                latest_date=get_latest_open_date()
+        ))
+        async def get_stock_indicators_by_date(request: ToolRequestModel, ctx: Context) -> str:
+            return await self.get_stock_indicators(
                 stock=request.stock,
                 ticker=request.ticker,
                 market=request.market,
                 date=request.date,
+                fields=request.fields,
+                session=self._session_key(ctx),
             )
 
-    def _register_get_stock_price_by_date(self) -> str: 
+    def _register_get_stocks_by_tickers(self) -> None:
+        """A wrapper function for MCP tools defined inside"""
+        @self.mcp.tool(description=load_description(
+                path="src/descriptions/get_stock_info_by_tickers.yaml",
+                latest_date=get_latest_open_date()
+        ))
+        async def get_stock_info_by_tickers(request: BatchToolRequestModel, ctx: Context) -> str:
+            return await self.get_stock_batch(
+                endpoint="info",
+                tickers=request.tickers,
+                market=request.market,
+                date=request.date,
+                fields=request.fields,
+                session=self._session_key(ctx),
+            )
+
+        @self.mcp.tool(description=load_description(
+                path="src/descriptions/get_stock_price_by_tickers.yaml",
+                latest_date=get_latest_open_date()
+        ))
+        async def get_stock_price_by_tickers(request: BatchToolRequestModel, ctx: Context) -> str:
+            return await self.get_stock_batch(
+                endpoint="price",
+                tickers=request.tickers,
+                market=request.market,
+                date=request.date,
+                fields=request.fields,
+                session=self._session_key(ctx),
+            )
+
+    def _register_get_stock_price_by_range(self) -> None:
         """A wrapper function for a MCP tool defined inside"""
         @self.mcp.tool(description=load_description(
-                path="src/descriptions/get_stock_price_by_date.yaml",
+                path="src/descriptions/get_stock_price_by_range.yaml",
                 latest_date=get_latest_open_date()
         ))
-        async def get_stock_price_by_date(request: ToolRequestModel) -> str:
-            return await self.get_stock_price(
+        async def get_stock_price_by_range(request: RangeToolRequestModel, ctx: Context) -> str:
+            return await self.get_stock_price_range(
                 stock=request.stock,
                 ticker=request.ticker,
                 market=request.market,
+                start_date=request.start_date,
                 date=request.date,
+                fields=request.fields,
+                session=self._session_key(ctx),
             )
-        
+
+    def _register_search_stocks(self) -> None:
+        """A wrapper function for a MCP tool defined inside"""
+        @self.mcp.tool(description=load_description(
+                path="src/descriptions/search_stocks.yaml",
+                latest_date=get_latest_open_date()
+        ))
+        async def search_stocks(request: SearchToolRequestModel, ctx: Context) -> str:
+            return await self.search_stocks(
+                equals={
+                    "SECUGRP_NM": request.secugrp_nm,
+                    "SECT_TP_NM": request.sect_tp_nm,
+                    "KIND_STKCERT_TP_NM": request.kind_stkcert_tp_nm,
+                },
+                ranges={
+                    "LIST_DD": (request.listed_from, request.listed_to),
+                    "PARVAL": (request.parval_min, request.parval_max),
+                },
+                market=request.market,
+                date=request.date,
+                limit=request.limit,
+                fields=request.fields,
+                session=self._session_key(ctx),
+            )
+
+    def _register_compare_stocks(self) -> None:
+        """A wrapper function for a MCP tool defined inside"""
+        @self.mcp.tool(description=load_description(
+                path="src/descriptions/compare_stocks.yaml",
+                latest_date=get_latest_open_date()
+        ))
+        async def compare_stocks(request: CompareToolRequestModel, ctx: Context) -> str:
+            return await self.compare_stocks(
+                tickers=request.tickers,
+                market=request.market,
+                start_date=request.start_date,
+                date=request.date,
+                session=self._session_key(ctx),
+            )
+
+    def _register_export_market_days(self) -> None:
+        """A wrapper function for a MCP tool defined inside"""
+        @self.mcp.tool(description=load_description(
+                path="src/descriptions/export_market_days.yaml",
+                latest_date=get_latest_open_date()
+        ))
+        async def export_market_days(request: ExportToolRequestModel) -> str:
+            return await self.export_market_days(
+                endpoint=request.endpoint,
+                market=request.market,
+                start_date=request.start_date,
+                date=request.date,
+                format=request.format,
+            )
+
+    def _register_latest_day_resources(self) -> None:
+        """A wrapper function for MCP resources defined inside"""
+        @self.mcp.resource(
+            LATEST_DAY_URI,
+            description="최근 개장일과 시장별 종목정보/주가정보 제공 여부. 새 개장일 데이터가 준비되면 갱신 알림을 보냅니다.",
+            mime_type="application/json"
+        )
+        async def latest_trading_day() -> str:
+            # Only the leader watches the date, so the other workers follow the clock without market flags
+            if not self.is_leader:
+                self.notifier.latest_date = get_latest_open_date()
+            return json.dumps(self.notifier.event())
+
+        @self.mcp.resource(
+            LATEST_TICKER_URI,
+            description="최근 개장일 기준 종목의 종가, 전일 대비 변동과 거래량. 새 개장일 데이터가 준비되면 갱신 알림을 보냅니다.",
+            mime_type="application/json"
+        )
+        async def latest_ticker_delta(market: str, ticker: str, ctx: Context) -> str:
+            return await self.get_latest_delta(market, ticker, session=self._session_key(ctx))
+
+    def _register_stats_resource(self) -> None:
+        """A wrapper function for a MCP resource defined inside"""
+        @self.mcp.resource(
+            self.stats_uri,
+            description="KRX API 조회 대기열과 실행기(executor)의 상태 지표",
+            mime_type="application/json"
+        )
+        async def server_stats() -> str:
+            return json.dumps(self.stats())
+
+    def _register_admin_routes(self) -> None:
+        """Admin HTTP routes guarded by '--admin_token'. They serve the worker which receives the request."""
+        from starlette.requests import Request
+        from starlette.responses import JSONResponse
+
+        def authorized(request: Request) -> bool:
+            return request.headers.get("authorization") == f"Bearer {self.admin_token}"
+
+        @self.mcp.custom_route("/admin/profile", methods=["POST"])
+        async def admin_profile(request: Request) -> JSONResponse:
+            if not authorized(request):
+                return JSONResponse({"message": "Unauthorized"}, status_code=401)
+            try:
+                seconds = float(request.query_params.get("seconds", "10"))
+                return JSONResponse(await self.profiler.profile(seconds))
+            except ValueError as e:
+                return JSONResponse({"message": str(e)}, status_code=400)
+            except ProfilerBusyError as e:
+                return JSONResponse({"message": str(e)}, status_code=409)
+
+        @self.mcp.custom_route("/admin/tracing", methods=["POST"])
+        async def admin_tracing(request: Request) -> JSONResponse:
+            if not authorized(request):
+                return JSONResponse({"message": "Unauthorized"}, status_code=401)
+            try:
+                sample_rate = float(request.query_params["sample_rate"])
+            except (KeyError, ValueError):
+                return JSONResponse({"message": "'sample_rate' must be a number between 0 and 1"}, status_code=400)
+            if not 0.0 <= sample_rate <= 1.0:
+                return JSONResponse({"message": "'sample_rate' must be a number between 0 and 1"}, status_code=400)
+            self.tracer.sample_rate = sample_rate
+            LOGGER.info(f"[Server] Set the trace sample rate to {sample_rate}")
+            return JSONResponse(self.tracer.stats())
+
+    @staticmethod
+    def _trace_attributes(request: ToolRequestModel, ctx: Context) -> Dict[str, Any]:
+        """Attributes of the root span of a tool call"""
+        attributes = request.model_dump(include={"stock", "ticker", "market", "date"}, exclude_none=True)
+        try:
+            attributes["mcp.request_id"] = str(ctx.request_id)
+        except RuntimeError:
+            pass
+        return attributes
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue metrics of the admission control and the executor"""
+        return {
+            "cold_fetch": self.admission.stats(),
+            "registry": self.registry.stats(),
+            "executor": self.executor.stats(),
+            "info_cache": self.si_cache.stats(),
+            "price_cache": self.sp_cache.stats(),
+            "tracing": self.tracer.stats(),
+        }
+
+    def _session_key(self, ctx: Context) -> Optional[str]:
+        """Key of the per-session cap. Stateless HTTP requests are keyed by the client address instead."""
+        try:
+            request = get_http_request()
+        except RuntimeError:
+            request = None
+        if request is not None and "mcp-session-id" not in request.headers:
+            return request.client.host if request.client else None
+        try:
+            return ctx.session_id
+        except RuntimeError:
+            return None
+
     async def get_stock_info(
         self,
         stock: Optional[str],
         ticker: Optional[str],
         market: Literal['코스피','코스닥','코넥스','알수없음'] = '알수없음',
-        date: Optional[str] = None
+        date: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        session: Optional[str] = None
     ) -> str:
         """Return basic stock information from API"""          
         output: dict = {}
+        serializer = self._serializer(StockInfoOutputModel, fields)
         
-        if ticker:
-            _, mkt_code = self.si_resolver.resolve_ticker(ticker, market)
-        elif stock:
-            ticker, mkt_code = self.si_resolver.resolve_stock(stock, market)
+        with span("resolve", by="ticker" if ticker else "stock"):
+            if ticker:
+                ticker, mkt_code = self.resolver.resolve_code(ticker, market)
+            elif stock:
+                ticker, mkt_code = await self.executor.run(resolve_stock_task, stock, market)
         
         if not mkt_code:
              return json.dumps(output)
 
-        cached = self.si_cache.get(date, mkt_code, ticker)             
+        date = date or get_latest_open_date()
+        with span("cache.get") as stage:
+            cached = self.si_cache.get(date, mkt_code, ticker)
+            if stage is not None:
+                stage.set(hit=bool(cached))
+        self._maybe_prefetch("info", self.si_cache, date, mkt_code)
         if cached:
             output = cached
         else:
-            date = date or get_latest_open_date()
-            stock_info = await self.client.fetch_stock_info(date, mkt_code)
-            target = stock_info.get(ticker)
-            
+            stock_info = await self._load_market_day("info", date, mkt_code, session)
+            if stock_info.status == "empty":
+                return self._no_trading_data(date, mkt_code, stock_info.error)
+
+            target = stock_info.records.get(ticker)
             if target:
-                self.si_cache.push(date, mkt_code, stock_info)
+                self.si_cache.push(date, mkt_code, stock_info.records)
                 output = target
         
-        stock_info = StockInfoOutputModel.model_validate(output)
-        return stock_info.model_dump_json(exclude_none=True)
+        with span("serialize"):
+            return serializer.dump(output)
 
     async def get_stock_price(
         self,
@@ -154,29 +755,293 @@ class KrxStockServer:
         ticker: Optional[str],
         market: Literal['코스피','코스닥','코넥스','알수없음'] = '알수없음',
         date: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        session: Optional[str] = None
     ) -> str:
         """Return stock price information from API"""               
         output: dict = {}
+        serializer = self._serializer(StockPriceOutputModel, fields)
 
-        if ticker:
-            _, mkt_code = self.si_resolver.resolve_ticker(ticker, market)
-        elif stock:
-            ticker, mkt_code = self.si_resolver.resolve_stock(stock, market)
-
+        with span("resolve", by="ticker" if ticker else "stock"):
+            if ticker:
+                ticker, mkt_code = self.resolver.resolve_code(ticker, market)
+            elif stock:
+                ticker, mkt_code = await self.executor.run(resolve_stock_task, stock, market)
+        
         if not mkt_code:
              return json.dumps(output)
 
-        cached = self.sp_cache.get(date, mkt_code, ticker)
+        date = date or get_latest_open_date()
+        with span("cache.get") as stage:
+            cached = self.sp_cache.get(date, mkt_code, ticker)
+            if stage is not None:
+                stage.set(hit=bool(cached))
+        self._maybe_prefetch("price", self.sp_cache, date, mkt_code)
         if cached:
             output = cached
         else:
-            date = date or get_latest_open_date()
-            stock_price = await self.client.fetch_stock_price(date, mkt_code)
-            target = stock_price.get(ticker)
+            stock_price = await self._load_market_day("price", date, mkt_code, session)
+            if stock_price.status == "empty":
+                return self._no_trading_data(date, mkt_code, stock_price.error)
 
+            target = stock_price.records.get(ticker)
             if target:
-                self.sp_cache.push(date, mkt_code, stock_price)
+                self.sp_cache.push(date, mkt_code, stock_price.records)
                 output = target
+        
+        with span("serialize"):
+            return serializer.dump(output)
+
+    async def get_latest_delta(self, market: str, ticker: str, session: Optional[str] = None) -> str:
+        """Return the compact price change of a ticker on the latest open date"""
+        if market not in self.market_code:
+            raise ResourceError(f"Unknown market code: {market} (one of {self.market_code})")
+
+        date = self.notifier.latest_date or get_latest_open_date()
+        entry = self.sp_cache.get(date, market, ticker)
+        if not entry:
+            stock_price = await self._load_market_day("price", date, market, session)
+            if stock_price.status == "empty":
+                return self._no_trading_data(date, market, stock_price.error)
+            self.sp_cache.push(date, market, stock_price.records)
+            entry = stock_price.records.get(ticker, {})
+
+        return json.dumps({
+            "date": date,
+            "market": market,
+            "ticker": ticker,
+            **{field: entry.get(field) for field in self.delta_fields},
+        }, ensure_ascii=False)
+
+    async def get_stock_indicators(
+        self,
+        stock: Optional[str],
+        ticker: Optional[str],
+        market: Literal['코스피','코스닥','코넥스','알수없음'] = '알수없음',
+        date: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        session: Optional[str] = None
+    ) -> str:
+        """Return technical indicators computed over the stored price series"""
+        output: dict = {}
+        serializer = self._serializer(StockIndicatorOutputModel, fields)
+
+        if ticker:
+            ticker, mkt_code = self.resolver.resolve_code(ticker, market)
+        elif stock:
+            ticker, mkt_code = await self.executor.run(resolve_stock_task, stock, market)
+
+        if not mkt_code:
+             return json.dumps(output)
+
+        try:
+            gap = await self._sync_indicators(mkt_code, session)
+        except AdmissionRejectedError as e:
+            raise self._server_busy(e)
+        as_of = self.indicators.last_date(mkt_code)
+        if as_of is None or (date and date != as_of):
+            return json.dumps({
+                "message": "No indicators",
+                "date": date,
+                "market": mkt_code,
+                "reason": gap or f"indicators are only available as of the latest stored trading day ({as_of})",
+            })
+
+        output = self.indicators.get(mkt_code, ticker)
+        return serializer.dump(output)
+
+    async def get_stock_batch(
+        self,
+        endpoint: Literal["info", "price"],
+        tickers: List[str],
+        market: Literal['코스피','코스닥','코넥스','알수없음'] = '알수없음',
+        date: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        session: Optional[str] = None
+    ) -> str:
+        """Return stock information or prices of several tickers on a date, keyed by ticker"""
+        if endpoint == "info":
+            serializer, cache = self._serializer(StockInfoOutputModel, fields), self.si_cache
+        else:
+            serializer, cache = self._serializer(StockPriceOutputModel, fields), self.sp_cache
+
+        # Tickers are grouped by market so that each market-day is looked up once
+        # Rows stay keyed by the requested tickers, which may be ISINs
+        rows: Dict[str, dict] = {}
+        markets: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for ticker in tickers:
+            code, mkt_code = self.resolver.resolve_code(ticker, market)
+            rows[ticker] = {}
+            if mkt_code:
+                markets[mkt_code].append((ticker, code))
+
+        date = date or get_latest_open_date()
+        reason = None
+        loaded = False
+        for mkt_code, mkt_tickers in markets.items():
+            day, reason = await self._get_market_day(endpoint, cache, date, mkt_code, session)
+            if day is None:
+                continue
+            loaded = True
+            for ticker, code in mkt_tickers:
+                rows[ticker] = day.get(code, {})
+
+        if markets and not loaded:
+            return self._no_trading_data(date, ",".join(markets), reason)
+        return await self._dump_rows(serializer, rows)
+
+    async def get_stock_price_range(
+        self,
+        stock: Optional[str],
+        ticker: Optional[str],
+        market: Literal['코스피','코스닥','코넥스','알수없음'] = '알수없음',
+        start_date: Optional[str] = None,
+        date: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        session: Optional[str] = None
+    ) -> str:
+        """Return stock prices of the trading days between 'start_date' and 'date', keyed by date"""
+        serializer = self._serializer(StockPriceOutputModel, fields)
+
+        if ticker:
+            ticker, mkt_code = self.resolver.resolve_code(ticker, market)
+        elif stock:
+            ticker, mkt_code = await self.executor.run(resolve_stock_task, stock, market)
+
+        if not mkt_code:
+             return json.dumps({})
+
+        date = date or get_latest_open_date()
+        start = datetime.strptime(start_date or date, "%Y%m%d")
+        end = datetime.strptime(date, "%Y%m%d")
+        if start > end:
+            raise ToolError(f"'start_date' ({start_date}) must not be later than 'date' ({date})")
+        if (end - start).days >= self.max_range_days:
+            raise ToolError(f"The range must not be longer than {self.max_range_days} days")
 
-        stock_price = StockPriceOutputModel.model_validate(output)
-        return stock_price.model_dump_json(exclude_none=True)
\ No newline at end of file
+        rows: Dict[str, dict] = {}
+        day = start
+        while day <= end:
+            current = day.strftime("%Y%m%d")
+            day += timedelta(days=1)
+            # Weekends and known holidays are skipped without touching the cache
+            if self.negative_cache.get(current, mkt_code) is not None:
+                continue
+            entries, _ = await self._get_market_day("price", self.sp_cache, current, mkt_code, session)
+            if entries and ticker in entries:
+                rows[current] = entries[ticker]
+
+        return await self._dump_rows(serializer, rows)
+
+    async def search_stocks(
+        self,
+        equals: Dict[str, Optional[List[str]]],
+        ranges: Dict[str, Tuple[Optional[Any], Optional[Any]]],
+        market: Literal['코스피','코스닥','코넥스','알수없음'] = '알수없음',
+        date: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[List[str]] = None,
+        session: Optional[str] = None
+    ) -> str:
+        """Return the stocks whose attributes match every filter, answered from the secondary indexes of the info cache"""
+        serializer = self._serializer(StockInfoOutputModel, fields)
+        equals = {field: values for field, values in equals.items() if values}
+        ranges = {field: bounds for field, bounds in ranges.items() if bounds != (None, None)}
+
+        date = date or get_latest_open_date()
+        markets = [self.market_mapper[market]] if market in self.market_mapper else self.market_code
+        matched: Dict[str, dict] = {}
+        total = 0
+        reason = None
+        loaded = False
+        for mkt_code in markets:
+            day, reason = await self._get_market_day("info", self.si_cache, date, mkt_code, session)
+            if day is None:
+                continue
+            loaded = True
+            tickers = self.si_cache.index(date, mkt_code, day).search(equals, ranges)
+            total += len(tickers)
+            for ticker in tickers[:max(0, limit - len(matched))]:
+                matched[ticker] = day[ticker]
+
+        if not loaded:
+            return self._no_trading_data(date, ",".join(markets), reason)
+        stocks = await self._dump_rows(serializer, matched)
+        return f'{{"date":{json.dumps(date)},"total":{total},"stocks":{stocks}}}'
+
+    async def compare_stocks(
+        self,
+        tickers: List[str],
+        market: Literal['코스피','코스닥','코넥스','알수없음'] = '알수없음',
+        start_date: Optional[str] = None,
+        date: Optional[str] = None,
+        session: Optional[str] = None
+    ) -> str:
+        """Return the performance of several tickers over a date range and the correlation of their daily returns"""
+        # numpy is deferred until the first comparison, like the indicator engine
+        from src.comparison import KrxPriceComparison
+
+        markets: Dict[str, List[str]] = defaultdict(list)
+        unresolved = []
+        for ticker in tickers:
+            code, mkt_code = self.resolver.resolve_code(ticker, market)
+            if not mkt_code:
+                unresolved.append(ticker)
+            elif code not in markets[mkt_code]:
+                markets[mkt_code].append(code)
+        if not markets:
+            return json.dumps({"message": "No tickers resolved", "unresolved": unresolved})
+
+        date = date or get_latest_open_date()
+        start = datetime.strptime(start_date or date, "%Y%m%d")
+        end = datetime.strptime(date, "%Y%m%d")
+        if start > end:
+            raise ToolError(f"'start_date' ({start_date}) must not be later than 'date' ({date})")
+        if (end - start).days >= self.max_compare_days:
+            raise ToolError(f"The range must not be longer than {self.max_compare_days} days")
+
+        comparison = KrxPriceComparison([ticker for mkt_tickers in markets.values() for ticker in mkt_tickers])
+        day = start
+        reason = None
+        while day <= end:
+            current = day.strftime("%Y%m%d")
+            day += timedelta(days=1)
+            for mkt_code, mkt_tickers in markets.items():
+                # Weekends and known holidays are skipped without touching the cache
+                if (reason := self.negative_cache.get(current, mkt_code)) is not None:
+                    continue
+                entries, reason = await self._get_market_day("price", self.sp_cache, current, mkt_code, session)
+                if entries:
+                    comparison.add(current, entries, mkt_tickers)
+
+        if not comparison.dates:
+            return self._no_trading_data(f"{start.strftime('%Y%m%d')}~{date}", ",".join(markets), reason)
+        output = await asyncio.to_thread(comparison.compare)
+        if unresolved:
+            output["unresolved"] = unresolved
+        return json.dumps(output, ensure_ascii=False)
+
+    async def export_market_days(
+        self,
+        endpoint: Literal["info", "price"],
+        market: Literal['코스피','코스닥','코넥스'],
+        start_date: str,
+        date: Optional[str] = None,
+        format: Literal["arrow", "parquet"] = "arrow"
+    ) -> str:
+        """Write the cached or stored market-days of a date range into an Arrow IPC or Parquet file and return its path"""
+        from src.export import KrxArrowExporter
+
+        mkt_code = self.market_mapper[market]
+        date = date or get_latest_open_date()
+        exporter = KrxArrowExporter(
+            loader = self.registry.peek,
+            skip = lambda day, mkt: self.negative_cache.get(day, mkt) is not None
+        )
+        path = os.path.join(self.export_dir, exporter.file_name(endpoint, mkt_code, start_date, date, format))
+        try:
+            # Each market-day is converted and written in a worker thread, one row batch at a time
+            result = await asyncio.to_thread(exporter.export, endpoint, mkt_code, start_date, date, path, format)
+        except ImportError as e:
+            raise ToolError(str(e))
+        return json.dumps(result, ensure_ascii=False)
@@ -0,0 +1,284 @@
+import os
+import sys
+import mmap
+import json
+import struct
+import bisect
+import tempfile
+from pathlib import Path
+from collections.abc import Mapping
+from typing import Optional, Dict, List, Tuple, Iterator, Any
+from src.utils import LOGGER
+
+
+class SharedMarketDay(Mapping):
+    """
+    Read-only market-day backed by a memory-mapped file of the store.
+    Every worker maps the same file, so the records live once in the OS page cache instead of once per worker.
+    Only the ticker index is held in the worker; an entry is decoded each time it is looked up.
+
+    File layout: magic, ticker count and index length ('<8sQQ'), the JSON list of tickers,
+    padding to 8 bytes, then 'count + 1' native uint64 offsets of the JSON entries that follow.
+    """
+    __slots__ = ("_buffer", "_offsets", "_positions", "_payload", "__weakref__")
+    magic = b"KRXDAY1\0"
+    header = struct.Struct("<8sQQ")
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, index_length = self.header.unpack_from(self._buffer)
+        if magic != self.magic:
+            raise ValueError(f"Not a shared market-day file: {path}")
+        start = self.header.size
+        tickers = json.loads(self._buffer[start:start + index_length])
+        start += index_length + -index_length % 8
+        self._offsets = memoryview(self._buffer)[start:start + 8 * (count + 1)].cast("Q")
+        self._payload = start + 8 * (count + 1)
+        self._positions = {sys.intern(ticker): position for position, ticker in enumerate(tickers)}
+
+    @classmethod
+    def encode(cls, entries: Dict[str, dict]) -> bytes:
+        """Serialize a market-day into the shared file layout"""
+        tickers = list(entries)
+        index = json.dumps(tickers, ensure_ascii=False).encode("utf-8")
+        chunks = [json.dumps(entries[ticker], ensure_ascii=False).encode("utf-8") for ticker in tickers]
+        offsets = [0]
+        for chunk in chunks:
+            offsets.append(offsets[-1] + len(chunk))
+        return b"".join([
+            cls.header.pack(cls.magic, len(tickers), len(index)),
+            index,
+            b"\0" * (-len(index) % 8),
+            struct.pack(f"={len(offsets)}Q", *offsets),
+            *chunks,
+        ])
+
+    def __getitem__(self, ticker: str) -> dict:
+        position = self._positions[ticker]
+        start = self._payload + self._offsets[position]
+        return json.loads(self._buffer[start:self._payload + self._offsets[position + 1]])
+
+    def __contains__(self, ticker: object) -> bool:
+        return ticker in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+class KrxMarketStore:
+    """
+    On-disk store of market-day payloads shared by every worker process.
+    Info payloads barely change from one day to the next, so each info market-day is stored
+    either as a full snapshot or as a delta against an earlier stored day, keyed by ISU_SRT_CD.
+    A full snapshot is written every 'snapshot_interval' days of a delta chain.
+    Stored market-days can also be read as SharedMarketDay, materialized once under 'shared/'
+    and memory-mapped by every worker.
+    """
+    store_name = "Market-Store"
+    endpoints = ["info", "price"]
+    markets = ["stk", "ksq", "knx"]
+    delta_endpoints = ["info"]
+
+    def __init__(self, root: str = "./store", snapshot_interval: int = 20):
+        if snapshot_interval < 1:
+            raise ValueError(f"[{self.store_name}] 'snapshot_interval' must be a positive integer")
+        self.root = Path(root)
+        self.snapshot_interval = snapshot_interval
+        for endpoint in self.endpoints:
+            for market in self.markets:
+                (self.root / endpoint / market).mkdir(parents=True, exist_ok=True)
+
+    def _path(self, endpoint: str, date: str, market: str, delta: bool = False) -> Path:
+        if endpoint not in self.endpoints:
+            raise ValueError(f"[{self.store_name}] Endpoint must be the one of {self.endpoints}")
+        if market not in self.markets:
+            raise ValueError(f"[{self.store_name}] Market must be the one of {self.markets}")
+        suffix = ".delta.json" if delta else ".json"
+        return self.root / endpoint / market / f"{date}{suffix}"
+
+    def has(self, endpoint: str, date: str, market: str) -> bool:
+        """Check if the market-day exists in the store."""
+        return (
+            self._path(endpoint, date, market).exists()
+            or self._path(endpoint, date, market, delta=True).exists()
+        )
+
+    def dates(self, endpoint: str, market: str) -> List[str]:
+        """List the stored dates of a market in ascending order."""
+        directory = self._path(endpoint, "", market).parent
+        return sorted({path.name.split(".", 1)[0] for path in directory.glob("*.json")})
+
+    def load(
+            self,
+            endpoint: str,
+            date: str,
+            market: str
+        ) -> Optional[Dict[str, dict]]:
+        """Load a market-day from the store. Return None if it is not stored."""
+        loaded = self._reconstruct(endpoint, date, market)
+        if loaded is None:
+            return None
+
+        LOGGER.info(f"[{self.store_name}] Loaded ({endpoint}, {date}, {market}) from the store")
+        return loaded[0]
+
+    def save(
+            self,
+            endpoint: str,
+            date: str,
+            market: str,
+            entries: Dict[str, dict]
+        ) -> None:
+        """
+        Save a market-day into the store.
+        The file is replaced atomically so that other workers never read a partial file.
+        """
+        if not entries:
+            return
+
+        if endpoint in self.delta_endpoints:
+            # Later deltas may be based on this day, so a stored day is never rewritten
+            if self.has(endpoint, date, market):
+                return
+            delta = self._make_delta(endpoint, date, market, entries)
+            if delta is not None:
+                path = self._path(endpoint, date, market, delta=True)
+                self._write_atomic(path, json.dumps(delta, ensure_ascii=False).encode("utf-8"))
+                LOGGER.info(
+                    f"[{self.store_name}] Saved ({endpoint}, {date}, {market}) into the store "
+                    f"as a delta against {delta['base']}"
+                )
+                return
+
+        path = self._path(endpoint, date, market)
+        self._write_atomic(path, json.dumps(entries, ensure_ascii=False).encode("utf-8"))
+        # A rewritten day must not be served from its previous shared file
+        self._shared_path(endpoint, date, market).unlink(missing_ok=True)
+        LOGGER.info(f"[{self.store_name}] Saved ({endpoint}, {date}, {market}) into the store")
+
+    def _shared_path(self, endpoint: str, date: str, market: str) -> Path:
+        return self.root / "shared" / endpoint / market / f"{date}.day"
+
+    def load_shared(
+            self,
+            endpoint: str,
+            date: str,
+            market: str
+        ) -> Optional[SharedMarketDay]:
+        """
+        Load a market-day as a memory-mapped SharedMarketDay. Return None if it is not stored.
+        The shared file is written by the first worker reading the day, and mapped as is by the others.
+        """
+        path = self._shared_path(endpoint, date, market)
+        if not path.exists():
+            loaded = self._reconstruct(endpoint, date, market)
+            if loaded is None:
+                return None
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(path, SharedMarketDay.encode(loaded[0]))
+            LOGGER.info(f"[{self.store_name}] Materialized ({endpoint}, {date}, {market}) as a shared market-day")
+
+        try:
+            return SharedMarketDay(path)
+        except (OSError, ValueError):
+            LOGGER.exception(f"[{self.store_name}] Failed to map the shared market-day: {path}")
+            return None
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as file:
+                return json.loads(file.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            LOGGER.exception(f"[{self.store_name}] Failed to read the stored market-day: {path}")
+            return None
+
+    def _reconstruct(
+            self,
+            endpoint: str,
+            date: str,
+            market: str
+        ) -> Optional[Tuple[Dict[str, dict], int]]:
+        """Rebuild a market-day from its snapshot and delta chain. Return the entries and the chain length."""
+        chain: List[Dict[str, Any]] = []
+        day = date
+        while True:
+            entries = self._read(self._path(endpoint, day, market))
+            if entries is not None:
+                break
+            delta = self._read(self._path(endpoint, day, market, delta=True))
+            if delta is None:
+                if chain:
+                    LOGGER.error(f"[{self.store_name}] Broken delta chain of ({endpoint}, {date}, {market}) at {day}")
+                return None
+            chain.append(delta)
+            day = delta["base"]
+
+        for delta in reversed(chain):
+            entries = self._apply_delta(entries, delta)
+        return entries, len(chain)
+
+    def _make_delta(
+            self,
+            endpoint: str,
+            date: str,
+            market: str,
+            entries: Dict[str, dict]
+        ) -> Optional[Dict[str, Any]]:
+        """Diff a market-day against the closest earlier stored day. Return None if a snapshot is due."""
+        dates = self.dates(endpoint, market)
+        index = bisect.bisect_left(dates, date)
+        if index == 0:
+            return None
+
+        base_date = dates[index - 1]
+        loaded = self._reconstruct(endpoint, base_date, market)
+        if loaded is None:
+            return None
+        base, depth = loaded
+        if depth + 1 >= self.snapshot_interval:
+            return None
+
+        changed: Dict[str, dict] = {}
+        added: Dict[str, dict] = {}
+        for ticker, entry in entries.items():
+            old = base.get(ticker)
+            if old is None or old.keys() != entry.keys():
+                added[ticker] = entry
+            elif old != entry:
+                changed[ticker] = {field: value for field, value in entry.items() if old[field] != value}
+        removed = [ticker for ticker in base if ticker not in entries]
+
+        return {
+            "base": base_date,
+            "changed": changed,
+            "added": added,
+            "removed": removed,
+        }
+
+    @staticmethod
+    def _apply_delta(base: Dict[str, dict], delta: Dict[str, Any]) -> Dict[str, dict]:
+        """Apply a delta on top of its base. Entries unchanged by the delta are shared, not copied."""
+        entries = dict(base)
+        for ticker in delta["removed"]:
+            entries.pop(ticker, None)
+        entries.update(delta["added"])
+        for ticker, fields in delta["changed"].items():
+            entries[ticker] = {**entries[ticker], **fields}
+        return entries
+
+    def _write_atomic(self, path: Path, payload: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
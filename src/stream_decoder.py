@@ -0,0 +1,75 @@
+import re
+import json
+import codecs
+from typing import Dict, Any
+
+
+class OutBlockStreamDecoder:
+    """
+    Incremental decoder for KRX API responses.
+    Records of 'OutBlock_1' are decoded one by one as chunks arrive and indexed by 'key',
+    so the whole response body is never buffered.
+    """
+    decoder_name = "OutBlock-Decoder"
+
+    def __init__(self, key: str, block: str = "OutBlock_1"):
+        self.key = key
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._block = re.compile(r'"' + re.escape(block) + r'"\s*:\s*\[')
+        self._tail_size = len(block) + 64
+        self._json = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer: str = ""
+        self._state: str = "seek"
+
+    def feed(self, chunk: bytes) -> None:
+        """Feed a chunk of the response body"""
+        self._buffer += self._utf8.decode(chunk)
+        if self._state == "seek":
+            self._seek_block()
+        if self._state == "array":
+            self._decode_records()
+
+    def close(self) -> Dict[str, Dict[str, Any]]:
+        """Finish decoding and return the records indexed by 'key'. Raise ValueError if the block never appeared."""
+        self._buffer += self._utf8.decode(b"", final=True)
+        if self._state == "array":
+            self._decode_records()
+        if self._state == "array":
+            raise ValueError(f"[{self.decoder_name}] The response ended inside the record array")
+        if self._state == "seek":
+            # Error bodies of KRX API (e.g. '{"respCode": "401", ...}') have no record array at all;
+            # only an explicit empty array means that the market-day has no trading data
+            raise ValueError(f"[{self.decoder_name}] The response has no record array: {self._buffer[-200:]!r}")
+        return self.records
+
+    def _seek_block(self) -> None:
+        match = self._block.search(self._buffer)
+        if match is None:
+            # Keep only what may be the beginning of the block name
+            self._buffer = self._buffer[-self._tail_size:]
+            return
+        self._buffer = self._buffer[match.end():]
+        self._state = "array"
+
+    def _decode_records(self) -> None:
+        buffer = self._buffer
+        length = len(buffer)
+        pos = 0
+        while True:
+            while pos < length and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == length:
+                break
+            if buffer[pos] == "]":
+                self._state = "done"
+                pos = length
+                break
+            try:
+                record, end = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The record is not complete yet
+                break
+            self.records[record[self.key]] = record
+            pos = end
+        self._buffer = buffer[pos:]
@@ -0,0 +1,172 @@
+import os
+import time
+import random
+import struct
+import asyncio
+import threading
+from pathlib import Path
+from typing import Literal
+from src.utils import LOGGER
+
+
+class TokenBucket:
+    """Token bucket rate limiter shared by every request to KRX API"""
+    limiter_name = "Rate-Limiter"
+
+    def __init__(self, rate: float = 5.0, capacity: int = 5):
+        if rate <= 0:
+            raise ValueError(f"[{self.limiter_name}] The 'rate' must be larger than 0")
+        if capacity < 1:
+            raise ValueError(f"[{self.limiter_name}] The 'capacity' must be larger than 0")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens: float = capacity
+        self._updated: float = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._thread_lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                LOGGER.info(f"[{self.limiter_name}] Throttled for {wait:.2f}s")
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+
+    def acquire_sync(self) -> None:
+        """Blocking 'acquire' for worker threads. A bucket is used either from threads or from an event loop."""
+        with self._thread_lock:
+            self._refill()
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                LOGGER.info(f"[{self.limiter_name}] Throttled for {wait:.2f}s")
+                time.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a file, so that every process limited by the same file
+    (server workers, backfill.py, the library) shares one rate limit of KRX API.
+    A token is taken, or the next one reserved, under an exclusive lock of the file held for a few microseconds.
+    """
+    state = struct.Struct("<dd")
+
+    def __init__(self, path: str, rate: float = 5.0, capacity: int = 5):
+        super().__init__(rate, capacity)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _reserve(self) -> float:
+        """Take a token, or reserve the next one. Return the seconds to wait for it."""
+        import fcntl
+
+        # flock does not exclude threads sharing the file descriptor
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                raw = os.pread(self._fd, self.state.size, 0)
+                tokens, updated = self.state.unpack(raw) if len(raw) == self.state.size else (self.capacity, now)
+                tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate) - 1
+                os.pwrite(self._fd, self.state.pack(tokens, now), 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return -tokens / self.rate if tokens < 0 else 0.0
+
+    async def acquire(self) -> None:
+        wait = self._reserve()
+        if wait:
+            LOGGER.info(f"[{self.limiter_name}] Throttled for {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self) -> None:
+        wait = self._reserve()
+        if wait:
+            LOGGER.info(f"[{self.limiter_name}] Throttled for {wait:.2f}s")
+            time.sleep(wait)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a request is attempted while the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker failing fast while KRX API is down.
+    After 'failure_threshold' consecutive failures the circuit opens for 'reset_timeout' seconds,
+    then a single trial request is allowed (half-open) to decide whether to close it again.
+    """
+    breaker_name = "Circuit-Breaker"
+    trial_poll_interval = 0.5
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        if failure_threshold < 1:
+            raise ValueError(f"[{self.breaker_name}] The 'failure_threshold' must be larger than 0")
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: int = 0
+        self._opened_at: float | None = None
+        self._trial_running: bool = False
+
+    @property
+    def state(self) -> Literal["closed", "open", "half-open"]:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def retry_after(self) -> float:
+        """Seconds to wait before a request may be sent: until half-open, or a poll interval while a trial runs"""
+        if self._opened_at is None:
+            return 0.0
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if remaining > 0:
+            return remaining
+        return self.trial_poll_interval if self._trial_running else 0.0
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError if a request must not be sent now."""
+        match self.state:
+            case "open":
+                raise CircuitOpenError("KRX API circuit is open")
+            case "half-open":
+                if self._trial_running:
+                    raise CircuitOpenError("KRX API circuit is half-open and a trial request is running")
+                self._trial_running = True
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            LOGGER.info(f"[{self.breaker_name}] Circuit closed")
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def record_cancelled(self) -> None:
+        """A cancelled request tells nothing about KRX API, but must not hold the half-open trial"""
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_running = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            LOGGER.warning(f"[{self.breaker_name}] Circuit opened for {self.reset_timeout}s")
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,243 @@
+import os
+import json
+import time
+import random
+import asyncio
+from uuid import uuid4
+from pathlib import Path
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, List, Iterator, Any
+from src.utils import LOGGER
+
+
+class Span:
+    """A timed stage of a traced request. Spans of one request share its trace id (the request id)."""
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, trace: "_Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(((self.end_ns or time.time_ns()) - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _Trace:
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self):
+        self.trace_id = uuid4().hex
+        self.spans: List[Span] = []
+
+
+_CURRENT_SPAN: ContextVar[Optional[Span]] = ContextVar("krx_current_span", default=None)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time a stage of the current traced request as a child of the current span.
+    Outside a sampled request this only reads a context variable, so stages can be traced unconditionally.
+    """
+    parent = _CURRENT_SPAN.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    parent.trace.spans.append(child)
+    token = _CURRENT_SPAN.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = repr(e)
+        raise
+    finally:
+        child.end_ns = time.time_ns()
+        _CURRENT_SPAN.reset(token)
+
+
+def detach() -> None:
+    """Stop tracing the rest of the current task, e.g. a background task spawned by a traced request"""
+    _CURRENT_SPAN.set(None)
+
+
+def current_trace_id() -> Optional[str]:
+    """Request id of the current traced request"""
+    current = _CURRENT_SPAN.get()
+    return current.trace_id if current is not None else None
+
+
+class FileSpanExporter:
+    """Append finished spans to a local JSON lines file, one span per line"""
+    exporter_name = "Span-File-Exporter"
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(span, ensure_ascii=False) + "\n" for span in spans).encode("utf-8")
+        # A single O_APPEND write per flush, so workers sharing the file never interleave lines
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+
+class OtlpSpanExporter:
+    """Post finished spans to an OTLP/HTTP collector as OTLP/JSON ('{endpoint}/v1/traces')"""
+    exporter_name = "Span-OTLP-Exporter"
+
+    def __init__(self, endpoint: str, service_name: str = "krx-stock-mcp", timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.timeout = timeout
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _otlp_span(self, span: Dict[str, Any]) -> Dict[str, Any]:
+        end_ns = span["start_ns"] + int(span["duration_ms"] * 1e6)
+        otlp = {
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "name": span["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(span["start_ns"]),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": [self._attribute(key, value) for key, value in span["attributes"].items()],
+            "status": {"code": 2, "message": span["error"]} if span["error"] else {"code": 1},
+        }
+        if span["parent_id"]:
+            otlp["parentSpanId"] = span["parent_id"]
+        return otlp
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        import requests
+
+        body = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "krx-stock-mcp"},
+                    "spans": [self._otlp_span(span) for span in spans],
+                }],
+            }]
+        }
+        response = requests.post(self.url, json=body, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class KrxTracer:
+    """
+    Per-request tracing with head sampling.
+    Whether a request is traced is decided once when it starts ('sample_rate'), so unsampled requests
+    pay nothing but a context variable lookup per stage. Finished spans are buffered and exported
+    every 'flush_interval' seconds from a worker thread, never on the request path.
+    """
+    tracer_name = "Tracer"
+
+    def __init__(
+            self,
+            sample_rate: float = 0.0,
+            exporter: Optional[Any] = None,
+            flush_interval: float = 2.0,
+            max_buffer: int = 10_000
+        ):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"[{self.tracer_name}] The 'sample_rate' must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: List[Dict[str, Any]] = []
+        self.sampled: int = 0
+        self.exported: int = 0
+        self.dropped: int = 0
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Start the root span of a request if the request is sampled"""
+        if self.exporter is None or not self.sample_rate or random.random() >= self.sample_rate:
+            yield None
+            return
+
+        trace = _Trace()
+        root = Span(trace, name, None, attributes)
+        trace.spans.append(root)
+        token = _CURRENT_SPAN.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = repr(e)
+            raise
+        finally:
+            root.end_ns = time.time_ns()
+            _CURRENT_SPAN.reset(token)
+            self.sampled += 1
+            self._buffer.extend(span.to_dict() for span in trace.spans)
+            if len(self._buffer) > self.max_buffer:
+                overflow = len(self._buffer) - self.max_buffer
+                del self._buffer[:overflow]
+                self.dropped += overflow
+
+    def flush(self) -> None:
+        """Export the buffered spans. Spans failing to export are dropped."""
+        if not self._buffer or self.exporter is None:
+            return
+        spans, self._buffer = self._buffer, []
+        try:
+            self.exporter.export(spans)
+            self.exported += len(spans)
+        except Exception as e:
+            self.dropped += len(spans)
+            LOGGER.warning(f"[{self.tracer_name}] Failed to export {len(spans)} spans: {e!r}")
+
+    async def run(self) -> None:
+        """Flush the buffered spans periodically"""
+        if self.exporter is None:
+            return
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.to_thread(self.flush)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "sampled": self.sampled,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "buffered": len(self._buffer),
+        }
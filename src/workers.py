@@ -0,0 +1,80 @@
+import socket
+import asyncio
+import argparse
+import multiprocessing
+from typing import Dict, Any
+from src.utils import LOGGER
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Bind a listening socket which every worker accepts connections from"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve_worker(
+        args: argparse.Namespace,
+        kwargs: Dict[str, Any],
+        sock: socket.socket,
+        index: int
+    ) -> None:
+    """Entry point of a worker process"""
+    # Imported inside the worker so that the parent does not build resolvers
+    from src.server import KrxStockServer
+
+    is_leader = index == 0
+    LOGGER.info(f"[Worker-{index}] Worker started (leader={is_leader})")
+    server = KrxStockServer(args, is_leader=is_leader)
+    server.register_mcp_primitives()
+    asyncio.run(server.run_server(kwargs, sockets=[sock]))
+
+
+def worker_args(args: argparse.Namespace) -> argparse.Namespace:
+    """
+    Arguments of each worker. The cold fetch cap and queue are held by each process, so the server-wide ones
+    are split among the workers. The KRX API rate limit is not split: it is shared through a file of the store.
+    """
+    return argparse.Namespace(**{
+        **vars(args),
+        "cold_fetch_limit": max(1, args.cold_fetch_limit // args.workers),
+        "cold_queue_size": args.cold_queue_size // args.workers,
+    })
+
+
+def run_workers(args: argparse.Namespace, kwargs: Dict[str, Any]) -> None:
+    """
+    Run 'args.workers' MCP server processes sharing one socket and one store.
+    Market-days are memory-mapped from the store (SharedMarketDay), so the records are held once
+    in the OS page cache for every worker; each worker only keeps the ticker index of the days it caches.
+    """
+    args = worker_args(args)
+    sock = bind_socket(args.host, args.port)
+    LOGGER.info(f"[Workers] Listening on {args.host}:{args.port} with {args.workers} workers")
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_serve_worker,
+            args=(args, kwargs, sock, index),
+            name=f"krx-stock-worker-{index}",
+        )
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        LOGGER.info("[Workers] Stopping workers")
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+    finally:
+        sock.close()